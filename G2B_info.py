@@ -1,15 +1,23 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import json
 import os
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import re
 import uuid
-import threading
-from difflib import SequenceMatcher
+
+import google_clients
+import usage_log
+from contract_analysis import (  # 반복수주 탐지 (유사 계약명 군집화)
+    build_repeat_base,
+    detect_repeat_contracts,
+    fix_contract_amount,
+    load_repeat_artifact,
+    select_maintenance_contracts,
+    REPEAT_THRESHOLD,
+)
+from districts import METRO_LIST, district_frame
+from unique_map import map_unique_rows
 
 st.set_page_config(
     page_title="지자체 유지보수 계약 현황",
@@ -20,17 +28,6 @@ st.set_page_config(
 
 RE_NONDIGIT     = re.compile(r"[^0-9]")
 RE_MONTH_ONLY   = re.compile(r"^[0-3]개월")
-RE_CONTRACT_NUM = re.compile(r"\d+차분?|\d+")
-
-RE_NORMALIZE = re.compile(
-    r"\d{4}[~\-～]\d{4}년?"
-    r"|\d{4}년\s*\d{1,2}월"
-    r"|\d{4}년"
-    r"|\d{1,2}차분?"
-    r"|장기계속\s*\d*차?"
-    r"|\(.*?\)"
-    r"|연장분|추가분|수정"
-)
 
 st.markdown("""
 <style>
@@ -63,20 +60,14 @@ st.markdown("""
 # ─────────────────────────────────────────────
 # 로그 기록
 # ─────────────────────────────────────────────
-def _write_log(event_type: str, detail: str, session_id: str, ip: str):
-    try:
-        auth_json = os.environ.get("GOOGLE_AUTH_JSON")
-        if not auth_json:
-            return
-        creds_dict = json.loads(auth_json)
-        scope      = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds      = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client     = gspread.authorize(creds)
-        ws         = client.open("나라장터_usage_log2").get_worksheet(0)
-        now        = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ws.append_row([now, session_id, ip, event_type, detail])
-    except Exception:
-        pass
+USAGE_LOG_SHEET = "나라장터_usage_log2"
+
+def _usage_log_writer():
+    # 프로세스에 하나인 기록기가 큐에 모은 행을 주기적으로 append_rows로 보낸다
+    auth_json = os.environ.get("GOOGLE_AUTH_JSON")
+    if not auth_json:
+        return None
+    return usage_log.get_writer(USAGE_LOG_SHEET, auth_json)
 
 def _get_client_ip() -> str:
     try:
@@ -93,43 +84,15 @@ def _get_client_ip() -> str:
     return "unknown"
 
 def log_event(event_type: str, detail: str = "-"):
+    writer = _usage_log_writer()
+    if writer is None:
+        return
     session_id = st.session_state.get("session_id", "unknown")
-    ip         = _get_client_ip()
-    threading.Thread(
-        target=_write_log,
-        args=(event_type, detail, session_id, ip),
-        daemon=True
-    ).start()
+    writer.log(session_id, _get_client_ip(), event_type, detail)
 
 # ─────────────────────────────────────────────
 # 상수
 # ─────────────────────────────────────────────
-FULL_DISTRICT_LIST = [
-    "서울특별시", "서울특별시 종로구", "서울특별시 중구", "서울특별시 용산구", "서울특별시 성동구", "서울특별시 광진구", "서울특별시 동대문구", "서울특별시 중랑구", "서울특별시 성북구", "서울특별시 강북구", "서울특별시 도봉구", "서울특별시 노원구", "서울특별시 은평구", "서울특별시 서대문구", "서울특별시 마포구", "서울특별시 양천구", "서울특별시 강서구", "서울특별시 구로구", "서울특별시 금천구", "서울특별시 영등포구", "서울특별시 동작구", "서울특별시 관악구", "서울특별시 서초구", "서울특별시 강남구", "서울특별시 송파구", "서울특별시 강동구",
-    "부산광역시", "부산광역시 중구", "부산광역시 서구", "부산광역시 동구", "부산광역시 영도구", "부산광역시 부산진구", "부산광역시 동래구", "부산광역시 남구", "부산광역시 북구", "부산광역시 해운대구", "부산광역시 사하구", "부산광역시 금정구", "부산광역시 강서구", "부산광역시 연제구", "부산광역시 수영구", "부산광역시 사상구", "부산광역시 기장군",
-    "대구광역시", "대구광역시 중구", "대구광역시 동구", "대구광역시 서구", "대구광역시 남구", "대구광역시 북구", "대구광역시 수성구", "대구광역시 달서구", "대구광역시 달성군", "대구광역시 군위군",
-    "인천광역시", "인천광역시 중구", "인천광역시 동구", "인천광역시 미추홀구", "인천광역시 연수구", "인천광역시 남동구", "인천광역시 부평구", "인천광역시 계양구", "인천광역시 서구", "인천광역시 강화군", "인천광역시 옹진군",
-    "광주광역시", "광주광역시 동구", "광주광역시 서구", "광주광역시 남구", "광주광역시 북구", "광주광역시 광산구",
-    "대전광역시", "대전광역시 동구", "대전광역시 중구", "대전광역시 서구", "대전광역시 유성구", "대전광역시 대덕구",
-    "울산광역시", "울산광역시 중구", "울산광역시 남구", "울산광역시 동구", "울산광역시 북구", "울산광역시 울주군",
-    "세종특별자치시",
-    "경기도 수원시", "경기도 성남시", "경기도 의정부시", "경기도 안양시", "경기도 부천시", "경기도 광명시", "경기도 평택시", "경기도 동두천시", "경기도 안산시", "경기도 고양시", "경기도 과천시", "경기도 구리시", "경기도 남양주시", "경기도 오산시", "경기도 시흥시", "경기도 군포시", "경기도 의왕시", "경기도 하남시", "경기도 용인시", "경기도 파주시", "경기도 이천시", "경기도 안성시", "경기도 김포시", "경기도 화성시", "경기도 광주시", "경기도 양주시", "경기도 포천시", "경기도 여주시", "경기도 연천군", "경기도 가평군", "경기도 양평군",
-    "강원특별자치도 춘천시", "강원특별자치도 원주시", "강원특별자치도 강릉시", "강원특별자치도 동해시", "강원특별자치도 태백시", "강원특별자치도 속초시", "강원특별자치도 삼척시", "강원특별자치도 홍천군", "강원특별자치도 횡성군", "강원특별자치도 영월군", "강원특별자치도 평창군", "강원특별자치도 정선군", "강원특별자치도 철원군", "강원특별자치도 화천군", "강원특별자치도 양구군", "강원특별자치도 인제군", "강원특별자치도 고성군", "강원특별자치도 양양군",
-    "충청북도 청주시", "충청북도 충주시", "충청북도 제천시", "충청북도 보은군", "충청북도 옥천군", "충청북도 영동군", "충청북도 증평군", "충청북도 진천군", "충청북도 괴산군", "충청북도 음성군", "충청북도 단양군",
-    "충청남도 천안시", "충청남도 공주시", "충청남도 보령시", "충청남도 아산시", "충청남도 서산시", "충청남도 논산시", "충청남도 계룡시", "충청남도 당진시", "충청남도 금산군", "충청남도 부여군", "충청남도 서천군", "충청남도 청양군", "충청남도 홍성군", "충청남도 예산군", "충청남도 태안군",
-    "전북특별자치도 전주시", "전북특별자치도 군산시", "전북특별자치도 익산시", "전북특별자치도 정읍시", "전북특별자치도 남원시", "전북특별자치도 김제시", "전북특별자치도 완주군", "전북특별자치도 진안군", "전북특별자치도 무주군", "전북특별자치도 장수군", "전북특별자치도 임실군", "전북특별자치도 순창군", "전북특별자치도 고창군", "전북특별자치도 부안군",
-    "전라남도 목포시", "전라남도 여수시", "전라남도 순천시", "전라남도 나주시", "전라남도 광양시", "전라남도 담양군", "전라남도 곡성군", "전라남도 구례군", "전라남도 고흥군", "전라남도 보성군", "전라남도 화순군", "전라남도 장흥군", "전라남도 강진군", "전라남도 해남군", "전라남도 영암군", "전라남도 무안군", "전라남도 함평군", "전라남도 영광군", "전라남도 장성군", "전라남도 완도군", "전라남도 진도군", "전라남도 신안군",
-    "경상북도 포항시", "경상북도 경주시", "경상북도 김천시", "경상북도 안동시", "경상북도 구미시", "경상북도 영주시", "경상북도 상주시", "경상북도 문경시", "경상북도 경산시", "경상북도 의성군", "경상북도 청송군", "경상북도 영양군", "경상북도 영덕군", "경상북도 청도군", "경상북도 고령군", "경상북도 성주군", "경상북도 칠곡군", "경상북도 예천군", "경상북도 봉화군", "경상북도 울진군", "경상북도 울릉군",
-    "경상남도 창원시", "경상남도 진주시", "경상남도 통영시", "경상남도 사천시", "경상남도 김해시", "경상남도 밀양시", "경상남도 거제시", "경상남도 양산시", "경상남도 의령군", "경상남도 함안군", "경상남도 창녕군", "경상남도 고성군", "경상남도 남해군", "경상남도 하동군", "경상남도 산청군", "경상남도 함양군", "경상남도 거창군", "경상남도 합천군",
-    "제주특별자치도", "제주특별자치도 제주시", "제주특별자치도 서귀포시",
-]
-
-METRO_LIST = [
-    "전국", "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시",
-    "대전광역시", "울산광역시", "세종특별자치시", "경기도", "강원특별자치도",
-    "충청북도", "충청남도", "전북특별자치도", "전라남도", "경상북도", "경상남도", "제주특별자치도",
-]
-
 PAGE_SIZE = 50
 
 # ─────────────────────────────────────────────
@@ -151,12 +114,6 @@ for k, v in defaults.items():
 # ─────────────────────────────────────────────
 # 공통 함수
 # ─────────────────────────────────────────────
-def get_metro(a: str) -> str:
-    for m in METRO_LIST[1:]:
-        if str(a).startswith(m):
-            return m
-    return "기타"
-
 def parse_date_series(s: pd.Series) -> pd.Series:
     cleaned = s.astype(str).str.replace(RE_NONDIGIT, "", regex=True).str[:8]
     return pd.to_datetime(cleaned, format="%Y%m%d", errors="coerce")
@@ -218,79 +175,6 @@ def calculate_logic_vectorized(df: pd.DataFrame) -> pd.DataFrame:
 
     return pd.DataFrame({"★가공_계약만료일": expire_str, "남은기간": remaining})
 
-def clean_contract_name(name: str) -> str:
-    return RE_CONTRACT_NUM.sub("", str(name).replace(" ", ""))
-
-# ─────────────────────────────────────────────
-# 반복수주 탐지
-# ─────────────────────────────────────────────
-def normalize_contract_name(name: str) -> str:
-    s = RE_NORMALIZE.sub("", str(name))
-    s = re.sub(r"\s+", "", s)
-    return s.strip()
-
-def name_similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
-
-def detect_repeat_contracts(df: pd.DataFrame, threshold: float = 0.80) -> pd.DataFrame:
-    needed = ["★가공_수요기관", "★가공_계약명", "★가공_업체명", "★가공_계약금액", "계약일자"]
-    work = df[needed].copy()
-    work["정규화명"] = work["★가공_계약명"].apply(normalize_contract_name)
-    work["계약일자_dt"] = pd.to_datetime(
-        work["계약일자"].astype(str).str.replace(r"[^0-9]", "", regex=True).str[:8],
-        format="%Y%m%d", errors="coerce"
-    )
-    work["계약년도"] = work["계약일자_dt"].dt.year
-
-    results = []
-    for agency, ag_df in work.groupby("★가공_수요기관"):
-        names   = ag_df["정규화명"].tolist()
-        indices = ag_df.index.tolist()
-        visited = [False] * len(names)
-
-        for i in range(len(names)):
-            if visited[i] or not names[i]:
-                continue
-            cluster_idx = [i]
-            visited[i] = True
-            for j in range(i + 1, len(names)):
-                if not visited[j] and name_similarity(names[i], names[j]) >= threshold:
-                    cluster_idx.append(j)
-                    visited[j] = True
-
-            if len(cluster_idx) < 2:
-                continue
-
-            cluster_rows = ag_df.loc[[indices[k] for k in cluster_idx]]
-
-            for company, co_df in cluster_rows.groupby("★가공_업체명"):
-                if len(co_df) < 2:
-                    continue
-                if co_df["계약년도"].dropna().nunique() < 2:
-                    continue
-
-                amt   = pd.to_numeric(co_df["★가공_계약금액"], errors="coerce").fillna(0)
-                dates = co_df["계약일자_dt"].dropna()
-
-                results.append({
-                    "수요기관":      agency,
-                    "업체명":        company,
-                    "수주횟수":      len(co_df),
-                    "수주연도":      ", ".join(map(str, sorted(co_df["계약년도"].dropna().astype(int).unique().tolist()))),
-                    "대표사업명":    co_df["★가공_계약명"].iloc[0],
-                    "계약금액합계":  int(amt.sum()),
-                    "최초계약일":    dates.min().strftime("%Y-%m-%d") if not dates.empty else "-",
-                    "최근계약일":    dates.max().strftime("%Y-%m-%d") if not dates.empty else "-",
-                    "계약목록":      " / ".join(co_df["★가공_계약명"].tolist()),
-                })
-
-    if not results:
-        return pd.DataFrame()
-
-    out = pd.DataFrame(results)
-    out = out.sort_values(["수주횟수", "계약금액합계"], ascending=False).reset_index(drop=True)
-    return out
-
 # ─────────────────────────────────────────────
 # 데이터 로드 — 계약내역
 # ★ 변경 포인트 1: 반환값이 (화면표시용 df, 반복수주탐지용 df) 튜플
@@ -304,10 +188,7 @@ def get_processed_df():
         st.error("❌ 'GOOGLE_AUTH_JSON' 환경 변수가 설정되지 않았습니다.")
         return pd.DataFrame(), pd.DataFrame()
     try:
-        creds_dict = json.loads(auth_json)
-        scope      = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds      = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client     = gspread.authorize(creds)
+        client     = google_clients.gspread_client(auth_json)
         ws         = client.open("나라장터_용역계약내역").get_worksheet(0)
         records    = ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
     except Exception as e:
@@ -317,28 +198,8 @@ def get_processed_df():
     if not records:
         return pd.DataFrame(), pd.DataFrame()
 
-    df         = pd.DataFrame(records)
-    agency_col = df["★가공_수요기관"].astype(str).str.strip()
-    mask       = agency_col.apply(lambda a: any(a.startswith(d) for d in FULL_DISTRICT_LIST))
-    df         = df[mask & ~agency_col.str.contains("교육청", na=False)].copy()
-
-    cn = df["★가공_계약명"].astype(str)
-    df = df[
-        cn.str.contains("유지", na=False) &
-        cn.str.contains("통합관제|통합|CCTV", na=False) &
-        ~cn.str.contains("상수도|청사|악취|미세먼지|상담실|보건소", na=False)
-    ].copy()
-
+    df = select_maintenance_contracts(pd.DataFrame(records))
     df[["★가공_계약만료일", "남은기간"]] = calculate_logic_vectorized(df).values
-    df["temp_date"] = pd.to_datetime(
-        df["계약일자"].astype(str).str.replace(RE_NONDIGIT, "", regex=True).str[:8],
-        format="%Y%m%d", errors="coerce"
-    )
-    df["contract_group_key"] = df["★가공_계약명"].apply(clean_contract_name)
-    df = df.sort_values(
-        ["★가공_수요기관", "contract_group_key", "★가공_업체명", "temp_date"],
-        ascending=[True, True, True, False],
-    )
 
     today           = pd.Timestamp(datetime.now().date())
     three_years_ago = today - pd.DateOffset(years=3)   # ★ 3년으로 확장
@@ -353,25 +214,30 @@ def get_processed_df():
         ["★가공_수요기관", "contract_group_key", "★가공_업체명"], keep="first"
     )
     display_out = pd.concat([active_df, recent_expired_df], ignore_index=True)
-    display_out["광역단위"] = display_out["★가공_수요기관"].astype(str).apply(get_metro)
+    fix_contract_amount(display_out)
 
     # ── 반복수주 탐지용: 만료 필터 없이 전체 (중복만 제거) ──
-    repeat_base = df.drop_duplicates(
-        ["★가공_수요기관", "contract_group_key", "★가공_업체명"], keep="first"
-    ).copy()
-    repeat_base["광역단위"] = repeat_base["★가공_수요기관"].astype(str).apply(get_metro)
-
-    # 금액 보정 (두 df 모두)
-    for target in [display_out, repeat_base]:
-        total_amt = pd.to_numeric(target["★가공_계약금액"], errors="coerce").fillna(0)
-        if "금차계약금액" in target.columns:
-            sub_amt = pd.to_numeric(target["금차계약금액"], errors="coerce").fillna(0)
-            target["★가공_계약금액"] = sub_amt.where(sub_amt != 0, total_amt).astype(int)
-        else:
-            target["★가공_계약금액"] = total_amt.astype(int)
+    repeat_base = build_repeat_base(df)
 
     return display_out, repeat_base
 
+# ─────────────────────────────────────────────
+# 반복수주 — daily_update.py가 만든 산출물을 읽고, 없으면 직접 계산
+# ─────────────────────────────────────────────
+# Drive 파일은 하루 한 번 바뀌고, 내용은 drive_cache가 버전(md5)이 같으면 디스크에서 읽는다
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_repeat_artifact():
+    return load_repeat_artifact(os.environ.get("GOOGLE_AUTH_JSON"))
+
+def get_repeat_df(region: str, repeat_display_df: pd.DataFrame) -> pd.DataFrame:
+    loaded = _load_repeat_artifact()
+    if loaded is None:
+        return detect_repeat_contracts(repeat_display_df, threshold=REPEAT_THRESHOLD)
+    repeat_df, _ = loaded
+    if repeat_df.empty or region == "전국":
+        return repeat_df.drop(columns=["광역단위"], errors="ignore")
+    return repeat_df[repeat_df["광역단위"] == region].drop(columns=["광역단위"]).reset_index(drop=True)
+
 # ─────────────────────────────────────────────
 # 데이터 로드 — 발주계획
 # ─────────────────────────────────────────────
@@ -391,10 +257,7 @@ def get_baljoo_df() -> pd.DataFrame:
     if not auth_json:
         return pd.DataFrame()
     try:
-        creds_dict = json.loads(auth_json)
-        scope      = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds      = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client     = gspread.authorize(creds)
+        client     = google_clients.gspread_client(auth_json)
         ws         = client.open("나라장터_용역_발주계획").get_worksheet(0)
         records    = ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
     except Exception as e:
@@ -404,25 +267,22 @@ def get_baljoo_df() -> pd.DataFrame:
     if not records:
         return pd.DataFrame()
 
-    df         = pd.DataFrame(records)
-    agency_col = df["기관명"].astype(str).str.strip()
-    mask       = agency_col.apply(lambda a: any(a.startswith(d) for d in FULL_DISTRICT_LIST))
-    df         = df[mask & ~agency_col.str.contains("교육청", na=False)].copy()
+    df             = pd.DataFrame(records)
+    districts      = district_frame(df["기관명"])
+    df             = df[districts["관할"]].copy()
+    df["광역단위"] = districts["광역단위"]
 
     sn           = df["사업명"].astype(str)
     include_mask = sn.str.contains("유지", na=False) & sn.str.contains("통합관제|통합|CCTV", na=False)
     exclude_mask = sn.str.contains("청사|악취|미세먼지|상담실|보건소|홈페이지|발급기|공간정보|계측기|부동산", na=False)
     df           = df[include_mask & ~exclude_mask].copy()
 
-    df["발주일자"] = df.apply(
-        lambda r: parse_baljoo_date(r.get("발주년도", ""), r.get("발주월", "")), axis=1
-    )
+    df["발주일자"] = map_unique_rows(df, ["발주년도", "발주월"], parse_baljoo_date)
 
     today      = pd.Timestamp(datetime.now().date())
     six_months = today - relativedelta(months=6)
     df         = df[df["발주일자"].notna() & (df["발주일자"] >= six_months)].copy()
 
-    df["광역단위"]    = df["기관명"].astype(str).apply(get_metro)
     df["합계발주금액"] = pd.to_numeric(df["합계발주금액"], errors="coerce").fillna(0).astype(int)
     df["발주월_표시"] = df["발주일자"].dt.strftime("%Y년 %m월").fillna("정보없음")
 
@@ -437,10 +297,7 @@ def get_gong_df() -> pd.DataFrame:
     if not auth_json:
         return pd.DataFrame()
     try:
-        creds_dict = json.loads(auth_json)
-        scope      = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds      = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client     = gspread.authorize(creds)
+        client     = google_clients.gspread_client(auth_json)
         ws         = client.open("나라장터_유지보수_공고").get_worksheet(0)
         records    = ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
     except Exception as e:
@@ -450,10 +307,10 @@ def get_gong_df() -> pd.DataFrame:
     if not records:
         return pd.DataFrame()
 
-    df         = pd.DataFrame(records)
-    agency_col = df["수요기관명"].astype(str).str.strip()
-    mask       = agency_col.apply(lambda a: any(a.startswith(d) for d in FULL_DISTRICT_LIST))
-    df         = df[mask & ~agency_col.str.contains("교육청", na=False)].copy()
+    df             = pd.DataFrame(records)
+    districts      = district_frame(df["수요기관명"])
+    df             = df[districts["관할"]].copy()
+    df["광역단위"] = districts["광역단위"]
 
     sn           = df["입찰공고명"].astype(str)
     include_mask = sn.str.contains("유지", na=False) & sn.str.contains("통합관제|통합|CCTV", na=False)
@@ -474,14 +331,59 @@ def get_gong_df() -> pd.DataFrame:
     )
     df["입찰개시일_표시"] = df["입찰개시일시_dt"].dt.strftime("%Y-%m-%d").fillna("-")
     df["입찰마감일_표시"] = df["입찰마감일시_dt"].dt.strftime("%Y-%m-%d").fillna("-")
-    df["마감여부"]        = df["입찰마감일시_dt"].apply(
-        lambda d: "마감" if pd.notna(d) and d < today else "진행중"
-    )
+    df["마감여부"]        = (df["입찰마감일시_dt"] < today).map({True: "마감", False: "진행중"})
     df["배정예산금액"] = pd.to_numeric(df["배정예산금액"], errors="coerce").fillna(0).astype(int)
-    df["광역단위"]     = df["수요기관명"].astype(str).apply(get_metro)
 
     return df
 
+# ─────────────────────────────────────────────
+# 뷰 캐시 — 페이지를 넘길 때 전체 필터·정렬·HTML을 다시 만들지 않도록
+# ─────────────────────────────────────────────
+def session_memo(name: str, key: tuple, build):
+    """key가 지난번과 같으면 session_state에 보관한 값을, 다르면 build()로 새로 만든 값을 돌려준다."""
+    memo = st.session_state.setdefault("_view_memo", {})
+    hit = memo.get(name)
+    if hit is None or hit[0] != key:
+        hit = memo[name] = (key, build())
+    return hit[1]
+
+def source_key(df: pd.DataFrame) -> str:
+    """st.cache_resource가 돌려준 원본 df의 식별자. 새로고침으로 다시 읽은 df는 새 값을 받는다."""
+    if "view_token" not in df.attrs:
+        df.attrs["view_token"] = uuid.uuid4().hex
+    return df.attrs["view_token"]
+
+def row_html_cache(name: str, source: pd.DataFrame) -> dict:
+    """원본 df의 행 index → 렌더링한 <td> 묶음. 원본이 바뀌면 비운다."""
+    return session_memo(f"rows:{name}", source_key(source), dict)
+
+def page_rows(source: pd.DataFrame, index: pd.Index, page: int, cols: list) -> pd.DataFrame:
+    return source.loc[index[(page-1)*PAGE_SIZE : page*PAGE_SIZE], cols]
+
+def _table_html(df: pd.DataFrame, headers: str, cell, hover: str, min_width: int, row_cache: dict | None = None) -> str:
+    cells = [row_cache.get(k) for k in df.index] if row_cache is not None else [None] * len(df)
+    todo  = [i for i, c in enumerate(cells) if c is None]
+    for i, row in zip(todo, df.iloc[todo].itertuples(index=False, name=None)):
+        cells[i] = "".join(cell(col, val) for col, val in zip(df.columns, row))
+        if row_cache is not None:
+            row_cache[df.index[i]] = cells[i]
+
+    rows = []
+    for i, row_cells in enumerate(cells):
+        bg = "#fff" if i % 2 == 0 else "#f8fafc"
+        rows.append(
+            f'<tr style="background:{bg};" '
+            f'onmouseover="this.style.background=\'{hover}\'" '
+            f'onmouseout="this.style.background=\'{bg}\'">'
+            + row_cells + "</tr>"
+        )
+    return (f'<div style="width:100%;overflow-x:auto;border-radius:12px;'
+            f'box-shadow:0 2px 12px rgba(0,0,0,.08);margin-top:.5rem;">'
+            f'<table style="width:100%;border-collapse:collapse;min-width:{min_width}px;">'
+            f'<thead><tr>{headers}</tr></thead>'
+            f'<tbody>{"".join(rows)}</tbody>'
+            f'</table></div>')
+
 # ─────────────────────────────────────────────
 # HTML 테이블 — 계약내역
 # ─────────────────────────────────────────────
@@ -497,7 +399,7 @@ def status_badge(val: str) -> str:
     return (f'<span style="background:{bg};color:{color};padding:3px 10px;'
             f'border-radius:999px;font-size:.85rem;font-weight:600;white-space:nowrap;">{val}</span>')
 
-def render_info_table(df: pd.DataFrame) -> str:
+def render_info_table(df: pd.DataFrame, row_cache: dict | None = None) -> str:
     COL_LABELS = {
         "수요기관": "수요기관", "계약명": "계약명", "업체명": "업체명",
         "계약금액": "계약금액(원)", "계약일자": "계약일자", "착수일자": "착수일자",
@@ -507,38 +409,21 @@ def render_info_table(df: pd.DataFrame) -> str:
           "white-space:nowrap;border-bottom:2px solid #2563eb;text-align:left;")
     TD = "padding:11px 14px;font-size:1rem;color:#1e293b;border-bottom:1px solid #e2e8f0;vertical-align:middle;"
 
+    def cell(col, val) -> str:
+        if col == "URL":
+            return f'<td style="{TD}text-align:center;"><a href="{val}" target="_blank" style="color:#2563eb;font-weight:600;text-decoration:none;">🔗 보기</a></td>'
+        if col == "남은기간":
+            return f'<td style="{TD}">{status_badge(str(val))}</td>'
+        if col == "계약금액":
+            try:   fmt = f"{int(val):,}"
+            except: fmt = str(val)
+            return f'<td style="{TD}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
+        if col in ("수요기관", "계약명", "업체명"):
+            return f'<td style="{TD}max-width:250px;word-break:keep-all;">{str(val)}</td>'
+        return f'<td style="{TD}white-space:nowrap;">{str(val)}</td>'
+
     headers = "".join(f'<th style="{TH}">{COL_LABELS.get(c, c)}</th>' for c in df.columns)
-    rows = []
-    for i, (_, row) in enumerate(df.iterrows()):
-        bg = "#fff" if i % 2 == 0 else "#f8fafc"
-        cells = []
-        for col in df.columns:
-            val = row[col]
-            if col == "URL":
-                cell = f'<td style="{TD}text-align:center;"><a href="{val}" target="_blank" style="color:#2563eb;font-weight:600;text-decoration:none;">🔗 보기</a></td>'
-            elif col == "남은기간":
-                cell = f'<td style="{TD}">{status_badge(str(val))}</td>'
-            elif col == "계약금액":
-                try:   fmt = f"{int(val):,}"
-                except: fmt = str(val)
-                cell = f'<td style="{TD}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
-            elif col in ("수요기관", "계약명", "업체명"):
-                cell = f'<td style="{TD}max-width:250px;word-break:keep-all;">{str(val)}</td>'
-            else:
-                cell = f'<td style="{TD}white-space:nowrap;">{str(val)}</td>'
-            cells.append(cell)
-        rows.append(
-            f'<tr style="background:{bg};" '
-            f'onmouseover="this.style.background=\'#eff6ff\'" '
-            f'onmouseout="this.style.background=\'{bg}\'">'
-            + "".join(cells) + "</tr>"
-        )
-    return (f'<div style="width:100%;overflow-x:auto;border-radius:12px;'
-            f'box-shadow:0 2px 12px rgba(0,0,0,.08);margin-top:.5rem;">'
-            f'<table style="width:100%;border-collapse:collapse;min-width:1000px;">'
-            f'<thead><tr>{headers}</tr></thead>'
-            f'<tbody>{"".join(rows)}</tbody>'
-            f'</table></div>')
+    return _table_html(df, headers, cell, hover="#eff6ff", min_width=1000, row_cache=row_cache)
 
 # ─────────────────────────────────────────────
 # HTML 테이블 — 반복수주
@@ -602,7 +487,7 @@ def render_repeat_table(df: pd.DataFrame) -> str:
 # ─────────────────────────────────────────────
 # HTML 테이블 — 발주계획
 # ─────────────────────────────────────────────
-def render_plan_table(df: pd.DataFrame) -> str:
+def render_plan_table(df: pd.DataFrame, row_cache: dict | None = None) -> str:
     COL_LABELS = {
         "기관명": "기관명", "사업명": "사업명", "발주월_표시": "발주월",
         "합계발주금액": "발주금액(원)", "계약방법명": "계약방법", "조달방식": "조달방식",
@@ -614,54 +499,90 @@ def render_plan_table(df: pd.DataFrame) -> str:
     TD = "padding:11px 14px;font-size:1rem;color:#1e293b;border-bottom:1px solid #e2e8f0;vertical-align:middle;"
     G2B_URL = "https://www.g2b.go.kr"
 
+    def cell(col, val) -> str:
+        if col == "발주계획통합번호":
+            num = str(val).strip() if val and str(val).strip() not in ("", "nan") else ""
+            if num:
+                return (
+                    f'<td style="{TD}text-align:center;">'
+                    f'<span style="font-size:.8rem;color:#475569;display:block;margin-bottom:3px;">{num}</span>'
+                    f'<a href="{G2B_URL}" target="_blank" '
+                    f'style="background:#059669;color:#fff;padding:3px 10px;border-radius:6px;'
+                    f'font-size:.82rem;font-weight:600;text-decoration:none;white-space:nowrap;">'
+                    f'🔗 나라장터</a></td>'
+                )
+            return f'<td style="{TD}text-align:center;color:#94a3b8;">-</td>'
+        if col == "합계발주금액":
+            try:   fmt = f"{int(val):,}"
+            except: fmt = str(val)
+            return f'<td style="{TD}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
+        if col == "발주월_표시":
+            return (f'<td style="{TD}text-align:center;">'
+                    f'<span style="background:#ecfdf5;color:#065f46;padding:3px 10px;'
+                    f'border-radius:999px;font-size:.85rem;font-weight:600;">{str(val)}</span></td>')
+        if col in ("기관명", "사업명"):
+            return f'<td style="{TD}max-width:220px;word-break:keep-all;">{str(val)}</td>'
+        if col == "비고내용":
+            return f'<td style="{TD}max-width:180px;font-size:.9rem;color:#475569;word-break:keep-all;">{str(val) if str(val) != "nan" else "-"}</td>'
+        display_val = str(val) if str(val) != "nan" else "-"
+        return f'<td style="{TD}white-space:nowrap;">{display_val}</td>'
+
     headers = "".join(f'<th style="{TH}">{COL_LABELS.get(c, c)}</th>' for c in df.columns)
-    rows = []
-    for i, (_, row) in enumerate(df.iterrows()):
-        bg = "#fff" if i % 2 == 0 else "#f8fafc"
-        cells = []
-        for col in df.columns:
-            val = row[col]
-            if col == "발주계획통합번호":
-                num = str(val).strip() if val and str(val).strip() not in ("", "nan") else ""
-                if num:
-                    cell = (
-                        f'<td style="{TD}text-align:center;">'
-                        f'<span style="font-size:.8rem;color:#475569;display:block;margin-bottom:3px;">{num}</span>'
-                        f'<a href="{G2B_URL}" target="_blank" '
-                        f'style="background:#059669;color:#fff;padding:3px 10px;border-radius:6px;'
-                        f'font-size:.82rem;font-weight:600;text-decoration:none;white-space:nowrap;">'
-                        f'🔗 나라장터</a></td>'
-                    )
-                else:
-                    cell = f'<td style="{TD}text-align:center;color:#94a3b8;">-</td>'
-            elif col == "합계발주금액":
-                try:   fmt = f"{int(val):,}"
-                except: fmt = str(val)
-                cell = f'<td style="{TD}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
-            elif col == "발주월_표시":
-                cell = (f'<td style="{TD}text-align:center;">'
-                        f'<span style="background:#ecfdf5;color:#065f46;padding:3px 10px;'
-                        f'border-radius:999px;font-size:.85rem;font-weight:600;">{str(val)}</span></td>')
-            elif col in ("기관명", "사업명"):
-                cell = f'<td style="{TD}max-width:220px;word-break:keep-all;">{str(val)}</td>'
-            elif col == "비고내용":
-                cell = f'<td style="{TD}max-width:180px;font-size:.9rem;color:#475569;word-break:keep-all;">{str(val) if str(val) != "nan" else "-"}</td>'
+    return _table_html(df, headers, cell, hover="#ecfdf5", min_width=1200, row_cache=row_cache)
+
+# ─────────────────────────────────────────────
+# HTML 테이블 — 공고
+# ─────────────────────────────────────────────
+def render_gong_table(df: pd.DataFrame, row_cache: dict | None = None) -> str:
+    COL_LABELS = {
+        "입찰공고명":      "입찰공고명",
+        "공고기관명":      "공고기관",
+        "수요기관명":      "수요기관",
+        "입찰개시일_표시": "입찰개시일",
+        "입찰마감일_표시": "입찰마감일",
+        "배정예산금액":    "배정예산(원)",
+        "계약체결방법명":  "계약방식",
+        "마감여부":        "상태",
+        "입찰공고상세URL": "공고 상세",
+    }
+    TH = ("background:#4c1d95;color:#fff;padding:12px 14px;font-size:0.95rem;font-weight:700;"
+          "white-space:nowrap;border-bottom:2px solid #7c3aed;text-align:left;")
+    TD = "padding:11px 14px;font-size:1rem;color:#1e293b;border-bottom:1px solid #e2e8f0;vertical-align:middle;"
+
+    def cell(col, val) -> str:
+        if col == "입찰공고상세URL":
+            url = str(val).strip()
+            if url and url != "nan":
+                return f'<td style="{TD}text-align:center;"><a href="{url}" target="_blank" style="background:#7c3aed;color:#fff;padding:4px 12px;border-radius:6px;font-size:.85rem;font-weight:600;text-decoration:none;white-space:nowrap;">🔗 바로가기</a></td>'
+            return f'<td style="{TD}text-align:center;color:#94a3b8;">-</td>'
+        if col == "배정예산금액":
+            try:   fmt = f"{int(val):,}"
+            except: fmt = str(val)
+            return f'<td style="{TD}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
+        if col == "계약체결방법명":
+            display = str(val) if str(val) not in ("", "nan") else "-"
+            if "수의" in display:
+                bg_c, fg_c = "#fff7ed", "#c2410c"
+            elif "제한" in display:
+                bg_c, fg_c = "#eff6ff", "#1d4ed8"
             else:
-                display_val = str(val) if str(val) != "nan" else "-"
-                cell = f'<td style="{TD}white-space:nowrap;">{display_val}</td>'
-            cells.append(cell)
-        rows.append(
-            f'<tr style="background:{bg};" '
-            f'onmouseover="this.style.background=\'#ecfdf5\'" '
-            f'onmouseout="this.style.background=\'{bg}\'">'
-            + "".join(cells) + "</tr>"
-        )
-    return (f'<div style="width:100%;overflow-x:auto;border-radius:12px;'
-            f'box-shadow:0 2px 12px rgba(0,0,0,.08);margin-top:.5rem;">'
-            f'<table style="width:100%;border-collapse:collapse;min-width:1200px;">'
-            f'<thead><tr>{headers}</tr></thead>'
-            f'<tbody>{"".join(rows)}</tbody>'
-            f'</table></div>')
+                bg_c, fg_c = "#f1f5f9", "#475569"
+            return (f'<td style="{TD}text-align:center;">'
+                    f'<span style="background:{bg_c};color:{fg_c};padding:3px 10px;'
+                    f'border-radius:999px;font-size:.85rem;font-weight:600;white-space:nowrap;">'
+                    f'{display}</span></td>')
+        if col == "마감여부":
+            if val == "진행중":
+                badge = '<span style="background:#f0fdf4;color:#15803d;padding:3px 10px;border-radius:999px;font-size:.85rem;font-weight:600;">진행중</span>'
+            else:
+                badge = '<span style="background:#fef2f2;color:#b91c1c;padding:3px 10px;border-radius:999px;font-size:.85rem;font-weight:600;">마감</span>'
+            return f'<td style="{TD}">{badge}</td>'
+        if col == "입찰공고명":
+            return f'<td style="{TD}max-width:280px;word-break:keep-all;">{str(val)}</td>'
+        return f'<td style="{TD}white-space:nowrap;">{str(val) if str(val) != "nan" else "-"}</td>'
+
+    headers = "".join(f'<th style="{TH}">{COL_LABELS.get(c, c)}</th>' for c in df.columns)
+    return _table_html(df, headers, cell, hover="#f5f3ff", min_width=1100, row_cache=row_cache)
 
 # ─────────────────────────────────────────────
 # 페이지네이션
@@ -769,27 +690,26 @@ with tab1:
         st.warning("⚠️ 데이터를 불러올 수 없습니다.")
     else:
         region_to_show = st.session_state["search_region"]
+        region_key     = (source_key(processed_df), region_to_show)
 
         # 화면 표시용 df
-        display_df = (
+        display_df = session_memo("info_region", region_key, lambda: (
             processed_df if region_to_show == "전국"
             else processed_df[processed_df["광역단위"] == region_to_show]
-        )
-        # 반복수주 탐지용 df (3년치 전체)
-        repeat_display_df = (
-            repeat_base_df if region_to_show == "전국"
-            else repeat_base_df[repeat_base_df["광역단위"] == region_to_show]
-        )
+        ))
 
         # ── 계약 요약 stat 카드 4개 ──
-        total_count   = len(display_df)
-        active_count  = len(display_df[
-            ~display_df["남은기간"].str.contains("만료", na=False) &
-            (display_df["남은기간"] != "정보부족") &
-            (display_df["남은기간"] != "계산불가")
-        ])
-        expiring_soon = len(display_df[display_df["남은기간"].str.match(r"^[0-3]개월", na=False)])
-        total_amount  = display_df["★가공_계약금액"].sum()
+        def info_summary():
+            remaining = display_df["남은기간"]
+            return (
+                len(display_df),
+                int((~remaining.str.contains("만료", na=False) & (remaining != "정보부족") & (remaining != "계산불가")).sum()),
+                int(remaining.str.match(r"^[0-3]개월", na=False).sum()),
+                display_df["★가공_계약금액"].sum(),
+                sorted(display_df["★가공_수요기관"].dropna().unique()),
+                sorted(display_df["★가공_업체명"].dropna().unique()),
+            )
+        total_count, active_count, expiring_soon, total_amount, agency_options, company_options = session_memo("info_summary", region_key, info_summary)
         amount_str    = f"{total_amount/100_000_000:.1f}억" if total_amount >= 100_000_000 else f"{total_amount:,}원"
 
         c1, c2, c3, c4 = st.columns(4)
@@ -802,7 +722,12 @@ with tab1:
 
         # ── ★ 반복수주 요약 배너 + 모달 버튼 (상단 고정) ──
         with st.spinner("🔍 반복수주 패턴 분석 중…"):
-            repeat_df = detect_repeat_contracts(repeat_display_df, threshold=0.80)
+            # 반복수주 탐지용 df (3년치 전체) — 산출물이 없을 때만 쓴다
+            repeat_df = session_memo("repeat", (source_key(repeat_base_df), region_to_show), lambda: get_repeat_df(
+                region_to_show,
+                repeat_base_df if region_to_show == "전국"
+                else repeat_base_df[repeat_base_df["광역단위"] == region_to_show],
+            ))
 
         if not repeat_df.empty:
             rep_total_amt = repeat_df["계약금액합계"].sum()
@@ -841,24 +766,30 @@ with tab1:
         # ── 세부 필터 ──
         with st.expander("🎛️ 결과 내 세부 필터", expanded=False):
             fc1, fc2, fc3 = st.columns(3)
-            with fc1: sel_agency  = st.multiselect("수요기관",  sorted(display_df["★가공_수요기관"].dropna().unique()), placeholder="전체", key="info_f_agency")
-            with fc2: sel_company = st.multiselect("업체명",    sorted(display_df["★가공_업체명"].dropna().unique()),   placeholder="전체", key="info_f_company")
+            with fc1: sel_agency  = st.multiselect("수요기관",  agency_options,  placeholder="전체", key="info_f_agency")
+            with fc2: sel_company = st.multiselect("업체명",    company_options, placeholder="전체", key="info_f_company")
             with fc3: sel_status  = st.multiselect("계약 상태", ["진행중", "3개월 내 만료", "만료됨"],                  placeholder="전체", key="info_f_status")
             kw = st.text_input("🔎 계약명 키워드 검색", placeholder="예: CCTV, 통합관제, 영상...", key="info_kw")
 
-        filtered_df = display_df
-        if sel_agency:  filtered_df = filtered_df[filtered_df["★가공_수요기관"].isin(sel_agency)]
-        if sel_company: filtered_df = filtered_df[filtered_df["★가공_업체명"].isin(sel_company)]
-        if kw:          filtered_df = filtered_df[filtered_df["★가공_계약명"].str.contains(kw, case=False, na=False)]
-        if sel_status:
-            conds = []
-            if "진행중"        in sel_status: conds.append(~filtered_df["남은기간"].str.contains("만료|정보부족|오류", na=True))
-            if "3개월 내 만료" in sel_status: conds.append(filtered_df["남은기간"].str.match(r"^[0-3]개월", na=False))
-            if "만료됨"        in sel_status: conds.append(filtered_df["남은기간"] == "만료됨")
-            if conds:
-                combined = conds[0]
-                for c in conds[1:]: combined |= c
-                filtered_df = filtered_df[combined]
+        def info_filter():
+            filtered_df = display_df
+            if sel_agency:  filtered_df = filtered_df[filtered_df["★가공_수요기관"].isin(sel_agency)]
+            if sel_company: filtered_df = filtered_df[filtered_df["★가공_업체명"].isin(sel_company)]
+            if kw:          filtered_df = filtered_df[filtered_df["★가공_계약명"].str.contains(kw, case=False, na=False)]
+            if sel_status:
+                conds = []
+                if "진행중"        in sel_status: conds.append(~filtered_df["남은기간"].str.contains("만료|정보부족|오류", na=True))
+                if "3개월 내 만료" in sel_status: conds.append(filtered_df["남은기간"].str.match(r"^[0-3]개월", na=False))
+                if "만료됨"        in sel_status: conds.append(filtered_df["남은기간"] == "만료됨")
+                if conds:
+                    combined = conds[0]
+                    for c in conds[1:]: combined |= c
+                    filtered_df = filtered_df[combined]
+            return filtered_df.index
+
+        # 필터 결과는 행 index로만 보관하고, 페이지를 넘길 때는 다시 계산하지 않는다
+        filter_key     = region_key + (tuple(sel_agency), tuple(sel_company), tuple(sel_status), kw)
+        filtered_index = session_memo("info_filtered", filter_key, info_filter)
 
         COLS = ["★가공_수요기관", "★가공_계약명", "★가공_업체명", "★가공_계약금액",
                 "계약일자", "착수일자", "★가공_계약만료일", "남은기간", "계약상세정보URL"]
@@ -867,13 +798,15 @@ with tab1:
         st.divider()
         rc, dc = st.columns([6, 2])
         with rc:
-            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📊 {region_to_show} 계약 현황 — {len(filtered_df):,}건</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📊 {region_to_show} 계약 현황 — {len(filtered_index):,}건</div>', unsafe_allow_html=True)
         with dc:
-            exp_df = filtered_df[COLS].copy()
-            exp_df.columns = [col_rename[c] for c in COLS]
+            def info_csv():
+                exp_df = display_df.loc[filtered_index, COLS].copy()
+                exp_df.columns = [col_rename[c] for c in COLS]
+                return exp_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
             st.download_button(
                 "📥 CSV 다운로드",
-                data=exp_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=session_memo("info_csv", filter_key, info_csv),
                 file_name=f"계약현황_{region_to_show}_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv", use_container_width=True, key="info_download"
             )
@@ -885,9 +818,13 @@ with tab1:
             "계약일자 (최신순)": "계약일자",
         }
         sort_choice = st.selectbox("정렬 기준", list(sort_map.keys()), index=3, label_visibility="collapsed", key="info_sort")
-        sorted_df   = filtered_df.sort_values(sort_map[sort_choice], ascending=sort_choice not in ["계약금액 (높은순)", "계약일자 (최신순)"])
+        sorted_index = session_memo("info_sorted", filter_key + (sort_choice,), lambda: (
+            display_df.loc[filtered_index]
+            .sort_values(sort_map[sort_choice], ascending=sort_choice not in ["계약금액 (높은순)", "계약일자 (최신순)"])
+            .index
+        ))
 
-        total_rows  = len(sorted_df)
+        total_rows  = len(sorted_index)
         total_pages = max(1, (total_rows + PAGE_SIZE - 1) // PAGE_SIZE)
         if st.session_state["page"] > total_pages:
             st.session_state["page"] = 1
@@ -895,8 +832,8 @@ with tab1:
         st.markdown(f'<div style="padding-top:4px;color:#64748b;font-size:1rem;margin-bottom:.5rem;">총 <b>{total_rows:,}건</b> · {total_pages}페이지</div>', unsafe_allow_html=True)
         page = render_pagination(total_pages, "page")
 
-        paged_df = sorted_df[COLS].iloc[(page-1)*PAGE_SIZE : page*PAGE_SIZE].rename(columns=col_rename)
-        st.markdown(render_info_table(paged_df), unsafe_allow_html=True)
+        paged_df = page_rows(display_df, sorted_index, page, COLS).rename(columns=col_rename)
+        st.markdown(render_info_table(paged_df, row_html_cache("info", processed_df)), unsafe_allow_html=True)
         st.markdown(f'<div style="text-align:center;color:#94a3b8;font-size:0.95rem;margin-top:1rem;">{page} / {total_pages} 페이지 &nbsp;·&nbsp; {(page-1)*PAGE_SIZE+1}–{min(page*PAGE_SIZE, total_rows)}번째 항목</div>', unsafe_allow_html=True)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -941,17 +878,25 @@ with tab2:
         st.warning("⚠️ 조건에 맞는 발주 계획 데이터가 없습니다.")
     else:
         plan_region  = st.session_state["plan_search_region"]
-        plan_display = (
+        plan_key     = (source_key(baljoo_df), plan_region)
+        plan_display = session_memo("plan_region", plan_key, lambda: (
             baljoo_df if plan_region == "전국"
             else baljoo_df[baljoo_df["광역단위"] == plan_region]
-        )
+        ))
 
-        today      = pd.Timestamp(datetime.now().date())
-        next_month = today + relativedelta(months=1)
-        total_count  = len(plan_display)
-        agency_count = plan_display["기관명"].nunique()
-        soon_count   = len(plan_display[plan_display["발주일자"] <= next_month])
-        total_amount = plan_display["합계발주금액"].sum()
+        def plan_summary():
+            today      = pd.Timestamp(datetime.now().date())
+            next_month = today + relativedelta(months=1)
+            return (
+                len(plan_display),
+                plan_display["기관명"].nunique(),
+                int((plan_display["발주일자"] <= next_month).sum()),
+                plan_display["합계발주금액"].sum(),
+                sorted(plan_display["기관명"].dropna().unique()),
+                sorted(plan_display["발주월_표시"].dropna().unique()),
+                sorted(plan_display["계약방법명"].dropna().unique()),
+            )
+        total_count, agency_count, soon_count, total_amount, plan_agencies, plan_months, plan_methods = session_memo("plan_summary", plan_key, plan_summary)
         amount_str   = f"{total_amount/100_000_000:.1f}억" if total_amount >= 100_000_000 else f"{total_amount:,}원"
 
         c1, c2, c3, c4 = st.columns(4)
@@ -964,30 +909,36 @@ with tab2:
 
         with st.expander("🎛️ 결과 내 세부 필터", expanded=False):
             fc1, fc2, fc3 = st.columns(3)
-            with fc1: sel_agency  = st.multiselect("기관명",   sorted(plan_display["기관명"].dropna().unique()),     placeholder="전체", key="plan_f_agency")
-            with fc2: sel_month   = st.multiselect("발주월",   sorted(plan_display["발주월_표시"].dropna().unique()), placeholder="전체", key="plan_f_month")
-            with fc3: sel_method  = st.multiselect("계약방법", sorted(plan_display["계약방법명"].dropna().unique()),  placeholder="전체", key="plan_f_method")
+            with fc1: sel_agency  = st.multiselect("기관명",   plan_agencies, placeholder="전체", key="plan_f_agency")
+            with fc2: sel_month   = st.multiselect("발주월",   plan_months,   placeholder="전체", key="plan_f_month")
+            with fc3: sel_method  = st.multiselect("계약방법", plan_methods,  placeholder="전체", key="plan_f_method")
             kw2 = st.text_input("🔎 사업명 키워드 검색", placeholder="예: CCTV, 통합관제, 영상...", key="plan_kw")
 
-        filtered_plan = plan_display
-        if sel_agency:  filtered_plan = filtered_plan[filtered_plan["기관명"].isin(sel_agency)]
-        if sel_month:   filtered_plan = filtered_plan[filtered_plan["발주월_표시"].isin(sel_month)]
-        if sel_method:  filtered_plan = filtered_plan[filtered_plan["계약방법명"].isin(sel_method)]
-        if kw2:         filtered_plan = filtered_plan[filtered_plan["사업명"].str.contains(kw2, case=False, na=False)]
+        def plan_filter():
+            filtered_plan = plan_display
+            if sel_agency:  filtered_plan = filtered_plan[filtered_plan["기관명"].isin(sel_agency)]
+            if sel_month:   filtered_plan = filtered_plan[filtered_plan["발주월_표시"].isin(sel_month)]
+            if sel_method:  filtered_plan = filtered_plan[filtered_plan["계약방법명"].isin(sel_method)]
+            if kw2:         filtered_plan = filtered_plan[filtered_plan["사업명"].str.contains(kw2, case=False, na=False)]
+            return filtered_plan.index
+
+        plan_filter_key = plan_key + (tuple(sel_agency), tuple(sel_month), tuple(sel_method), kw2)
+        plan_index      = session_memo("plan_filtered", plan_filter_key, plan_filter)
 
         st.divider()
         rc2, dc2 = st.columns([6, 2])
         with rc2:
-            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📋 {plan_region} 발주 계획 — {len(filtered_plan):,}건</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📋 {plan_region} 발주 계획 — {len(plan_index):,}건</div>', unsafe_allow_html=True)
         with dc2:
             PLAN_COLS     = ["기관명", "사업명", "발주월_표시", "합계발주금액", "계약방법명",
                              "조달방식", "담당자명", "전화번호", "부서명", "발주계획통합번호"]
-            plan_exp_cols = [c for c in PLAN_COLS if c in filtered_plan.columns]
-            exp_plan      = filtered_plan[plan_exp_cols].copy()
-            exp_plan.rename(columns={"발주월_표시": "발주월"}, inplace=True)
+            plan_exp_cols = [c for c in PLAN_COLS if c in plan_display.columns]
+            def plan_csv():
+                exp_plan = plan_display.loc[plan_index, plan_exp_cols].rename(columns={"발주월_표시": "발주월"})
+                return exp_plan.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
             st.download_button(
                 "📥 CSV 다운로드",
-                data=exp_plan.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=session_memo("plan_csv", plan_filter_key, plan_csv),
                 file_name=f"발주계획_{plan_region}_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv", use_container_width=True, key="plan_download"
             )
@@ -1004,7 +955,11 @@ with tab2:
             "발주금액 (높은순)": "합계발주금액",
         }
         sort_choice2 = st.selectbox("정렬 기준", list(plan_sort_map.keys()), index=1, label_visibility="collapsed", key="plan_sort")
-        sorted_plan  = filtered_plan.sort_values(plan_sort_map[sort_choice2], ascending=sort_choice2 == "기관명")
+        sorted_plan  = session_memo("plan_sorted", plan_filter_key + (sort_choice2,), lambda: (
+            plan_display.loc[plan_index]
+            .sort_values(plan_sort_map[sort_choice2], ascending=sort_choice2 == "기관명")
+            .index
+        ))
 
         total_rows2  = len(sorted_plan)
         total_pages2 = max(1, (total_rows2 + PAGE_SIZE - 1) // PAGE_SIZE)
@@ -1014,9 +969,8 @@ with tab2:
         st.markdown(f'<div style="padding-top:4px;color:#64748b;font-size:1rem;margin-bottom:.5rem;">총 <b>{total_rows2:,}건</b> · {total_pages2}페이지</div>', unsafe_allow_html=True)
         page2 = render_pagination(total_pages2, "plan_page")
 
-        plan_table_cols = [c for c in PLAN_COLS if c in sorted_plan.columns]
-        paged_plan      = sorted_plan[plan_table_cols].iloc[(page2-1)*PAGE_SIZE : page2*PAGE_SIZE].copy()
-        st.markdown(render_plan_table(paged_plan), unsafe_allow_html=True)
+        paged_plan = page_rows(plan_display, sorted_plan, page2, plan_exp_cols)
+        st.markdown(render_plan_table(paged_plan, row_html_cache("plan", baljoo_df)), unsafe_allow_html=True)
 
         st.markdown("""
         <div class="copy-notice">
@@ -1075,16 +1029,20 @@ with tab3:
         st.warning("⚠️ 조건에 맞는 공고 데이터가 없습니다.")
     else:
         gong_region  = st.session_state["gong_search_region"]
-        gong_display = (
+        gong_key     = (source_key(gong_df), gong_region)
+        gong_display = session_memo("gong_region", gong_key, lambda: (
             gong_df if gong_region == "전국"
             else gong_df[gong_df["광역단위"] == gong_region]
-        )
-
-        today        = pd.Timestamp(datetime.now().date())
-        total_count  = len(gong_display)
-        active_count = len(gong_display[gong_display["마감여부"] == "진행중"])
-        agency_count = gong_display["수요기관명"].nunique()
-        total_amount = gong_display["배정예산금액"].sum()
+        ))
+
+        total_count, active_count, agency_count, total_amount, gong_agencies, gong_methods = session_memo("gong_summary", gong_key, lambda: (
+            len(gong_display),
+            int((gong_display["마감여부"] == "진행중").sum()),
+            gong_display["수요기관명"].nunique(),
+            gong_display["배정예산금액"].sum(),
+            sorted(gong_display["수요기관명"].dropna().unique()),
+            sorted(gong_display["계약체결방법명"].dropna().unique()) if "계약체결방법명" in gong_display.columns else [],
+        ))
         amount_str   = f"{total_amount/100_000_000:.1f}억" if total_amount >= 100_000_000 else f"{total_amount:,}원"
 
         c1, c2, c3, c4 = st.columns(4)
@@ -1097,30 +1055,36 @@ with tab3:
 
         with st.expander("🎛️ 결과 내 세부 필터", expanded=False):
             fc1, fc2, fc3 = st.columns(3)
-            with fc1: sel_gong_agency = st.multiselect("수요기관명", sorted(gong_display["수요기관명"].dropna().unique()), placeholder="전체", key="gong_f_agency")
+            with fc1: sel_gong_agency = st.multiselect("수요기관명", gong_agencies,                                         placeholder="전체", key="gong_f_agency")
             with fc2: sel_gong_status = st.multiselect("마감여부",   ["진행중", "마감"],                                   placeholder="전체", key="gong_f_status")
-            with fc3: sel_gong_method = st.multiselect("계약방식",   sorted(gong_display["계약체결방법명"].dropna().unique()), placeholder="전체", key="gong_f_method") if "계약체결방법명" in gong_display.columns else None
+            with fc3: sel_gong_method = st.multiselect("계약방식",   gong_methods,                                          placeholder="전체", key="gong_f_method") if "계약체결방법명" in gong_display.columns else None
             kw3 = st.text_input("🔎 공고명 키워드 검색", placeholder="예: CCTV, 통합관제, 영상...", key="gong_kw")
 
-        filtered_gong = gong_display
-        if sel_gong_agency: filtered_gong = filtered_gong[filtered_gong["수요기관명"].isin(sel_gong_agency)]
-        if sel_gong_status: filtered_gong = filtered_gong[filtered_gong["마감여부"].isin(sel_gong_status)]
-        if sel_gong_method and "계약체결방법명" in filtered_gong.columns:
-            filtered_gong = filtered_gong[filtered_gong["계약체결방법명"].isin(sel_gong_method)]
-        if kw3: filtered_gong = filtered_gong[filtered_gong["입찰공고명"].str.contains(kw3, case=False, na=False)]
+        def gong_filter():
+            filtered_gong = gong_display
+            if sel_gong_agency: filtered_gong = filtered_gong[filtered_gong["수요기관명"].isin(sel_gong_agency)]
+            if sel_gong_status: filtered_gong = filtered_gong[filtered_gong["마감여부"].isin(sel_gong_status)]
+            if sel_gong_method and "계약체결방법명" in filtered_gong.columns:
+                filtered_gong = filtered_gong[filtered_gong["계약체결방법명"].isin(sel_gong_method)]
+            if kw3: filtered_gong = filtered_gong[filtered_gong["입찰공고명"].str.contains(kw3, case=False, na=False)]
+            return filtered_gong.index
+
+        gong_filter_key = gong_key + (tuple(sel_gong_agency), tuple(sel_gong_status), tuple(sel_gong_method or ()), kw3)
+        gong_index      = session_memo("gong_filtered", gong_filter_key, gong_filter)
 
         st.divider()
         rc3, dc3 = st.columns([6, 2])
         with rc3:
-            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📢 {gong_region} 유지보수 공고 — {len(filtered_gong):,}건</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="section-title" style="font-size:1.5rem;">📢 {gong_region} 유지보수 공고 — {len(gong_index):,}건</div>', unsafe_allow_html=True)
         with dc3:
             GONG_EXP_COLS = ["입찰공고명", "공고기관명", "수요기관명", "입찰개시일_표시",
                              "입찰마감일_표시", "배정예산금액", "계약체결방법명", "마감여부", "입찰공고상세URL"]
-            gong_exp_cols = [c for c in GONG_EXP_COLS if c in filtered_gong.columns]
-            exp_gong      = filtered_gong[gong_exp_cols].copy()
+            gong_exp_cols = [c for c in GONG_EXP_COLS if c in gong_display.columns]
             st.download_button(
                 "📥 CSV 다운로드",
-                data=exp_gong.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=session_memo("gong_csv", gong_filter_key, lambda: (
+                    gong_display.loc[gong_index, gong_exp_cols].to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
+                )),
                 file_name=f"유지보수공고_{gong_region}_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv", use_container_width=True, key="gong_download"
             )
@@ -1132,10 +1096,11 @@ with tab3:
             "수요기관명":          "수요기관명",
         }
         sort_choice3 = st.selectbox("정렬 기준", list(gong_sort_map.keys()), index=0, label_visibility="collapsed", key="gong_sort")
-        sorted_gong  = filtered_gong.sort_values(
-            gong_sort_map[sort_choice3],
-            ascending=sort_choice3 == "수요기관명"
-        )
+        sorted_gong  = session_memo("gong_sorted", gong_filter_key + (sort_choice3,), lambda: (
+            gong_display.loc[gong_index]
+            .sort_values(gong_sort_map[sort_choice3], ascending=sort_choice3 == "수요기관명")
+            .index
+        ))
 
         total_rows3  = len(sorted_gong)
         total_pages3 = max(1, (total_rows3 + PAGE_SIZE - 1) // PAGE_SIZE)
@@ -1148,78 +1113,7 @@ with tab3:
         GONG_TABLE_COLS = ["입찰공고명", "공고기관명", "수요기관명",
                            "입찰개시일_표시", "입찰마감일_표시",
                            "배정예산금액", "계약체결방법명", "마감여부", "입찰공고상세URL"]
-        gong_table_cols = [c for c in GONG_TABLE_COLS if c in sorted_gong.columns]
-        paged_gong      = sorted_gong[gong_table_cols].iloc[(page3-1)*PAGE_SIZE : page3*PAGE_SIZE].copy()
-
-        GONG_COL_LABELS = {
-            "입찰공고명":      "입찰공고명",
-            "공고기관명":      "공고기관",
-            "수요기관명":      "수요기관",
-            "입찰개시일_표시": "입찰개시일",
-            "입찰마감일_표시": "입찰마감일",
-            "배정예산금액":    "배정예산(원)",
-            "계약체결방법명":  "계약방식",
-            "마감여부":        "상태",
-            "입찰공고상세URL": "공고 상세",
-        }
-        TH_G = ("background:#4c1d95;color:#fff;padding:12px 14px;font-size:0.95rem;font-weight:700;"
-                "white-space:nowrap;border-bottom:2px solid #7c3aed;text-align:left;")
-        TD_G = "padding:11px 14px;font-size:1rem;color:#1e293b;border-bottom:1px solid #e2e8f0;vertical-align:middle;"
-
-        headers_g = "".join(f'<th style="{TH_G}">{GONG_COL_LABELS.get(c,c)}</th>' for c in paged_gong.columns)
-        rows_g = []
-        for i, (_, row) in enumerate(paged_gong.iterrows()):
-            bg = "#fff" if i % 2 == 0 else "#f8fafc"
-            cells = []
-            for col in paged_gong.columns:
-                val = row[col]
-                if col == "입찰공고상세URL":
-                    url = str(val).strip()
-                    if url and url != "nan":
-                        cell = f'<td style="{TD_G}text-align:center;"><a href="{url}" target="_blank" style="background:#7c3aed;color:#fff;padding:4px 12px;border-radius:6px;font-size:.85rem;font-weight:600;text-decoration:none;white-space:nowrap;">🔗 바로가기</a></td>'
-                    else:
-                        cell = f'<td style="{TD_G}text-align:center;color:#94a3b8;">-</td>'
-                elif col == "배정예산금액":
-                    try:   fmt = f"{int(val):,}"
-                    except: fmt = str(val)
-                    cell = f'<td style="{TD_G}text-align:right;font-variant-numeric:tabular-nums;">{fmt}</td>'
-                elif col == "계약체결방법명":
-                    display = str(val) if str(val) not in ("", "nan") else "-"
-                    if "수의" in display:
-                        bg_c, fg_c = "#fff7ed", "#c2410c"
-                    elif "제한" in display:
-                        bg_c, fg_c = "#eff6ff", "#1d4ed8"
-                    else:
-                        bg_c, fg_c = "#f1f5f9", "#475569"
-                    cell = (f'<td style="{TD_G}text-align:center;">'
-                            f'<span style="background:{bg_c};color:{fg_c};padding:3px 10px;'
-                            f'border-radius:999px;font-size:.85rem;font-weight:600;white-space:nowrap;">'
-                            f'{display}</span></td>')
-                elif col == "마감여부":
-                    if val == "진행중":
-                        badge = '<span style="background:#f0fdf4;color:#15803d;padding:3px 10px;border-radius:999px;font-size:.85rem;font-weight:600;">진행중</span>'
-                    else:
-                        badge = '<span style="background:#fef2f2;color:#b91c1c;padding:3px 10px;border-radius:999px;font-size:.85rem;font-weight:600;">마감</span>'
-                    cell = f'<td style="{TD_G}">{badge}</td>'
-                elif col == "입찰공고명":
-                    cell = f'<td style="{TD_G}max-width:280px;word-break:keep-all;">{str(val)}</td>'
-                else:
-                    cell = f'<td style="{TD_G}white-space:nowrap;">{str(val) if str(val) != "nan" else "-"}</td>'
-                cells.append(cell)
-            rows_g.append(
-                f'<tr style="background:{bg};" '
-                f'onmouseover="this.style.background=\'#f5f3ff\'" '
-                f'onmouseout="this.style.background=\'{bg}\'">'
-                + "".join(cells) + "</tr>"
-            )
-
-        table_html = (
-            f'<div style="width:100%;overflow-x:auto;border-radius:12px;'
-            f'box-shadow:0 2px 12px rgba(0,0,0,.08);margin-top:.5rem;">'
-            f'<table style="width:100%;border-collapse:collapse;min-width:1100px;">'
-            f'<thead><tr>{headers_g}</tr></thead>'
-            f'<tbody>{"".join(rows_g)}</tbody>'
-            f'</table></div>'
-        )
-        st.markdown(table_html, unsafe_allow_html=True)
+        gong_table_cols = [c for c in GONG_TABLE_COLS if c in gong_display.columns]
+        paged_gong      = page_rows(gong_display, sorted_gong, page3, gong_table_cols)
+        st.markdown(render_gong_table(paged_gong, row_html_cache("gong", gong_df)), unsafe_allow_html=True)
         st.markdown(f'<div style="text-align:center;color:#94a3b8;font-size:0.95rem;margin-top:1rem;">{page3} / {total_pages3} 페이지 &nbsp;·&nbsp; {(page3-1)*PAGE_SIZE+1}–{min(page3*PAGE_SIZE, total_rows3)}번째 항목</div>', unsafe_allow_html=True)
@@ -1,19 +1,17 @@
 import os
 import sys
-import json
 import datetime
-import time
 import requests
 import pandas as pd
 import io
 import gc
 import threading
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from googleapiclient.http import MediaIoBaseUpload
-from google.auth.transport.requests import Request
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import drive_archive
+import google_clients
+import rate_limiter
+
 def log(msg):
     print(msg, flush=True)
 
@@ -21,7 +19,8 @@ save_lock = threading.Lock()
 
 # ================= 설정 =================
 SERVICE_KEY = os.environ.get('DATA_GO_KR_API_KEY')
-AUTH_JSON_STR = os.environ.get('GOOGLE_AUTH_JSON')
+# 통합 CSV는 서비스 계정 드라이브 최상위('root')에 있다. 파일 ID는 drive_archive.folder_index로 찾는다.
+NOTICE_CSV_FOLDER_ID = os.environ.get('G2B_NOTICE_FOLDER_ID', 'root')
 
 FILE_MAP = {
     '공사': 'https://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoCnstwkPPSSrch',
@@ -29,13 +28,6 @@ FILE_MAP = {
     '용역': 'https://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoServcPPSSrch'
 }
 
-def get_drive_service():
-    info = json.loads(AUTH_JSON_STR)
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=['https://www.googleapis.com/auth/drive']
-    )
-    return build('drive', 'v3', credentials=creds, cache_discovery=False), creds
-
 def fetch_data_chunk(category, url, s_dt, e_dt):
     all_data = []
     page = 1
@@ -48,7 +40,7 @@ def fetch_data_chunk(category, url, s_dt, e_dt):
             }
             log(f"   - [{category}] {s_dt} ~ {e_dt} | {page}p 요청")
             try:
-                res = session.get(url, params=params, timeout=45)
+                res = rate_limiter.get(url, params, timeout=45, session=session)
                 if res.status_code == 200:
                     res_json = res.json()
                     items = res_json.get('response', {}).get('body', {}).get('items', [])
@@ -62,21 +54,18 @@ def fetch_data_chunk(category, url, s_dt, e_dt):
             except: break
     return pd.DataFrame(all_data)
 
-def update_drive_robust(drive_service, creds, cat_name, new_df):
+def update_drive_robust(cat_name, new_df):
     if new_df.empty: return
     file_name = f"나라장터_공고_{cat_name}.csv"
+    drive_service = google_clients.drive_service()  # 스레드별 Drive 클라이언트 (공유 인증)
     
     with save_lock:
         try:
-            query = f"name='{file_name}' and trashed=false"
-            results = drive_service.files().list(q=query, fields='files(id)').execute()
-            items = results.get('files', [])
-            file_id = items[0]['id'] if items else None
+            item = drive_archive.folder_index(drive_service, NOTICE_CSV_FOLDER_ID).get(file_name)
+            file_id = item['id'] if item else None
             
             if file_id:
-                if not creds.valid: creds.refresh(Request())
-                download_url = f'https://www.googleapis.com/drive/v3/files/{file_id}?alt=media'
-                resp = requests.get(download_url, headers={'Authorization': f'Bearer {creds.token}'}, timeout=60)
+                resp = google_clients.drive_media(file_id, timeout=60)
                 
                 if resp.status_code == 200:
                     try:
@@ -94,15 +83,8 @@ def update_drive_robust(drive_service, creds, cat_name, new_df):
             
             # 🚀 저장 시 index=False를 사용하여 데이터만 넣고, 
             # 🚀 header=True(기본값)로 기존 컬럼명을 1행에 유지함
-            csv_buffer = io.BytesIO()
-            new_df.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
-            csv_buffer.seek(0)
-            
-            media = MediaIoBaseUpload(csv_buffer, mimetype='text/csv', resumable=True)
-            if file_id:
-                drive_service.files().update(fileId=file_id, media_body=media).execute()
-            else:
-                drive_service.files().create(body={'name': file_name}, media_body=media).execute()
+            data = new_df.to_csv(index=False).encode('utf-8-sig')
+            drive_archive.write_file(NOTICE_CSV_FOLDER_ID, file_name, data, 'text/csv')
             
             log(f"✅ [{cat_name}] 드라이브 저장 완료")
             del new_df
@@ -111,16 +93,12 @@ def update_drive_robust(drive_service, creds, cat_name, new_df):
         except Exception as e:
             log(f"❌ [{cat_name}] 드라이브 저장 오류: {e}")
 
-def process_category(category, url, date_chunks, drive_service, creds):
-    offset = {'공사': 0, '물품': 3, '용역': 6}[category]
-    time.sleep(offset)
-    
+def process_category(category, url, date_chunks):
     for s, e in date_chunks:
         log(f"\n🔄 [{category}] 구간 시작: {s} ~ {e}")
         chunk_df = fetch_data_chunk(category, url, s, e)
         if not chunk_df.empty:
-            update_drive_robust(drive_service, creds, category, chunk_df)
-        time.sleep(1)
+            update_drive_robust(category, chunk_df)
 
 def main():
     if len(sys.argv) < 3: return
@@ -136,11 +114,11 @@ def main():
         date_chunks.append((curr.strftime('%Y%m%d'), chunk_e.strftime('%Y%m%d')))
         curr = chunk_e + datetime.timedelta(days=1)
 
-    drive_service, creds = get_drive_service()
+    google_clients.credentials()  # 인증 정보 확인 및 토큰 발급을 작업 시작 전에 한 번
     log(f"📊 수집 시작: {start_str} ~ {end_str}")
 
     with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = [executor.submit(process_category, cat, url, date_chunks, drive_service, creds) 
+        futures = [executor.submit(process_category, cat, url, date_chunks) 
                    for cat, url in FILE_MAP.items()]
         for future in as_completed(futures):
             future.result()
@@ -0,0 +1,68 @@
+"""반복수주 군집화 벤치마크: 색인 기반 find_clusters vs 전수 비교.
+
+가상의 기관마다 계약명 N건(기본 10,000건)을 만들어 두 방식의 시간과 결과 일치를 확인한다.
+전수 비교는 O(n²)이라 --brute-limit 건까지만 돌린다.
+
+    python bench_repeat_contracts.py --agencies 3 --size 10000 --brute-limit 2000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from contract_analysis import _brute_force_clusters, find_clusters, normalize_contract_name
+
+PLACES = ["시청", "구청", "군청", "읍사무소", "도로", "하천", "공원", "주차장", "어린이보호구역", "방범", "재난", "교통"]
+SYSTEMS = ["CCTV", "통합관제센터", "영상정보처리기기", "방범용CCTV", "스마트도시통합플랫폼", "차량번호인식", "비상벨", "자가통신망"]
+WORKS = ["유지관리", "유지보수", "통합유지관리", "운영및유지보수", "위탁관리", "통합유지보수"]
+SUFFIXES = ["용역", "사업", "용역(장기계속)", "위탁용역", ""]
+
+
+def synthetic_names(size: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    names = []
+    for _ in range(size):
+        year = rng.randint(2019, 2025)
+        parts = [f"{year}년", rng.choice(PLACES), rng.choice(SYSTEMS), rng.choice(WORKS), rng.choice(SUFFIXES)]
+        if rng.random() < 0.3:
+            parts.insert(1, f"{rng.randint(1, 12)}차분")
+        if rng.random() < 0.2:
+            parts.insert(2, rng.choice(PLACES) + str(rng.randint(1, 40)) + "개소")
+        names.append(normalize_contract_name(" ".join(parts)))
+    return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agencies", type=int, default=3)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--brute-limit", type=int, default=2_000)
+    parser.add_argument("--threshold", type=float, default=0.80)
+    args = parser.parse_args()
+
+    for agency in range(args.agencies):
+        names = synthetic_names(args.size, seed=agency)
+        started = time.perf_counter()
+        clusters = find_clusters(names, args.threshold)
+        indexed = time.perf_counter() - started
+        print(f"기관 {agency + 1}: {len(names):,}건 → 군집 {len(clusters):,}개, 색인 {indexed:.2f}초")
+
+        sample = names[: args.brute_limit]
+        started = time.perf_counter()
+        expected = _brute_force_clusters(sample, args.threshold)
+        brute = time.perf_counter() - started
+        started = time.perf_counter()
+        actual = find_clusters(sample, args.threshold)
+        indexed_sample = time.perf_counter() - started
+        status = "일치" if actual == expected else "불일치"
+        print(
+            f"  앞 {len(sample):,}건 비교: 전수 {brute:.2f}초 / 색인 {indexed_sample:.2f}초 "
+            f"(x{brute / max(indexed_sample, 1e-9):.0f}) — 결과 {status}"
+        )
+        if actual != expected:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""수집 구간 체크포인트 저널 (SQLite).
+
+수집기가 (서비스, 시작, 종료) 구간을 끝낼 때마다 그 구간의 행을 기록한다.
+작업이 중간에 끊기면 다음 실행은 기록된 구간을 건너뛰고 빠진 구간만 받아
+저널의 행 전체로 병합한다. 시트 반영까지 끝나면 해당 서비스의 저널을 비운다.
+JOURNAL_TTL_HOURS보다 오래된 구간은 재사용하지 않는다.
+
+구간의 시작·종료는 모든 수집기가 YYYY-MM-DD(date.isoformat) 문자열로 쓴다. 문자열 비교와
+missing_ranges()의 date.fromisoformat이 이 형식에 기대므로, 월 단위로 받는 발주계획도
+그 달의 1일~말일로 기록한다 (munitions_plan.month_window).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+
+JOURNAL_PATH = os.environ.get("PROCUREMENT_JOURNAL_PATH", os.path.join(".cache", "collect_journal.sqlite3"))
+JOURNAL_TTL_HOURS = float(os.environ.get("PROCUREMENT_JOURNAL_TTL_HOURS", "24"))
+
+
+class CollectJournal:
+    def __init__(self, service: str, path: str = JOURNAL_PATH, ttl_hours: float = JOURNAL_TTL_HOURS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.service = service
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS windows ("
+            " service TEXT, start TEXT, end TEXT, rows BLOB, row_count INTEGER, completed_at REAL,"
+            " PRIMARY KEY (service, start, end))"
+        )
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM windows WHERE service=? AND completed_at < ?",
+                (service, time.time() - ttl_hours * 3600),
+            )
+
+    def record(self, start: str, end: str, rows: list[dict]) -> None:
+        blob = zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"), 6)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO windows VALUES (?, ?, ?, ?, ?, ?)",
+                (self.service, start, end, blob, len(rows), time.time()),
+            )
+
+    def completed(self) -> list[tuple[str, str]]:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT start, end FROM windows WHERE service=? ORDER BY start", (self.service,)
+            ).fetchall()
+
+    def is_done(self, start: str, end: str) -> bool:
+        return any(s <= start and end <= e for s, e in self.completed())
+
+    def missing_ranges(self, start: date, end: date) -> list[tuple[date, date]]:
+        """[start, end] 중 아직 기록되지 않은 날짜 구간 목록.
+
+        rows()가 [start, end] 안에 완전히 들어가는 구간만 돌려주므로, 경계에 걸친 기록 구간은
+        끝난 것으로 치지 않고 다시 받는다 (걸친 구간을 건너뛰면 그 행이 병합에서 빠진다).
+        """
+        ranges: list[tuple[date, date]] = []
+        cursor = start
+        for s, e in self.completed():
+            done_start, done_end = date.fromisoformat(s), date.fromisoformat(e)
+            if done_start < start or done_end > end or done_end < cursor:
+                continue
+            if done_start > cursor:
+                ranges.append((cursor, done_start - timedelta(days=1)))
+            cursor = max(cursor, done_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            ranges.append((cursor, end))
+        return ranges
+
+    def rows(self, start: str | None = None, end: str | None = None) -> list[dict]:
+        """[start, end] 안에 완전히 들어가는 기록 구간의 행 전체."""
+        with self.lock:
+            records = self.conn.execute(
+                "SELECT start, end, rows FROM windows WHERE service=? ORDER BY start", (self.service,)
+            ).fetchall()
+        result: list[dict] = []
+        for s, e, blob in records:
+            if (start is None or s >= start) and (end is None or e <= end):
+                result.extend(json.loads(zlib.decompress(blob)))
+        return result
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM windows WHERE service=?", (self.service,))
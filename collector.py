@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import datetime
 import time
 import requests
@@ -8,8 +7,8 @@ import pandas as pd
 import gc
 import threading
 
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
+import google_clients
+from keyword_matcher import KeywordMatcher
 
 # ================= 설정 =================
 SERVICE_KEY = os.environ.get('DATA_GO_KR_API_KEY')
@@ -22,6 +21,7 @@ API_URL = 'https://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancL
 
 KEYWORDS = ['통합관제', 'CCTV', '통합플랫폼', '스마트도시', '스마트시티', '주차', '출입']
 REQUIRED_WORD = '유지'
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
 
 # API 응답 영문 컬럼 → 한글 헤더 매핑
 COLUMNS = [
@@ -78,15 +78,7 @@ def log(msg):
 
 # ================= Google Sheets =================
 def get_sheets_service():
-    info = json.loads(AUTH_JSON_STR)
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=[
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-    )
-    return build('sheets', 'v4', credentials=creds, cache_discovery=False)
+    return google_clients.sheets_service()
 
 def ensure_sheet_exists(svc):
     meta = svc.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
@@ -204,7 +196,7 @@ def make_date_chunks(start_str, end_str):
 def filter_by_keywords(df):
     if df.empty or 'bidNtceNm' not in df.columns:
         return pd.DataFrame()
-    kw = df['bidNtceNm'].str.contains('|'.join(KEYWORDS), na=False)
+    kw = KEYWORD_MATCHER.contains(df['bidNtceNm'])
     req = df['bidNtceNm'].str.contains(REQUIRED_WORD, na=False)
     filtered = df[kw & req].copy()
     log(f"  필터: {len(df)}건 → {len(filtered)}건")
@@ -0,0 +1,281 @@
+"""계약명 정규화와 반복수주(동일 기관·유사 사업명·동일 업체) 탐지.
+
+예전에는 기관마다 모든 계약명 쌍에 SequenceMatcher를 돌려(O(n²)) 대시보드 첫 로드가
+느렸다. find_clusters()는 같은 탐욕적 군집화를 하되, 글자 다중집합의 prefix 색인으로
+유사도 기준을 넘을 수 있는 후보만 뽑고 real_quick_ratio → quick_ratio → ratio 순으로
+확인한다. 세 값 모두 ratio의 상한이므로 걸러지는 쌍은 원래도 기준 미달이고,
+군집 결과는 전수 비교와 같다. 성능 비교는 bench_repeat_contracts.py.
+
+반복수주 결과는 세션마다 계산하지 않는다. daily_update.py가 하루 한 번
+write_repeat_artifact()로 repeat_clusters.v1.json을 Drive(REPEAT_ARTIFACT_FOLDER_ID)에 올리고,
+대시보드(G2B_info.py)는 load_repeat_artifact()로 읽어 광역단위로 거르기만 한다.
+CI가 저장소에 커밋하지 않으므로 워크플로에 쓰기 권한이 필요 없다.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+from districts import district_frame
+from unique_map import map_unique
+
+RE_NORMALIZE = re.compile(
+    r"\d{4}[~\-～]\d{4}년?"
+    r"|\d{4}년\s*\d{1,2}월"
+    r"|\d{4}년"
+    r"|\d{1,2}차분?"
+    r"|장기계속\s*\d*차?"
+    r"|\(.*?\)"
+    r"|연장분|추가분|수정"
+)
+RE_SPACE = re.compile(r"\s+")
+RE_CONTRACT_NUM = re.compile(r"\d+차분?|\d+")
+
+REPEAT_THRESHOLD = 0.80
+REPEAT_ARTIFACT_VERSION = 1
+REPEAT_ARTIFACT_NAME = f"repeat_clusters.v{REPEAT_ARTIFACT_VERSION}.json"
+# 비우면 나라장터 공고 아카이브 폴더 (drive_archive.NOTICE_FOLDER_ID)
+REPEAT_ARTIFACT_FOLDER_ID = os.environ.get("REPEAT_ARTIFACT_FOLDER_ID", "")
+GROUP_KEYS = ["★가공_수요기관", "contract_group_key", "★가공_업체명"]
+
+
+def normalize_contract_name(name: str) -> str:
+    s = RE_NORMALIZE.sub("", str(name))
+    s = RE_SPACE.sub("", s)
+    return s.strip()
+
+
+def clean_contract_name(name: str) -> str:
+    return RE_CONTRACT_NUM.sub("", str(name).replace(" ", ""))
+
+
+def name_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _brute_force_clusters(names: list[str], threshold: float) -> list[list[int]]:
+    """원래 방식의 전수 비교. 기준 검증과 threshold <= 0 처리에만 쓴다."""
+    visited = [False] * len(names)
+    clusters = []
+    for i in range(len(names)):
+        if visited[i] or not names[i]:
+            continue
+        cluster = [i]
+        visited[i] = True
+        for j in range(i + 1, len(names)):
+            if not visited[j] and name_similarity(names[i], names[j]) >= threshold:
+                cluster.append(j)
+                visited[j] = True
+        if len(cluster) >= 2:
+            clusters.append(cluster)
+    return clusters
+
+
+def find_clusters(names: list[str], threshold: float = 0.80) -> list[list[int]]:
+    """앞에서부터 아직 묶이지 않은 이름을 대표로 삼아, 뒤쪽의 묶이지 않은 이름 중
+    name_similarity(대표, 이름) >= threshold 인 것을 모은다. 2개 이상인 군집의 위치 목록을 반환한다.
+    """
+    if threshold <= 0:
+        return _brute_force_clusters(names, threshold)
+
+    # 다중집합을 집합으로 다루기 위해 글자마다 몇 번째 등장인지를 붙인 토큰을 쓴다.
+    # 두 토큰 집합의 교집합 크기가 곧 quick_ratio의 공통 글자 수다.
+    tokens: list[list[tuple[str, int]]] = []
+    token_sets: list[frozenset] = []
+    freq: Counter = Counter()
+    for name in names:
+        seen: Counter = Counter()
+        name_tokens = []
+        for ch in name:
+            seen[ch] += 1
+            name_tokens.append((ch, seen[ch]))
+        tokens.append(name_tokens)
+        token_sets.append(frozenset(name_tokens))
+        freq.update(name_tokens)
+
+    # ratio >= t 이려면 공통 글자 수 O >= t(la+lb)/2 이고 lb >= la·t/(2-t) 이므로 O >= la·t/(2-t).
+    # 드문 토큰부터 정렬한 앞쪽 la-α+1개(prefix)가 겹치지 않는 쌍은 후보가 될 수 없다.
+    postings: dict[tuple[str, int], list[int]] = defaultdict(list)
+    prefixes: list[list[tuple[str, int]]] = []
+    for i, name_tokens in enumerate(tokens):
+        if not name_tokens:
+            prefixes.append([])
+            continue
+        alpha = max(1, math.floor(len(name_tokens) * threshold / (2 - threshold) - 1e-9))
+        prefix = sorted(name_tokens, key=lambda tok: (freq[tok], tok))[: len(name_tokens) - alpha + 1]
+        prefixes.append(prefix)
+        for tok in prefix:
+            postings[tok].append(i)
+
+    visited = [False] * len(names)
+    clusters = []
+    for i, leader in enumerate(names):
+        if visited[i] or not leader:
+            continue
+        visited[i] = True
+        candidates = {j for tok in prefixes[i] for j in postings[tok] if j > i and not visited[j]}
+        cluster = [i]
+        matcher = SequenceMatcher(None, leader)
+        la = len(leader)
+        leader_set = token_sets[i]
+        verdicts: dict[str, bool] = {leader: True}  # 같은 이름은 한 번만 비교한다
+        for j in sorted(candidates):
+            other = names[j]
+            similar = verdicts.get(other)
+            if similar is None:
+                lb = len(other)
+                if 2.0 * min(la, lb) / (la + lb) < threshold:  # real_quick_ratio
+                    similar = False
+                elif 2.0 * len(leader_set & token_sets[j]) / (la + lb) < threshold:  # quick_ratio
+                    similar = False
+                else:
+                    matcher.set_seq2(other)
+                    similar = matcher.ratio() >= threshold
+                verdicts[other] = similar
+            if similar:
+                cluster.append(j)
+                visited[j] = True
+        if len(cluster) >= 2:
+            clusters.append(cluster)
+    return clusters
+
+
+def detect_repeat_contracts(df: pd.DataFrame, threshold: float = 0.80) -> pd.DataFrame:
+    needed = ["★가공_수요기관", "★가공_계약명", "★가공_업체명", "★가공_계약금액", "계약일자"]
+    work = df[needed].copy()
+    work["정규화명"] = map_unique(work["★가공_계약명"], normalize_contract_name)
+    work["계약일자_dt"] = pd.to_datetime(
+        work["계약일자"].astype(str).str.replace(r"[^0-9]", "", regex=True).str[:8],
+        format="%Y%m%d", errors="coerce"
+    )
+    work["계약년도"] = work["계약일자_dt"].dt.year
+
+    results = []
+    for agency, ag_df in work.groupby("★가공_수요기관"):
+        indices = ag_df.index.tolist()
+        for cluster_idx in find_clusters(ag_df["정규화명"].tolist(), threshold):
+            cluster_rows = ag_df.loc[[indices[k] for k in cluster_idx]]
+
+            for company, co_df in cluster_rows.groupby("★가공_업체명"):
+                if len(co_df) < 2:
+                    continue
+                if co_df["계약년도"].dropna().nunique() < 2:
+                    continue
+
+                amt   = pd.to_numeric(co_df["★가공_계약금액"], errors="coerce").fillna(0)
+                dates = co_df["계약일자_dt"].dropna()
+
+                results.append({
+                    "수요기관":      agency,
+                    "업체명":        company,
+                    "수주횟수":      len(co_df),
+                    "수주연도":      ", ".join(map(str, sorted(co_df["계약년도"].dropna().astype(int).unique().tolist()))),
+                    "대표사업명":    co_df["★가공_계약명"].iloc[0],
+                    "계약금액합계":  int(amt.sum()),
+                    "최초계약일":    dates.min().strftime("%Y-%m-%d") if not dates.empty else "-",
+                    "최근계약일":    dates.max().strftime("%Y-%m-%d") if not dates.empty else "-",
+                    "계약목록":      " / ".join(co_df["★가공_계약명"].tolist()),
+                })
+
+    if not results:
+        return pd.DataFrame()
+
+    out = pd.DataFrame(results)
+    out = out.sort_values(["수주횟수", "계약금액합계"], ascending=False).reset_index(drop=True)
+    return out
+
+
+# ─────────────────────────────────────────────
+# 대시보드 대상 계약 선별 (G2B_info.py와 daily_update.py 공용)
+# ─────────────────────────────────────────────
+def select_maintenance_contracts(df: pd.DataFrame) -> pd.DataFrame:
+    """관할 지자체(교육청 제외)의 CCTV·통합관제 유지보수 계약만 남기고 광역단위를 붙여 묶음 키 순으로 정렬한다."""
+    districts      = district_frame(df["★가공_수요기관"])
+    df             = df[districts["관할"]].copy()
+    df["광역단위"] = districts["광역단위"]
+
+    cn = df["★가공_계약명"].astype(str)
+    df = df[
+        cn.str.contains("유지", na=False) &
+        cn.str.contains("통합관제|통합|CCTV", na=False) &
+        ~cn.str.contains("상수도|청사|악취|미세먼지|상담실|보건소", na=False)
+    ].copy()
+
+    df["temp_date"] = pd.to_datetime(
+        df["계약일자"].astype(str).str.replace(r"[^0-9]", "", regex=True).str[:8],
+        format="%Y%m%d", errors="coerce"
+    )
+    df["contract_group_key"] = map_unique(df["★가공_계약명"], clean_contract_name)
+    return df.sort_values(
+        ["★가공_수요기관", "contract_group_key", "★가공_업체명", "temp_date"],
+        ascending=[True, True, True, False],
+    )
+
+
+def fix_contract_amount(df: pd.DataFrame) -> None:
+    """금차계약금액이 있으면 그 값을, 없거나 0이면 총 계약금액을 ★가공_계약금액으로 쓴다."""
+    total_amt = pd.to_numeric(df["★가공_계약금액"], errors="coerce").fillna(0)
+    if "금차계약금액" in df.columns:
+        sub_amt = pd.to_numeric(df["금차계약금액"], errors="coerce").fillna(0)
+        df["★가공_계약금액"] = sub_amt.where(sub_amt != 0, total_amt).astype(int)
+    else:
+        df["★가공_계약금액"] = total_amt.astype(int)
+
+
+def build_repeat_base(df: pd.DataFrame) -> pd.DataFrame:
+    """select_maintenance_contracts() 결과에서 반복수주 탐지용 df를 만든다 (만료 필터 없이 중복만 제거)."""
+    repeat_base = df.drop_duplicates(GROUP_KEYS, keep="first").copy()
+    fix_contract_amount(repeat_base)
+    return repeat_base
+
+
+# ─────────────────────────────────────────────
+# 반복수주 산출물 (버전이 붙은 JSON)
+# ─────────────────────────────────────────────
+def write_repeat_artifact(repeat_base: pd.DataFrame, auth_json: str | None = None,
+                          threshold: float = REPEAT_THRESHOLD) -> int:
+    """전체 반복수주 결과를 수요기관·광역단위와 함께 Drive에 올리고 건수를 반환한다.
+
+    군집은 수요기관 안에서만 만들어지고 수요기관마다 광역단위가 하나이므로,
+    전국 결과를 광역단위로 거른 것은 지역별로 따로 계산한 것과 같다.
+    """
+    import drive_archive  # 대시보드·벤치마크는 Drive 클라이언트 없이도 이 모듈을 쓴다
+
+    repeat_df = detect_repeat_contracts(repeat_base, threshold=threshold)
+    if not repeat_df.empty:
+        repeat_df.insert(1, "광역단위", district_frame(repeat_df["수요기관"])["광역단위"].astype(str))
+    payload = {
+        "version": REPEAT_ARTIFACT_VERSION,
+        "generated_at": datetime.now(timezone(timedelta(hours=9))).isoformat(timespec="seconds"),
+        "threshold": threshold,
+        "source_rows": len(repeat_base),
+        "rows": repeat_df.to_dict(orient="records"),
+    }
+    data = json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8")
+    folder_id = REPEAT_ARTIFACT_FOLDER_ID or drive_archive.NOTICE_FOLDER_ID
+    drive_archive.write_file(folder_id, REPEAT_ARTIFACT_NAME, data, "application/json", auth_json)
+    return len(repeat_df)
+
+
+def load_repeat_artifact(auth_json: str | None = None) -> tuple[pd.DataFrame, dict] | None:
+    """(반복수주 df, 메타정보)를 반환한다. 파일이 없거나 읽을 수 없거나 버전이 다르면 None."""
+    import drive_archive
+
+    try:
+        folder_id = REPEAT_ARTIFACT_FOLDER_ID or drive_archive.NOTICE_FOLDER_ID
+        data = drive_archive.read_file(folder_id, REPEAT_ARTIFACT_NAME, auth_json)
+        payload = json.loads(data) if data is not None else None
+    except Exception as e:  # 산출물이 없으면 대시보드가 직접 계산한다
+        print(f"⚠️ 반복수주 산출물 읽기 실패: {e}")
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != REPEAT_ARTIFACT_VERSION:
+        return None
+    meta = {k: v for k, v in payload.items() if k != "rows"}
+    return pd.DataFrame(payload.get("rows") or []), meta
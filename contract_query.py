@@ -0,0 +1,104 @@
+"""나라장터 용역 계약(getCntrctInfoListServcPPSSrch) 일자별 조회 계획.
+
+키워드마다 API를 따로 부르지 않고 하루치 계약 전체를 페이지 단위로 한 번 받아
+로컬에서 키워드로 거른다. 첫 페이지의 totalCount가 FULL_DAY_LIMIT을 넘는 날만
+예전처럼 키워드(cntrctNm) 조건 조회로 대신한다. main.py와 daily_mailing_service가 쓴다.
+계약명은 공고 필터와 같은 KeywordMatcher로 거르므로 계약과 공고의 일치 기준이 같다.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from keyword_matcher import KeywordMatcher
+from rate_limiter import MAX_CONCURRENCY
+from response_cache import cached_get
+from xml_stream import iter_items, total_count
+
+CONTRACT_URL = "https://apis.data.go.kr/1230000/ao/CntrctInfoService/getCntrctInfoListServcPPSSrch"
+PAGE_SIZE = 999
+# 하루 전체 조회로 받을 최대 건수. 넘으면 키워드 조건 조회로 전환한다.
+FULL_DAY_LIMIT = int(os.environ.get("CONTRACT_FULL_DAY_LIMIT", "20000"))
+
+
+def parse_contract(item: dict[str, str]) -> dict[str, str]:
+    raw_demand = item.get("dminsttList", "-")
+    clean_demand = raw_demand.replace("[", "").replace("]", "").split("^")[2] if "^" in raw_demand else raw_demand
+    raw_corp = item.get("corpList", "-")
+    clean_corp = raw_corp.replace("[", "").replace("]", "").split("^")[3] if "^" in raw_corp else raw_corp
+    return {
+        "org": clean_demand,
+        "nm": item.get("cntrctNm", "-"),
+        "corp": clean_corp,
+        "amt": item.get("totCntrctAmt", "0"),
+        "url": item.get("cntrctDtlInfoUrl") or "https://www.g2b.go.kr",
+    }
+
+
+def _fetch_page(service_key: str, d_str: str, page: int, keyword: str | None = None) -> tuple[list[dict[str, str]], int]:
+    params = {
+        "serviceKey": service_key,
+        "inqryDiv": "1",
+        "type": "xml",
+        "inqryBgnDate": d_str,
+        "inqryEndDate": d_str,
+        "numOfRows": str(PAGE_SIZE),
+        "pageNo": str(page),
+    }
+    if keyword:
+        params["cntrctNm"] = keyword
+    res = cached_get(CONTRACT_URL, params=params, timeout=30)
+    res.raise_for_status()
+    meta: dict = {}
+    items = list(iter_items(res.content, meta))
+    return items, total_count(meta, len(items))
+
+
+def _fetch_rest(service_key: str, d_str: str, first: list[dict[str, str]], total: int, keyword: str | None = None, executor=None):
+    """1페이지 결과와 totalCount로 나머지 페이지를 받아 이어 붙인다. executor가 있으면 동시에 받는다."""
+    items = list(first)
+    if not first or total <= len(first):
+        return items
+    last_page = -(-total // len(first))
+    map_fn = executor.map if executor is not None else map
+    for page_items in map_fn(lambda page: _fetch_page(service_key, d_str, page, keyword)[0], range(2, last_page + 1)):
+        items.extend(page_items)
+    return items
+
+
+def _fetch_keyword(service_key: str, d_str: str, keyword: str) -> list[dict[str, str]]:
+    try:
+        first, total = _fetch_page(service_key, d_str, 1, keyword)
+        return _fetch_rest(service_key, d_str, first, total, keyword)
+    except Exception as e:
+        print(f"계약 API 오류 ({keyword}): {e}")
+        return []
+
+
+def fetch_day_contracts(service_key: str, d_str: str, matcher: KeywordMatcher) -> list[dict[str, str]]:
+    """d_str(YYYYMMDD) 하루의 용역 계약 중 계약명이 matcher에 걸리는 건을 (수요기관, 계약명) 기준 중복 없이 반환한다.
+
+    matcher는 공고 필터와 같은 것을 넘긴다 (API의 cntrctNm 조건처럼 ignore_case=True).
+    키워드 조건 조회로 전환하면 matcher.keywords를 하나씩 조회한다.
+    """
+    keywords = matcher.keywords
+    try:
+        first, total = _fetch_page(service_key, d_str, 1)
+    except Exception as e:
+        print(f"계약 API 오류 ({d_str} 전체 조회): {e}")
+        first, total = [], FULL_DAY_LIMIT + 1
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        if total <= FULL_DAY_LIMIT:
+            try:
+                items = _fetch_rest(service_key, d_str, first, total, executor=executor)
+                items = [item for item in items if matcher.matches(item.get("cntrctNm", ""))]
+                print(f"계약 {d_str}: 전체 {total:,}건 중 키워드 일치 {len(items):,}건")
+            except Exception as e:
+                print(f"계약 API 오류 ({d_str} 전체 조회): {e}, 키워드별 조회로 전환")
+                total = FULL_DAY_LIMIT + 1
+        if total > FULL_DAY_LIMIT:
+            print(f"계약 {d_str}: 키워드 {len(keywords)}개 조건 조회")
+            items = [item for batch in executor.map(lambda kw: _fetch_keyword(service_key, d_str, kw), keywords) for item in batch]
+
+    contracts = (parse_contract(item) for item in items)
+    return list({f"{c['org']}_{c['nm']}": c for c in contracts}.values())
@@ -12,25 +12,18 @@ send_b.py  ─  필터링 리포트 발송 스크립트 (드라이브 데이터
 
 import os
 import sys
-import io
-import json
 import time
 import datetime
-import requests
-import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import pandas as pd
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
+import contract_query
+import drive_archive
+import google_clients
+from keyword_matcher import KeywordMatcher
 
 # ── 환경변수 ───────────────────────────────────────────────────────────────────
 MY_DIRECT_KEY = os.environ.get("DATA_GO_KR_API_KEY")
 AUTH_JSON_STR  = os.environ.get("GOOGLE_AUTH_JSON")
 
-SHOPPING_FOLDER_ID = "1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr"
-NOTICE_FOLDER_ID   = "1AsvVmayEmTtY92d1SfXxNi6bL0Zjw5mg"
-
 # ── 컬럼 정의 ──────────────────────────────────────────────────────────────────
 HEADER_KOR = [
     "조달구분명", "계약구분명", "계약납품구분명", "계약납품요구일자", "계약납품요구번호",
@@ -61,9 +54,14 @@ CAT_META = {
 }
 
 NOTICE_CATEGORY_NAMES = ["공사", "물품", "용역"]
+NOTICE_COLUMNS = ["bidNtceDt", "bidNtceNm", "dminsttNm", "presmptPrce", "bidNtceDtlUrl"]
 
 keywords_notice_all = [kw for sublist in CAT_KEYWORDS.values() for kw in sublist]
 
+# 키워드 오토마톤은 import 시 한 번만 만든다 (keyword_matcher.py)
+CATEGORY_MATCHER = KeywordMatcher(CAT_KEYWORDS)                      # 분류: 대소문자 구분
+NOTICE_MATCHER   = KeywordMatcher(keywords_notice_all, ignore_case=True)  # 공고 필터: case=False
+
 keywords = sorted(list(set([
     "네트워크시스템장비용랙", "영상감시장치", "PA용스피커", "안내판", "카메라브래킷", "액정모니터",
     "광송수신모듈", "전원공급장치", "광분배함", "컨버터", "컴퓨터서버", "하드디스크드라이브",
@@ -149,10 +147,7 @@ def fmt_amount(val):
 
 
 def classify_text(text):
-    for cat, kws in CAT_KEYWORDS.items():
-        if any(kw in str(text) for kw in kws):
-            return cat
-    return "기타"
+    return CATEGORY_MATCHER.classify(str(text))
 
 
 # ── 경쟁사 목록 (main.py와 동일한 방식) ──────────────────────────────────────
@@ -178,140 +173,66 @@ def normalize_company_name(name):
     return str(name).replace(" ", "").replace("(주)", "").replace("주식회사", "").upper()
 
 
-# =============================================================================
-# 구글 드라이브 헬퍼
-# =============================================================================
-
-def get_drive_service():
-    info = json.loads(AUTH_JSON_STR)
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=["https://www.googleapis.com/auth/drive.readonly"]
-    )
-    return build("drive", "v3", credentials=creds), creds
-
-
-def download_csv_from_drive(drive_service, creds, file_id) -> pd.DataFrame:
-    resp = requests.get(
-        f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media",
-        headers={"Authorization": f"Bearer {creds.token}"},
-    )
-    resp.raise_for_status()
-    return pd.read_csv(io.BytesIO(resp.content), encoding="utf-8-sig", low_memory=False)
-
-
-def find_file_id(drive_service, folder_id, file_name):
-    res = drive_service.files().list(
-        q=f"name='{file_name}' and '{folder_id}' in parents and trashed=false",
-        fields="files(id, name)",
-    ).execute()
-    items = res.get("files", [])
-    return items[0]["id"] if items else None
-
-
 # =============================================================================
 # 데이터 수집
 # =============================================================================
 
-def load_shopping_from_drive(drive_service, creds, date_list):
-    years    = sorted(set(d[:4] for d in date_list))
-    all_rows = []
-    for year in years:
-        file_name = f"{year}.csv"
-        file_id   = find_file_id(drive_service, SHOPPING_FOLDER_ID, file_name)
-        if not file_id:
-            print(f"⚠️ 쇼핑몰 파일 없음: {file_name}")
-            continue
-        df = download_csv_from_drive(drive_service, creds, file_id)
-        print(f"📥 쇼핑몰 {file_name}: {len(df):,}행 로드")
-        date_col = "계약납품요구일자"
-        if date_col not in df.columns:
-            print(f"⚠️ '{date_col}' 컬럼 없음 — 전체 사용")
-            all_rows.extend(df.values.tolist())
-            continue
-        df[date_col] = df[date_col].astype(str).str[:8]
-        filtered = df[df[date_col].isin(date_list)]
-        print(f"   └ 날짜 필터 후: {len(filtered):,}행")
-        all_rows.extend(filtered.values.tolist())
-    return all_rows
-
-
-def load_notice_from_drive(drive_service, creds, date_list):
-    years    = sorted(set(d[:4] for d in date_list))
+def load_shopping_from_drive(date_list):
+    # 기간 밖의 파트·row group은 받지 않는다 (drive_archive.read_range)
+    df = drive_archive.read_range(drive_archive.SHOPPING, min(date_list), max(date_list))
+    if df.empty:
+        print(f"⚠️ 쇼핑몰 데이터 없음: {min(date_list)}~{max(date_list)}")
+        return []
+    print(f"📥 쇼핑몰 {min(date_list)}~{max(date_list)}: {len(df):,}행 로드")
+    date_col = "계약납품요구일자"
+    if date_col not in df.columns:
+        print(f"⚠️ '{date_col}' 컬럼 없음 — 전체 사용")
+        return df.values.tolist()
+    df[date_col] = df[date_col].astype(str).str[:8]
+    filtered = df[df[date_col].isin(date_list)]
+    print(f"   └ 날짜 필터 후: {len(filtered):,}행")
+    return filtered.values.tolist()
+
+
+def load_notice_from_drive(date_list):
     date_set = {f"{d[:4]}-{d[4:6]}-{d[6:]}" for d in date_list}
     notice_buckets = {cat: [] for cat in MAIL_CATEGORIES}
     total_cnt = 0
-    for year in years:
-        for cat_name in NOTICE_CATEGORY_NAMES:
-            file_name = f"나라장터_공고_{cat_name}_{year}년.csv"
-            file_id   = find_file_id(drive_service, NOTICE_FOLDER_ID, file_name)
-            if not file_id:
-                print(f"⚠️ 공고 파일 없음: {file_name}")
-                continue
-            df = download_csv_from_drive(drive_service, creds, file_id)
-            print(f"📥 공고 {file_name}: {len(df):,}행 로드")
-            if "bidNtceDt" not in df.columns:
-                print(f"   └ bidNtceDt 컬럼 없음 — 스킵")
-                continue
-            # "2026-05-28  11:31:23 PM" → 앞 10자리만 사용
-            df["_date"] = df["bidNtceDt"].astype(str).str[:10]
-            filtered  = df[df["_date"].isin(date_set)]
-            print(f"   └ 날짜 필터 후: {len(filtered):,}행")
-            total_cnt += len(filtered)
-            pattern = "|".join(keywords_notice_all)
-            matched = filtered[filtered["bidNtceNm"].str.contains(pattern, na=False, case=False)]
-            for _, row in matched.iterrows():
-                cat_found = classify_text(row["bidNtceNm"])
-                if cat_found in notice_buckets:
-                    notice_buckets[cat_found].append({
-                        "org":  row.get("dminsttNm", "-"),
-                        "nm":   row.get("bidNtceNm", "-"),
-                        "amt":  row.get("presmptPrce", "0"),
-                        "url":  row.get("bidNtceDtlUrl", "#"),
-                        "corp": "-",
-                        "date": row.get("_date", ""),
-                    })
-    return notice_buckets, total_cnt
-
-
-def fetch_single_contract(kw_s, d_str):
-    api_url = "http://apis.data.go.kr/1230000/ao/CntrctInfoService/getCntrctInfoListServcPPSSrch"
-    results = []
-    p = {
-        "serviceKey": MY_DIRECT_KEY, "inqryDiv": "1", "type": "xml",
-        "inqryBgnDate": d_str, "inqryEndDate": d_str, "cntrctNm": kw_s,
-    }
-    try:
-        r = requests.get(api_url, params=p, timeout=20)
-        if r.status_code == 200:
-            root = ET.fromstring(r.content)
-            for item in root.findall(".//item"):
-                detail_url   = item.findtext("cntrctDtlInfoUrl") or "https://www.g2b.go.kr"
-                raw_demand   = item.findtext("dminsttList", "-")
-                clean_demand = raw_demand.replace("[", "").replace("]", "").split("^")[2] if "^" in raw_demand else raw_demand
-                raw_corp     = item.findtext("corpList", "-")
-                clean_corp   = raw_corp.replace("[", "").replace("]", "").split("^")[3] if "^" in raw_corp else raw_corp
-                results.append({
-                    "org":  clean_demand,
-                    "nm":   item.findtext("cntrctNm", "-"),
-                    "corp": clean_corp,
-                    "amt":  item.findtext("totCntrctAmt", "0"),
-                    "url":  detail_url,
+    for cat_name in NOTICE_CATEGORY_NAMES:
+        # 메일에 쓰는 열만, 공고일시가 기간 안인 row group만 읽는다 (drive_archive.read_notice)
+        df = drive_archive.read_notice(cat_name, min(date_list), max(date_list), columns=NOTICE_COLUMNS)
+        if df.empty:
+            print(f"⚠️ 공고 데이터 없음: {cat_name} {min(date_list)}~{max(date_list)}")
+            continue
+        print(f"📥 공고 {cat_name}: {len(df):,}행 로드")
+        if "bidNtceDt" not in df.columns:
+            print(f"   └ bidNtceDt 컬럼 없음 — 스킵")
+            continue
+        # "2026-05-28  11:31:23 PM" → 앞 10자리만 사용
+        df["_date"] = df["bidNtceDt"].astype(str).str[:10]
+        filtered  = df[df["_date"].isin(date_set)]
+        print(f"   └ 날짜 필터 후: {len(filtered):,}행")
+        total_cnt += len(filtered)
+        matched = filtered[NOTICE_MATCHER.contains(filtered["bidNtceNm"])]
+        categories = CATEGORY_MATCHER.classify_series(matched["bidNtceNm"])
+        for (_, row), cat_found in zip(matched.iterrows(), categories):
+            if cat_found in notice_buckets:
+                notice_buckets[cat_found].append({
+                    "org":  row.get("dminsttNm", "-"),
+                    "nm":   row.get("bidNtceNm", "-"),
+                    "amt":  row.get("presmptPrce", "0"),
+                    "url":  row.get("bidNtceDtlUrl", "#"),
+                    "corp": "-",
+                    "date": row.get("_date", ""),
                 })
-    except Exception as e:
-        print(f"계약 API 오류 ({kw_s}): {e}")
-    return results
+    return notice_buckets, total_cnt
 
 
 def load_contracts_from_api(date_list):
     contract_buckets  = {cat: [] for cat in MAIL_CATEGORIES}
     exclude_keywords  = ["학교", "민방위", "교육청"]
     for d_str in date_list:
-        collected = []
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            futures = {executor.submit(fetch_single_contract, kw_s, d_str): kw_s for kw_s in keywords_notice_all}
-            for future in as_completed(futures):
-                collected.extend(future.result())
-        unique = list({f"{d['org']}_{d['nm']}": d for d in collected}.values())
+        unique = contract_query.fetch_day_contracts(MY_DIRECT_KEY, d_str, NOTICE_MATCHER)
         for s in unique:
             cat_found = classify_text(s["nm"])
             if cat_found not in contract_buckets:
@@ -769,17 +690,17 @@ def main():
     date_list, is_weekly = get_date_range()
     print(f"📅 수집 대상: {date_list} ({'주간 종합' if is_weekly else '전일'})")
 
-    drive_service, drive_creds = get_drive_service()
+    google_clients.credentials()  # 인증 정보 확인 및 토큰 발급을 로드 전에 한 번
 
     # ── 경쟁사 목록 로드 (main.py와 동일 방식) ──────────────────────────────
     target_companies = get_target_companies()
 
     print("📦 쇼핑몰 데이터 로드 중 (드라이브)...")
-    all_shopping = load_shopping_from_drive(drive_service, drive_creds, date_list)
+    all_shopping = load_shopping_from_drive(date_list)
     print(f"   └ {len(all_shopping):,}행")
 
     print("📢 공고 데이터 로드 중 (드라이브)...")
-    notice_buckets, total_notice_cnt = load_notice_from_drive(drive_service, drive_creds, date_list)
+    notice_buckets, total_notice_cnt = load_notice_from_drive(date_list)
     print(f"   └ 공고 {total_notice_cnt:,}건")
 
     if not all_shopping and total_notice_cnt == 0:
@@ -2,13 +2,13 @@ import requests
 import xml.etree.ElementTree as ET
 import pandas as pd
 from datetime import datetime, timedelta
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import os
-import json
 import time
 from pytimekr import pytimekr  # 공휴일 체크를 위해 추가
 
+import google_clients
+from contract_analysis import build_repeat_base, select_maintenance_contracts, write_repeat_artifact
+
 # --- 설정 ---
 API_KEY = os.environ.get('DATA_GO_KR_API_KEY')
 API_URL = 'http://apis.data.go.kr/1230000/ao/CntrctInfoService/getCntrctInfoListServcPPSSrch'
@@ -32,11 +32,19 @@ def get_target_date():
     return target
 
 def get_gs_client():
-    auth_json = os.environ.get('GOOGLE_AUTH_JSON')
-    creds_dict = json.loads(auth_json)
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-    return gspread.authorize(creds)
+    return google_clients.gspread_client()
+
+def update_repeat_artifact():
+    """시트 전체로 반복수주 군집을 다시 계산해 대시보드가 읽을 산출물을 Drive에 올린다."""
+    ws = get_gs_client().open("나라장터_용역계약내역").get_worksheet(0)
+    records = ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
+    if not records:
+        print("ℹ️ 시트가 비어 있어 반복수주 산출물을 만들지 않습니다.")
+        return
+    started = time.perf_counter()
+    repeat_base = build_repeat_base(select_maintenance_contracts(pd.DataFrame(records)))
+    count = write_repeat_artifact(repeat_base)
+    print(f"✅ 반복수주 산출물 저장: 대상 {len(repeat_base):,}건 → 의심 {count:,}건 ({time.perf_counter() - started:.1f}초)")
 
 def main():
     # 1. 수집 대상 날짜 계산
@@ -116,5 +124,11 @@ def main():
     else:
         print(f"ℹ️ {display_str}에 해당하는 수집 데이터가 없습니다.")
 
+    # 5. 반복수주 산출물 갱신 (대시보드는 이 파일을 읽기만 한다)
+    try:
+        update_repeat_artifact()
+    except Exception as e:
+        print(f"❌ 반복수주 산출물 생성 중 오류: {e}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,83 @@
+"""대시보드와 일일 수집기가 함께 쓰는 관할 지자체·광역단위 목록.
+
+기관명이 어느 관할 지자체·광역단위로 시작하는지는 목록을 하나씩 startswith로 보는 대신
+이름 길이별 접두사 dict로 찾는다(가장 긴 일치 우선). district_frame()은 같은 기관명을
+한 번만 계산해 범주형 코드로 전체 행에 펼친다.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+FULL_DISTRICT_LIST = [
+    "서울특별시", "서울특별시 종로구", "서울특별시 중구", "서울특별시 용산구", "서울특별시 성동구", "서울특별시 광진구", "서울특별시 동대문구", "서울특별시 중랑구", "서울특별시 성북구", "서울특별시 강북구", "서울특별시 도봉구", "서울특별시 노원구", "서울특별시 은평구", "서울특별시 서대문구", "서울특별시 마포구", "서울특별시 양천구", "서울특별시 강서구", "서울특별시 구로구", "서울특별시 금천구", "서울특별시 영등포구", "서울특별시 동작구", "서울특별시 관악구", "서울특별시 서초구", "서울특별시 강남구", "서울특별시 송파구", "서울특별시 강동구",
+    "부산광역시", "부산광역시 중구", "부산광역시 서구", "부산광역시 동구", "부산광역시 영도구", "부산광역시 부산진구", "부산광역시 동래구", "부산광역시 남구", "부산광역시 북구", "부산광역시 해운대구", "부산광역시 사하구", "부산광역시 금정구", "부산광역시 강서구", "부산광역시 연제구", "부산광역시 수영구", "부산광역시 사상구", "부산광역시 기장군",
+    "대구광역시", "대구광역시 중구", "대구광역시 동구", "대구광역시 서구", "대구광역시 남구", "대구광역시 북구", "대구광역시 수성구", "대구광역시 달서구", "대구광역시 달성군", "대구광역시 군위군",
+    "인천광역시", "인천광역시 중구", "인천광역시 동구", "인천광역시 미추홀구", "인천광역시 연수구", "인천광역시 남동구", "인천광역시 부평구", "인천광역시 계양구", "인천광역시 서구", "인천광역시 강화군", "인천광역시 옹진군",
+    "광주광역시", "광주광역시 동구", "광주광역시 서구", "광주광역시 남구", "광주광역시 북구", "광주광역시 광산구",
+    "대전광역시", "대전광역시 동구", "대전광역시 중구", "대전광역시 서구", "대전광역시 유성구", "대전광역시 대덕구",
+    "울산광역시", "울산광역시 중구", "울산광역시 남구", "울산광역시 동구", "울산광역시 북구", "울산광역시 울주군",
+    "세종특별자치시",
+    "경기도 수원시", "경기도 성남시", "경기도 의정부시", "경기도 안양시", "경기도 부천시", "경기도 광명시", "경기도 평택시", "경기도 동두천시", "경기도 안산시", "경기도 고양시", "경기도 과천시", "경기도 구리시", "경기도 남양주시", "경기도 오산시", "경기도 시흥시", "경기도 군포시", "경기도 의왕시", "경기도 하남시", "경기도 용인시", "경기도 파주시", "경기도 이천시", "경기도 안성시", "경기도 김포시", "경기도 화성시", "경기도 광주시", "경기도 양주시", "경기도 포천시", "경기도 여주시", "경기도 연천군", "경기도 가평군", "경기도 양평군",
+    "강원특별자치도 춘천시", "강원특별자치도 원주시", "강원특별자치도 강릉시", "강원특별자치도 동해시", "강원특별자치도 태백시", "강원특별자치도 속초시", "강원특별자치도 삼척시", "강원특별자치도 홍천군", "강원특별자치도 횡성군", "강원특별자치도 영월군", "강원특별자치도 평창군", "강원특별자치도 정선군", "강원특별자치도 철원군", "강원특별자치도 화천군", "강원특별자치도 양구군", "강원특별자치도 인제군", "강원특별자치도 고성군", "강원특별자치도 양양군",
+    "충청북도 청주시", "충청북도 충주시", "충청북도 제천시", "충청북도 보은군", "충청북도 옥천군", "충청북도 영동군", "충청북도 증평군", "충청북도 진천군", "충청북도 괴산군", "충청북도 음성군", "충청북도 단양군",
+    "충청남도 천안시", "충청남도 공주시", "충청남도 보령시", "충청남도 아산시", "충청남도 서산시", "충청남도 논산시", "충청남도 계룡시", "충청남도 당진시", "충청남도 금산군", "충청남도 부여군", "충청남도 서천군", "충청남도 청양군", "충청남도 홍성군", "충청남도 예산군", "충청남도 태안군",
+    "전북특별자치도 전주시", "전북특별자치도 군산시", "전북특별자치도 익산시", "전북특별자치도 정읍시", "전북특별자치도 남원시", "전북특별자치도 김제시", "전북특별자치도 완주군", "전북특별자치도 진안군", "전북특별자치도 무주군", "전북특별자치도 장수군", "전북특별자치도 임실군", "전북특별자치도 순창군", "전북특별자치도 고창군", "전북특별자치도 부안군",
+    "전라남도 목포시", "전라남도 여수시", "전라남도 순천시", "전라남도 나주시", "전라남도 광양시", "전라남도 담양군", "전라남도 곡성군", "전라남도 구례군", "전라남도 고흥군", "전라남도 보성군", "전라남도 화순군", "전라남도 장흥군", "전라남도 강진군", "전라남도 해남군", "전라남도 영암군", "전라남도 무안군", "전라남도 함평군", "전라남도 영광군", "전라남도 장성군", "전라남도 완도군", "전라남도 진도군", "전라남도 신안군",
+    "경상북도 포항시", "경상북도 경주시", "경상북도 김천시", "경상북도 안동시", "경상북도 구미시", "경상북도 영주시", "경상북도 상주시", "경상북도 문경시", "경상북도 경산시", "경상북도 의성군", "경상북도 청송군", "경상북도 영양군", "경상북도 영덕군", "경상북도 청도군", "경상북도 고령군", "경상북도 성주군", "경상북도 칠곡군", "경상북도 예천군", "경상북도 봉화군", "경상북도 울진군", "경상북도 울릉군",
+    "경상남도 창원시", "경상남도 진주시", "경상남도 통영시", "경상남도 사천시", "경상남도 김해시", "경상남도 밀양시", "경상남도 거제시", "경상남도 양산시", "경상남도 의령군", "경상남도 함안군", "경상남도 창녕군", "경상남도 고성군", "경상남도 남해군", "경상남도 하동군", "경상남도 산청군", "경상남도 함양군", "경상남도 거창군", "경상남도 합천군",
+    "제주특별자치도", "제주특별자치도 제주시", "제주특별자치도 서귀포시",
+]
+
+METRO_LIST = [
+    "전국", "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시",
+    "대전광역시", "울산광역시", "세종특별자치시", "경기도", "강원특별자치도",
+    "충청북도", "충청남도", "전북특별자치도", "전라남도", "경상북도", "경상남도", "제주특별자치도",
+]
+
+OTHER_METRO = "기타"
+
+
+def _prefix_table(names: list[str]) -> tuple[dict[str, str], list[int]]:
+    return {n: n for n in names}, sorted({len(n) for n in names}, reverse=True)
+
+
+_DISTRICTS, _DISTRICT_LENGTHS = _prefix_table(FULL_DISTRICT_LIST)
+_METROS, _METRO_LENGTHS = _prefix_table(METRO_LIST[1:])
+
+
+def _longest_prefix(text: str, table: dict[str, str], lengths: list[int]) -> str | None:
+    for n in lengths:
+        hit = table.get(text[:n]) if len(text) >= n else None
+        if hit is not None:
+            return hit
+    return None
+
+
+def match_district(agency: str) -> tuple[str | None, str]:
+    """(기관명이 시작하는 가장 긴 관할 지자체 또는 None, 광역단위)."""
+    a = str(agency)
+    return _longest_prefix(a, _DISTRICTS, _DISTRICT_LENGTHS), _longest_prefix(a, _METROS, _METRO_LENGTHS) or OTHER_METRO
+
+
+def get_metro(a: str) -> str:
+    return match_district(a)[1]
+
+
+def district_frame(agencies: pd.Series) -> pd.DataFrame:
+    """기관명 Series → 관할지자체·광역단위 (범주형)·관할 여부 df.
+
+    관할 밖 기관의 관할지자체는 NaN이고, 관할 여부는 관할 지자체 소속이면서 교육청이 아닌 기관만 True.
+    """
+    codes, uniques = pd.factorize(agencies.astype(str).str.strip())
+    matched = [match_district(a) for a in uniques]
+    district_cats = pd.Index(FULL_DISTRICT_LIST)
+    metro_cats = pd.Index(METRO_LIST[1:] + [OTHER_METRO])
+    district_codes = district_cats.get_indexer([d for d, _ in matched])  # 없으면 -1 → NaN
+    metro_codes = metro_cats.get_indexer([m for _, m in matched])
+    in_scope = np.array([d is not None and "교육청" not in a for a, (d, _) in zip(uniques, matched)], dtype=bool)
+    return pd.DataFrame({
+        "관할지자체": pd.Categorical.from_codes(district_codes[codes], categories=district_cats),
+        "광역단위": pd.Categorical.from_codes(metro_codes[codes], categories=metro_cats),
+        "관할": in_scope[codes],
+    }, index=agencies.index)
@@ -0,0 +1,723 @@
+"""Drive 폴더의 연도별 아카이브를 파트 파일 + manifest로 나눠 쌓는 저장 계층.
+
+예전에는 하루치를 저장할 때마다 연도 파일(2026.csv, 나라장터_공고_용역_2026년.csv 등)
+전체를 내려받아 합치고 중복을 지운 뒤 다시 올려서, 연말이 되면 매일 수백 MB가 오갔다.
+이제 쓰기는 구간(하루 또는 백필 구간) 하나에 파트 파일 하나만 올리고, 같은 폴더의
+<접두어>_manifest.json에 연도별 기준 파일과 파트 목록을 기록한다.
+
+- 읽기: read_year()가 기준 파일과 파트를 구간 순서대로 합치고 키 기준으로 마지막 행만 남겨
+  예전 연도 파일과 같은 논리 테이블을 돌려준다. columns를 주면 그 열만 읽는다.
+- 기간 조회: read_range()/read_notice()는 manifest에 적힌 파트별 날짜 범위로 파트를 거르고,
+  Parquet 기준 파일은 HTTP Range 요청으로 푸터와 날짜 열 통계가 겹치는 row group만 읽는다.
+  압축 때 기준 파일을 날짜순으로 정렬해 ROW_GROUP_ROWS행씩 나눠 쓰므로 하루 조회는 수십~수백 KB만 받는다.
+- 캐시: 기준 파일과 파트는 drive_cache로 읽어 바뀌지 않았으면 로컬 디스크에서 읽는다.
+  기간 조회가 기준 파일의 FULL_READ_RATIO 이상을 필요로 하면 Range 대신 통째로 받아 캐시에 둔다.
+- 압축(compaction): 한 연도의 파트가 COMPACT_PARTS개 이상 쌓이면, 또는
+  `python drive_archive.py compact [연도]`를 실행하면 파트를 기준 파일에 합치고 파트를 지운다.
+  manifest를 먼저 갱신한 뒤 파트를 지우므로 중간에 끊겨도 행은 잃지 않는다.
+- 형식: pyarrow가 있으면 파트와 기준 파일을 zstd 압축 Parquet으로 쓴다. 숫자 문자열로만 된 열은
+  원래 문자열로 되돌릴 수 있을 때만 정수/실수형으로 저장한다. 중복 제거 키와 날짜 열은 파트마다
+  dtype이 달라지지 않게 늘 문자열로 쓰고 읽는다. 예전 CSV 파일은 그대로 읽는다.
+  기존 이름의 CSV(2026.csv 등)는 사람이 여는 내보내기 파일로, DRIVE_ARCHIVE_CSV_EXPORT가 켜져 있으면
+  압축 때 함께 갱신하고 `python drive_archive.py export-csv [연도]`로 언제든 다시 만들 수 있다.
+
+파일 ID는 폴더를 한 번 나열한 folder_index()에서 이름으로 찾는다 (파일마다 files().list를 부르지 않는다).
+
+manifest 쓰기는 두 겹으로 막는다. 이 모듈로 쓰는 워크플로(main.yml, naramall_history.yml,
+archive_compact.yml)는 같은 concurrency 그룹(drive-archive)이라 한 번에 하나만 돈다.
+그 밖의 실행(수동 실행 등)과 겹치면 저장 직전에 manifest의 revision을 다시 확인해, 다른 작업이 먼저
+저장했으면 다시 읽고 변경을 다시 적용한다(MANIFEST_RETRIES회). 확인과 업로드 사이의 짧은 틈은 남는다.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Sequence, TypeVar
+
+import pandas as pd
+from googleapiclient.http import MediaIoBaseUpload
+
+import drive_cache
+import google_clients
+import sheet_mirror
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 CSV로만 쓴다
+    pa = pq = None
+
+SHOPPING_FOLDER_ID = "1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr"
+NOTICE_FOLDER_ID = "1AsvVmayEmTtY92d1SfXxNi6bL0Zjw5mg"
+NOTICE_CATEGORIES = ("공사", "물품", "용역")
+
+COMPACT_PARTS = max(1, int(os.environ.get("DRIVE_ARCHIVE_COMPACT_PARTS", "31")))
+CSV_EXPORT = os.environ.get("DRIVE_ARCHIVE_CSV_EXPORT", "1") != "0"
+MANIFEST_VERSION = 1
+RESUMABLE_BYTES = 5 * 1024 * 1024
+ROW_GROUP_ROWS = 20_000
+FULL_READ_RATIO = 0.5
+MANIFEST_RETRIES = 5
+FOLDER_INDEX_TTL = float(os.environ.get("DRIVE_FOLDER_INDEX_TTL", "300"))
+KST = timezone(timedelta(hours=9))
+
+MIMETYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+T = TypeVar("T")
+
+_folder_indexes: dict[str, tuple[float, dict[str, dict]]] = {}
+_index_lock = threading.Lock()
+
+
+class ManifestConflict(RuntimeError):
+    """manifest를 읽은 뒤 다른 작업이 먼저 저장한 경우."""
+
+
+@dataclass(frozen=True)
+class Archive:
+    folder_id: str
+    prefix: str           # 파트·manifest 파일 이름 접두어
+    base_stem: str        # 연도 기준 파일 이름 (확장자 제외, "{year}" 자리에 연도)
+    key: tuple[str, ...]  # 중복 제거 기준 열 (마지막 행을 남긴다)
+    date_column: str      # 기간 조회·row group 통계 기준 열 (앞 8자리 숫자가 YYYYMMDD)
+
+    @property
+    def manifest_file(self) -> str:
+        return f"{self.prefix}_manifest.json"
+
+    def base_file(self, year, fmt: str = "csv") -> str:
+        return f"{self.base_stem.format(year=year)}.{fmt}"
+
+    def part_file(self, label: str, fmt: str | None = None) -> str:
+        return f"{self.prefix}_{label}.part.{fmt or write_format()}"
+
+
+SHOPPING = Archive(
+    SHOPPING_FOLDER_ID, "종합쇼핑몰", "{year}", ("계약납품요구일자", "수요기관명", "품명", "금액"), "계약납품요구일자",
+)
+
+
+def notice_archive(cat_name: str) -> Archive:
+    return Archive(
+        NOTICE_FOLDER_ID, f"나라장터_공고_{cat_name}", f"나라장터_공고_{cat_name}_{{year}}년", ("bidNtceNo",), "bidNtceDt",
+    )
+
+
+def all_archives() -> list[Archive]:
+    return [SHOPPING] + [notice_archive(cat) for cat in NOTICE_CATEGORIES]
+
+
+def write_format() -> str:
+    return "parquet" if pq is not None else "csv"
+
+
+# ── 날짜 키 ─────────────────────────────────
+def _day(value) -> str:
+    """'20260528', '2026-05-28', date 등을 'YYYYMMDD'로."""
+    return _NON_DIGIT.sub("", str(value))[:8]
+
+
+def _date_keys(column: pd.Series) -> pd.Series:
+    """'2026-05-28 11:31:23', 20260528 같은 값을 'YYYYMMDD' 문자열로 (결측은 빈 문자열)."""
+    text = column.astype(str).where(column.notna(), "")
+    return text.str.replace(_NON_DIGIT, "", regex=True).str[:8]
+
+
+def _date_stats(df: pd.DataFrame, archive: Archive) -> dict:
+    if archive.date_column not in df.columns:
+        return {}
+    keys = _date_keys(df[archive.date_column])
+    keys = keys[keys.str.len() == 8]
+    return {"date_min": keys.min(), "date_max": keys.max()} if not keys.empty else {}
+
+
+def _overlaps(meta: dict, label: str | None, date_from: str, date_to: str) -> bool:
+    """파일의 날짜 범위(manifest 통계, 없으면 파트 label)가 조회 기간과 겹치는지."""
+    low, high = meta.get("date_min"), meta.get("date_max")
+    if (low is None or high is None) and label:
+        low, _, high = label.partition("-")
+        high = high or low
+    if low is None or high is None:
+        return True
+    return not (high < date_from or low > date_to)
+
+
+# ── 직렬화 ──────────────────────────────────
+def _typed_column(column: pd.Series) -> pd.Series:
+    """문자열 열을 되돌릴 수 있는 경우에만 숫자형으로, 나머지는 문자열로 맞춘다."""
+    if not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)):
+        return column
+    present = column.dropna()
+    present = present[present != ""]
+    if present.empty:
+        return column.where(column.isna(), column.astype(str))
+    uniques = pd.Series(present.astype(str).unique())
+    if uniques.map(sheet_mirror.is_int_text).all():
+        # float64를 거치면 빈 값 때문에 1000 → 1000.0, 2^53보다 큰 ID는 자릿수가 깨진다
+        values = [None if pd.isna(v) or v == "" else int(v) for v in column]
+        return pd.Series(pd.array(values, dtype="Int64"), index=column.index, name=column.name)
+    if uniques.map(sheet_mirror.is_float_text).all():
+        return pd.to_numeric(column.where(column != ""), errors="coerce")
+    return column.where(column.isna(), column.astype(str))
+
+
+def _text_column(column: pd.Series) -> pd.Series:
+    """숫자로 읽힌 열도 문자열로 (정수 값은 123.0이 아니라 123)."""
+    if pd.api.types.is_float_dtype(column):
+        present = column.dropna()
+        if (present == present.round()).all():
+            column = column.astype("Int64")
+    return column.where(column.isna(), column.astype(str)).astype(object)
+
+
+def _text_columns(archive: Archive) -> list[str]:
+    """파트마다 dtype을 따로 정하면 안 되는 열: 중복 제거 키와 날짜 열은 늘 문자열로 둔다."""
+    return list(dict.fromkeys([*archive.key, archive.date_column]))
+
+
+def _with_text_columns(df: pd.DataFrame, archive: Archive) -> pd.DataFrame:
+    columns = [col for col in _text_columns(archive) if col in df.columns]
+    if not columns:
+        return df
+    return df.assign(**{col: _text_column(df[col]) for col in columns})
+
+
+def _combine(frames: list[pd.DataFrame], archive: Archive) -> pd.DataFrame:
+    """여러 파일을 합친다. 파일마다 123/"123"처럼 키 dtype이 달라도 같은 행으로 본다."""
+    frames = [_with_text_columns(frame, archive) for frame in frames]
+    return frames[0] if len(frames) == 1 else _dedup(pd.concat(frames, ignore_index=True), archive)
+
+
+def _encode(df: pd.DataFrame, fmt: str, archive: Archive | None = None) -> bytes:
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8-sig")
+    text = set(_text_columns(archive)) if archive is not None else set()
+    typed = df.apply(lambda column: _text_column(column) if column.name in text else _typed_column(column))
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(typed, preserve_index=False), sink, compression="zstd",
+                   row_group_size=ROW_GROUP_ROWS)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode(data: bytes, fmt: str, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError("pyarrow가 없어 Parquet 아카이브를 읽을 수 없습니다.")
+        parquet = pq.ParquetFile(pa.BufferReader(data))
+        names = parquet.schema_arrow.names
+        selected = names if columns is None else [col for col in columns if col in names]
+        return sheet_mirror.to_frame(parquet.read(columns=selected))
+    if not data.strip():
+        return pd.DataFrame()
+    usecols = None if columns is None else (lambda col, wanted=set(columns): col in wanted)
+    try:
+        return pd.read_csv(io.BytesIO(data), encoding="utf-8-sig", low_memory=False, usecols=usecols)
+    except UnicodeDecodeError:  # 예전에 cp949로 올라간 연도 파일
+        return pd.read_csv(io.BytesIO(data), encoding="cp949", low_memory=False, usecols=usecols)
+
+
+def _dedup(df: pd.DataFrame, archive: Archive) -> pd.DataFrame:
+    subset = [col for col in archive.key if col in df.columns]
+    if len(subset) != len(archive.key):
+        return df
+    return df.drop_duplicates(subset=subset, keep="last", ignore_index=True)
+
+
+# ── Drive 입출력 ─────────────────────────────
+def _now() -> str:
+    return datetime.now(KST).isoformat(timespec="seconds")
+
+
+def folder_index(service, folder_id: str, refresh: bool = False) -> dict[str, dict]:
+    """폴더 안 파일 이름 → {"id", "modifiedTime"}.
+
+    폴더 전체를 한 번 페이지 단위로 나열해 FOLDER_INDEX_TTL초 동안 프로세스 안에서 재사용한다.
+    이 모듈이 올리거나 지운 파일은 바로 반영한다.
+    """
+    with _index_lock:
+        cached = _folder_indexes.get(folder_id)
+        if cached is not None and not refresh and time.monotonic() - cached[0] < FOLDER_INDEX_TTL:
+            return cached[1]
+    index: dict[str, dict] = {}
+    token = None
+    while True:
+        res = service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields="nextPageToken, files(id, name, modifiedTime)",
+            pageSize=1000,
+            pageToken=token,
+        ).execute()
+        for item in res.get("files", []):
+            index.setdefault(item["name"], {"id": item["id"], "modifiedTime": item.get("modifiedTime")})
+        token = res.get("nextPageToken")
+        if not token:
+            break
+    with _index_lock:
+        _folder_indexes[folder_id] = (time.monotonic(), index)
+    return index
+
+
+def _remember(folder_id: str, name: str, item: dict) -> None:
+    with _index_lock:
+        cached = _folder_indexes.get(folder_id)
+        if cached is not None:
+            cached[1][name] = {"id": item["id"], "modifiedTime": item.get("modifiedTime")}
+
+
+def _forget(file_id: str) -> None:
+    with _index_lock:
+        for _, index in _folder_indexes.values():
+            for name in [n for n, item in index.items() if item["id"] == file_id]:
+                del index[name]
+
+
+def _find(service, archive: Archive, name: str) -> str | None:
+    item = folder_index(service, archive.folder_id).get(name)
+    return item["id"] if item else None
+
+
+def _download(file_id: str, auth_json: str | None, cached: bool = True) -> bytes:
+    if cached:  # 바뀌지 않은 파일은 로컬 디스크에서 읽는다 (drive_cache.py)
+        return drive_cache.fetch(file_id, auth_json)
+    resp = google_clients.drive_media(file_id, auth_json, timeout=120)
+    resp.raise_for_status()
+    return resp.content
+
+
+def _upload(service, archive: Archive, name: str, data: bytes, mimetype: str, file_id: str | None = None) -> str:
+    return _upload_to(service, archive.folder_id, name, data, mimetype, file_id)
+
+
+def _upload_to(service, folder_id: str, name: str, data: bytes, mimetype: str, file_id: str | None = None) -> str:
+    media = MediaIoBaseUpload(io.BytesIO(data), mimetype=mimetype, resumable=len(data) > RESUMABLE_BYTES)
+    if file_id:
+        item = service.files().update(fileId=file_id, media_body=media, fields="id, modifiedTime").execute()
+    else:
+        item = service.files().create(
+            body={"name": name, "parents": [folder_id]},
+            media_body=media,
+            fields="id, modifiedTime",
+        ).execute()
+    _remember(folder_id, name, item)
+    return item["id"]
+
+
+def _delete(service, file_id: str) -> None:
+    try:
+        service.files().delete(fileId=file_id).execute()
+        _forget(file_id)
+    except Exception as e:  # manifest에서 빠졌으니 남아도 읽히지 않는다
+        print(f"⚠️ 아카이브 파일 삭제 실패 ({file_id}): {e}")
+
+
+class _DriveRangeFile(io.RawIOBase):
+    """HTTP Range 요청으로 필요한 구간만 내려받는 읽기 전용 Drive 파일.
+
+    pyarrow.ParquetFile이 푸터와 고른 row group의 열 청크만 읽도록 넘긴다.
+    """
+
+    def __init__(self, file_id: str, size: int, auth_json: str | None):
+        self._session = google_clients.authorized_session(auth_json)
+        self._url = google_clients.DRIVE_MEDIA_URL.format(file_id)
+        self.size = size
+        self._pos = 0
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        start = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self.size}[whence]
+        self._pos = max(0, start + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), self.size)
+        if end <= self._pos:
+            return 0
+        resp = self._session.get(self._url, headers={"Range": f"bytes={self._pos}-{end - 1}"}, timeout=120)
+        resp.raise_for_status()
+        data = resp.content if resp.status_code == 206 else resp.content[self._pos:end]  # Range 무시 시 전체 본문
+        data = data[: end - self._pos]
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def _row_groups(parquet, column: str, date_from: str, date_to: str) -> list[int]:
+    """날짜 열 min/max 통계가 조회 기간과 겹치는 row group 번호 (통계가 없으면 포함)."""
+    metadata = parquet.metadata
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    if column not in names:
+        return list(range(metadata.num_row_groups))
+    index = names.index(column)
+    groups = []
+    for group in range(metadata.num_row_groups):
+        stats = metadata.row_group(group).column(index).statistics
+        if stats is not None and stats.has_min_max and (_day(stats.max) < date_from or _day(stats.min) > date_to):
+            continue
+        groups.append(group)
+    return groups
+
+
+def _group_bytes(parquet, groups: Sequence[int]) -> int:
+    metadata = parquet.metadata
+    return sum(
+        metadata.row_group(g).column(c).total_compressed_size
+        for g in groups for c in range(metadata.num_columns)
+    )
+
+
+def _read_base_range(service, archive: Archive, base: dict, wanted: Sequence[str] | None,
+                     date_from: str, date_to: str, auth_json: str | None) -> pd.DataFrame:
+    fmt = base.get("format", "csv")
+    if fmt != "parquet" or pq is None:  # 예전 CSV 기준 파일은 통째로 읽는다
+        return _decode(_download(base["id"], auth_json), fmt, wanted)
+
+    local = drive_cache.cached_path(base["id"], auth_json)
+    if local is not None:
+        parquet, source = pq.ParquetFile(local), None
+    else:
+        size = base.get("size")
+        if size is None:
+            size = int(service.files().get(fileId=base["id"], fields="size").execute()["size"])
+        source = _DriveRangeFile(base["id"], int(size), auth_json)
+        parquet = pq.ParquetFile(pa.PythonFile(source, mode="r"))
+    groups = _row_groups(parquet, archive.date_column, date_from, date_to)
+    if not groups:
+        return pd.DataFrame()
+    full = source is not None and drive_cache.ENABLED
+    if full and _group_bytes(parquet, groups) >= FULL_READ_RATIO * source.size:
+        # 파일 대부분이 필요하면 통째로 받아 디스크 캐시에 두고 다음 조회부터 로컬에서 읽는다
+        parquet, source = pq.ParquetFile(pa.BufferReader(_download(base["id"], auth_json))), None
+    names = parquet.schema_arrow.names
+    selected = names if wanted is None else [col for col in wanted if col in names]
+    df = sheet_mirror.to_frame(parquet.read_row_groups(groups, columns=selected))
+    read = "로컬 캐시" if source is None else f"{source.bytes_read / 1024:,.0f}KB 읽음"
+    print(f"   └ {archive.prefix}: row group {len(groups)}/{parquet.metadata.num_row_groups}개, {read}")
+    return df
+
+
+# ── manifest ────────────────────────────────
+def load_manifest(service, archive: Archive, auth_json: str | None = None) -> tuple[str | None, dict]:
+    """(manifest 파일 ID, manifest). 아직 없으면 (None, 빈 manifest)."""
+    file_id = _find(service, archive, archive.manifest_file)
+    manifest = {"version": MANIFEST_VERSION, "archive": archive.prefix, "years": {}}
+    if file_id:
+        try:
+            # 매일 바뀌는 작은 파일이라 버전 확인 없이 바로 받는다
+            manifest.update(json.loads(_download(file_id, auth_json, cached=False)))
+        except ValueError as e:
+            print(f"⚠️ {archive.manifest_file} 읽기 오류, 파트 목록 없이 진행: {e}")
+    return file_id, manifest
+
+
+def _save_manifest(service, archive: Archive, file_id: str | None, manifest: dict,
+                   auth_json: str | None = None) -> str:
+    """manifest를 올린다. 불러온 뒤 다른 작업이 먼저 저장했으면(revision이 다르면) ManifestConflict."""
+    if file_id:
+        try:
+            remote = json.loads(_download(file_id, auth_json, cached=False))
+        except ValueError:
+            remote = {}
+        if remote.get("revision") != manifest.get("revision"):
+            raise ManifestConflict(f"{archive.manifest_file}: 다른 작업이 먼저 저장함 ({remote.get('updated_at')})")
+    elif archive.manifest_file in folder_index(service, archive.folder_id, refresh=True):
+        raise ManifestConflict(f"{archive.manifest_file}: 다른 작업이 먼저 만듦")
+    manifest["revision"] = uuid.uuid4().hex
+    manifest["updated_at"] = _now()
+    data = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8")
+    return _upload(service, archive, archive.manifest_file, data, "application/json", file_id)
+
+
+def _commit(service, archive: Archive, manifest_id: str | None, manifest: dict,
+            change: Callable[[dict], T], auth_json: str | None) -> tuple[str, dict, T]:
+    """change(manifest)를 적용해 저장한다. 그 사이 다른 작업이 저장했으면 다시 읽어 다시 적용한다.
+
+    (manifest 파일 ID, 저장한 manifest, change의 반환값)을 돌려준다.
+    """
+    attempt = 1
+    while True:
+        result = change(manifest)
+        try:
+            return _save_manifest(service, archive, manifest_id, manifest, auth_json), manifest, result
+        except ManifestConflict as e:
+            if attempt >= MANIFEST_RETRIES:
+                raise
+            print(f"⚠️ {e} — 다시 읽어 반영합니다 ({attempt}/{MANIFEST_RETRIES})")
+            manifest_id, manifest = load_manifest(service, archive, auth_json)
+            attempt += 1
+
+
+def _discover_base(service, archive: Archive, year: str) -> dict | None:
+    """manifest에 없는 기준 파일(파트 도입 전 연도 파일)을 이름으로 찾는다."""
+    for fmt in ("parquet", "csv"):
+        file_id = _find(service, archive, archive.base_file(year, fmt))
+        if file_id:
+            return {"id": file_id, "format": fmt}
+    return None
+
+
+def _year_entry(service, archive: Archive, manifest: dict, year: str) -> dict:
+    entry = manifest["years"].setdefault(year, {"base": None, "parts": {}})
+    if entry.get("base") is None:
+        entry["base"] = _discover_base(service, archive, year)
+    return entry
+
+
+def _read_entry(archive: Archive, entry: dict, auth_json: str | None,
+                columns: Sequence[str] | None = None) -> pd.DataFrame:
+    files = [entry["base"]] if entry.get("base") else []
+    parts = entry.get("parts", {})
+    files += [parts[label] for label in sorted(parts)]
+    wanted = None
+    if columns is not None:  # 여러 파일을 합칠 때는 중복 제거 키도 함께 읽는다
+        wanted = list(columns) + ([col for col in archive.key if col not in columns] if len(files) > 1 else [])
+
+    frames = [_decode(_download(f["id"], auth_json), f.get("format", "csv"), wanted) for f in files]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    df = _combine(frames, archive)
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+
+# ── 공개 API ────────────────────────────────
+def read_year(archive: Archive, year, auth_json: str | None = None,
+              columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """기준 파일 + 파트를 합친 한 해의 논리 테이블. 없으면 빈 DataFrame.
+
+    columns를 주면 그 열만 읽는다 (Parquet은 해당 열만 해석하고, 없는 열은 빠진다).
+    """
+    service = google_clients.drive_service(auth_json)
+    _, manifest = load_manifest(service, archive, auth_json)
+    entry = manifest["years"].get(str(year)) or {"base": None, "parts": {}}
+    if entry.get("base") is None:
+        entry = {**entry, "base": _discover_base(service, archive, str(year))}
+    return _read_entry(archive, entry, auth_json, columns)
+
+
+def read_range(archive: Archive, date_from, date_to, columns: Sequence[str] | None = None,
+               auth_json: str | None = None) -> pd.DataFrame:
+    """date_column이 [date_from, date_to] 안에 드는 행만 읽는다 (날짜는 YYYYMMDD, YYYY-MM-DD, date).
+
+    기간과 겹치지 않는 연도·파트·row group은 내려받지 않는다. columns를 주면 그 열만 돌려준다.
+    """
+    date_from, date_to = _day(date_from), _day(date_to)
+    service = google_clients.drive_service(auth_json)
+    _, manifest = load_manifest(service, archive, auth_json)
+    wanted = None if columns is None else list(dict.fromkeys([*columns, archive.date_column, *archive.key]))
+
+    frames = []
+    for year in range(int(date_from[:4]), int(date_to[:4]) + 1):
+        entry = manifest["years"].get(str(year)) or {"base": None, "parts": {}}
+        base = entry.get("base") or _discover_base(service, archive, str(year))
+        if base and _overlaps(base, None, date_from, date_to):
+            frames.append(_read_base_range(service, archive, base, wanted, date_from, date_to, auth_json))
+        parts = entry.get("parts", {})
+        for label in sorted(parts):
+            part = parts[label]
+            if _overlaps(part, label, date_from, date_to):
+                frames.append(_decode(_download(part["id"], auth_json), part.get("format", "csv"), wanted))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    df = _combine(frames, archive)
+    if archive.date_column in df.columns:
+        keys = _date_keys(df[archive.date_column])
+        df = df[(keys >= date_from) & (keys <= date_to)].reset_index(drop=True)
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+
+def read_file(folder_id: str, name: str, auth_json: str | None = None) -> bytes | None:
+    """폴더 안 파일 하나의 내용 (없으면 None). 바뀌지 않았으면 디스크 캐시에서 읽는다."""
+    service = google_clients.drive_service(auth_json)
+    item = folder_index(service, folder_id).get(name)
+    return _download(item["id"], auth_json) if item else None
+
+
+def write_file(folder_id: str, name: str, data: bytes, mimetype: str, auth_json: str | None = None) -> str:
+    """폴더 안 파일 하나를 만들거나 덮어쓰고 파일 ID를 반환한다."""
+    service = google_clients.drive_service(auth_json)
+    item = folder_index(service, folder_id).get(name)
+    return _upload_to(service, folder_id, name, data, mimetype, item["id"] if item else None)
+
+
+def read_notice(cat_name: str, date_from, date_to, columns: Sequence[str] | None = None,
+                auth_json: str | None = None) -> pd.DataFrame:
+    """나라장터 공고(공사/물품/용역) 중 공고일시(bidNtceDt)가 기간 안인 행."""
+    return read_range(notice_archive(cat_name), date_from, date_to, columns, auth_json)
+
+
+def append(archive: Archive, label: str, df: pd.DataFrame, auth_json: str | None = None,
+           incomplete: Iterable[str] = ()) -> int:
+    """label(YYYYMMDD 또는 YYYYMMDD-YYYYMMDD) 구간의 행을 파트 파일로 올린다.
+
+    같은 label로 다시 쓰면 그 파트를 덮어쓴다. 올린 행 수를 반환한다.
+    incomplete에는 수집에 실패한 키워드 등을 넘긴다. manifest의 파트(압축 뒤에는 연도 항목의
+    "incomplete")에 남아 다시 받아야 할 구간을 알 수 있고, 같은 label로 빠짐없이 다시 쓰면 지워진다.
+    """
+    if df.empty:
+        return 0
+    service = google_clients.drive_service(auth_json)
+    year = str(label)[:4]
+    fmt = write_format()
+    df = _dedup(_with_text_columns(df, archive), archive)
+
+    manifest_id, manifest = load_manifest(service, archive, auth_json)
+    previous = _year_entry(service, archive, manifest, year)["parts"].get(label)
+    reuse = previous if previous and previous.get("format", "csv") == fmt else None
+    data = _encode(df, fmt, archive)
+    part_id = _upload(service, archive, archive.part_file(label, fmt), data, MIMETYPES[fmt],
+                      reuse["id"] if reuse else None)
+    part = {
+        "id": part_id, "format": fmt, "rows": len(df), "size": len(data), "written_at": _now(),
+        **_date_stats(df, archive),
+    }
+    incomplete = sorted(incomplete)
+    if incomplete:
+        part["incomplete"] = incomplete
+
+    def add_part(manifest: dict) -> dict | None:
+        entry = _year_entry(service, archive, manifest, year)
+        replaced = entry["parts"].get(label)
+        entry["parts"][label] = part
+        if not incomplete:
+            entry.get("incomplete", {}).pop(label, None)
+        return replaced
+
+    manifest_id, manifest, replaced = _commit(service, archive, manifest_id, manifest, add_part, auth_json)
+    if replaced and replaced["id"] != part_id:  # 형식이 바뀐 예전 파트
+        _delete(service, replaced["id"])
+
+    if len(manifest["years"][year]["parts"]) >= COMPACT_PARTS:
+        _compact(service, archive, manifest_id, manifest, year, auth_json)
+    return len(df)
+
+
+def _export_csv(service, archive: Archive, entry: dict, year: str, df: pd.DataFrame) -> dict:
+    """CSV 내보내기 파일을 올리고 manifest의 "csv" 항목을 돌려준다."""
+    csv = entry.get("csv") or {}
+    csv_id = csv.get("id") or _find(service, archive, archive.base_file(year, "csv"))
+    csv_id = _upload(service, archive, archive.base_file(year, "csv"), _encode(df, "csv"), MIMETYPES["csv"], csv_id)
+    return {"id": csv_id, "rows": len(df), "exported_at": _now()}
+
+
+def _compact(service, archive: Archive, manifest_id: str | None, manifest: dict, year: str,
+             auth_json: str | None) -> int:
+    entry = _year_entry(service, archive, manifest, year)
+    parts = dict(entry["parts"])
+    base = entry.get("base") or {}
+    fmt = write_format()
+    if not parts and (not base or base.get("format", "csv") == fmt):
+        return 0
+    df = _read_entry(archive, entry, auth_json)
+    if archive.date_column in df.columns:  # 날짜순으로 써야 row group 통계로 기간을 거를 수 있다
+        order = _date_keys(df[archive.date_column]).argsort(kind="stable")
+        df = df.iloc[order.to_numpy()].reset_index(drop=True)
+    reuse = base.get("id") if base.get("format", "csv") == fmt else None
+    data = _encode(df, fmt, archive)
+    base_id = _upload(service, archive, archive.base_file(year, fmt), data, MIMETYPES[fmt], reuse)
+    new_base = {
+        "id": base_id, "format": fmt, "rows": len(df), "size": len(data), "compacted_at": _now(),
+        **_date_stats(df, archive),
+    }
+    csv = entry.get("csv")
+    if base.get("id") and not reuse:  # CSV 기준 파일 → Parquet 전환: 예전 파일은 내보내기 CSV가 된다
+        csv = {"id": base["id"]}
+    if fmt != "csv" and CSV_EXPORT:
+        csv = _export_csv(service, archive, {"csv": csv}, year, df)
+
+    def replace_parts(manifest: dict) -> list[dict]:
+        # 압축하는 동안 다른 작업이 올린 파트나 덮어쓴 파트는 그대로 남긴다
+        entry = _year_entry(service, archive, manifest, year)
+        entry["base"] = new_base
+        if csv is not None:
+            entry["csv"] = csv
+        merged = []
+        for label, part in parts.items():
+            current = entry["parts"].get(label)
+            if current is None or current["id"] != part["id"]:
+                continue
+            if part.get("incomplete"):  # 압축해도 다시 받아야 할 구간 표시는 남긴다
+                entry.setdefault("incomplete", {})[label] = part["incomplete"]
+            del entry["parts"][label]
+            merged.append(part)
+        return merged
+
+    _, _, merged = _commit(service, archive, manifest_id, manifest, replace_parts, auth_json)
+    for part in merged:
+        _delete(service, part["id"])
+    print(f"🗜️ {archive.base_file(year, fmt)} 압축 완료 (파트 {len(merged)}개 → {len(df):,}행)")
+    return len(df)
+
+
+def compact(archive: Archive, year=None, auth_json: str | None = None) -> int:
+    """파트를 기준 파일에 합친다. year가 없으면 파트가 있는 모든 연도. 압축한 연도 수를 반환한다."""
+    service = google_clients.drive_service(auth_json)
+    _, manifest = load_manifest(service, archive, auth_json)
+    years = [str(year)] if year is not None else sorted(
+        y for y, entry in manifest["years"].items() if entry.get("parts")
+    )
+    done = 0
+    for y in years:
+        manifest_id, manifest = load_manifest(service, archive, auth_json)
+        if _compact(service, archive, manifest_id, manifest, y, auth_json):
+            done += 1
+    return done
+
+
+def export_csv(archive: Archive, year, auth_json: str | None = None) -> int:
+    """한 해의 논리 테이블을 기존 이름의 CSV(2026.csv 등)로 내보낸다. 행 수를 반환한다."""
+    service = google_clients.drive_service(auth_json)
+    manifest_id, manifest = load_manifest(service, archive, auth_json)
+    entry = _year_entry(service, archive, manifest, str(year))
+    df = _read_entry(archive, entry, auth_json)
+    if df.empty:
+        return 0
+    csv = _export_csv(service, archive, entry, str(year), df)
+
+    def set_csv(manifest: dict) -> None:
+        _year_entry(service, archive, manifest, str(year))["csv"] = csv
+
+    _commit(service, archive, manifest_id, manifest, set_csv, auth_json)
+    print(f"📄 {archive.base_file(year, 'csv')} 내보내기 완료 ({len(df):,}행)")
+    return len(df)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    year = sys.argv[2] if len(sys.argv) > 2 else None
+    if command == "compact":
+        for archive in all_archives():
+            print(f"📦 {archive.prefix}: {compact(archive, year)}개 연도 압축")
+    elif command == "export-csv" and year:
+        for archive in all_archives():
+            export_csv(archive, year)
+    else:
+        print("사용법: python drive_archive.py compact [연도] | export-csv <연도>")
+
+
+if __name__ == "__main__":
+    main()
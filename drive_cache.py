@@ -0,0 +1,137 @@
+"""Drive 파일 내용을 로컬 디스크에 보관하는 읽기 캐시 (파일 ID 기준).
+
+예전에는 Streamlit 캐시가 만료될 때마다, 메일링·주간 리포트를 돌릴 때마다 바뀌지 않은
+연도 파일을 alt=media로 통째로 다시 내려받았다. 여기서는 내려받은 내용을 디스크에 두고,
+읽을 때마다 files().get(fields="md5Checksum,modifiedTime,size")로 버전만 확인해
+같으면 디스크에서 읽는다.
+
+- 캐시 파일 이름은 <파일 ID>.<버전 해시>.bin 이라 내용과 버전이 함께 바뀐다.
+  임시 파일에 쓴 뒤 os.replace로 옮기므로 다른 스레드·프로세스가 쓰다 만 파일을 읽지 않는다.
+- 전체 크기가 MAX_BYTES를 넘으면 가장 오래 읽지 않은 파일부터 지운다 (읽을 때 mtime 갱신, LRU).
+- 내려받은 내용의 md5가 확인한 버전과 다르면(그 사이 파일이 바뀜) 돌려주기만 하고 저장하지 않는다.
+- DRIVE_CACHE=0이면 캐시 없이 바로 내려받는다.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+
+import google_clients
+
+ENABLED = os.environ.get("DRIVE_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("DRIVE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "drive_cache"))
+MAX_BYTES = max(0, int(os.environ.get("DRIVE_CACHE_MAX_MB", "1024"))) * 1024 * 1024
+FIELDS = "md5Checksum,modifiedTime,size"
+
+_lock = threading.Lock()
+
+
+def metadata(file_id: str, auth_json: str | None = None) -> dict:
+    """버전 확인용 메타데이터 (md5Checksum, modifiedTime, size)."""
+    return google_clients.drive_service(auth_json).files().get(fileId=file_id, fields=FIELDS).execute()
+
+
+def _version(meta: dict) -> str | None:
+    # 구글 문서 형식 파일은 md5Checksum이 없어서 modifiedTime으로 구분한다
+    version = meta.get("md5Checksum") or meta.get("modifiedTime")
+    return hashlib.md5(version.encode("utf-8")).hexdigest()[:16] if version else None
+
+
+def _path(file_id: str, version: str) -> str:
+    return os.path.join(CACHE_DIR, f"{file_id}.{version}.bin")
+
+
+def _entries() -> list[os.DirEntry]:
+    try:
+        return [e for e in os.scandir(CACHE_DIR) if e.is_file() and e.name.endswith(".bin")]
+    except OSError:
+        return []
+
+
+def _lookup(file_id: str, meta: dict) -> str | None:
+    version = _version(meta)
+    if version is None:
+        return None
+    path = _path(file_id, version)
+    try:
+        os.utime(path)  # LRU 순서 갱신
+    except OSError:
+        return None
+    return path
+
+
+def cached_path(file_id: str, auth_json: str | None = None) -> str | None:
+    """현재 버전이 디스크에 있으면 그 경로, 없으면 None (내려받지 않는다)."""
+    if not ENABLED:
+        return None
+    return _lookup(file_id, metadata(file_id, auth_json))
+
+
+def _store(file_id: str, version: str, data: bytes) -> None:
+    if len(data) > MAX_BYTES:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{file_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, _path(file_id, version))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        print(f"⚠️ Drive 캐시 저장 실패 ({file_id}): {e}")
+        return
+    with _lock:
+        _evict(keep=_path(file_id, version))
+
+
+def _evict(keep: str) -> None:
+    entries = []
+    for entry in _entries():
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    keep_id = os.path.basename(keep).split(".", 1)[0]
+    total = 0
+    for _, size, path in sorted(entries, reverse=True):
+        # 같은 파일의 예전 버전은 다시 읽힐 일이 없다
+        stale = path != keep and os.path.basename(path).split(".", 1)[0] == keep_id
+        if stale or total + size > MAX_BYTES:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        total += size
+
+
+def fetch(file_id: str, auth_json: str | None = None, timeout: float = 120) -> bytes:
+    """Drive 파일 내용. 디스크에 같은 버전이 있으면 내려받지 않는다."""
+    if not ENABLED:
+        resp = google_clients.drive_media(file_id, auth_json, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+
+    meta = metadata(file_id, auth_json)
+    path = _lookup(file_id, meta)
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            pass  # 다른 프로세스가 방금 지웠다
+
+    resp = google_clients.drive_media(file_id, auth_json, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.content
+    version = _version(meta)
+    md5 = meta.get("md5Checksum")
+    if version is not None and (md5 is None or hashlib.md5(data).hexdigest() == md5):
+        _store(file_id, version, data)
+    return data
@@ -2,13 +2,13 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date
 import io
-import json
-import requests
-from google.oauth2 import service_account
-import google.auth.transport.requests
-from googleapiclient.discovery import build
 from dateutil.relativedelta import relativedelta
 
+import drive_archive
+import google_clients
+import sheet_mirror
+from unique_map import map_unique
+
 
 st.set_page_config(page_title="공공조달 DATA 통합검색", layout="wide", page_icon="🏛")
 
@@ -69,18 +69,14 @@ button[kind="primary"]:hover { box-shadow: 0 5px 18px rgba(37,99,235,0.5) !impor
 
 
 # ═══════════════════════════════════════════════════════════
-# 공유 캐시: 서비스 계정 인증 (1회)
+# 공유 캐시: 서비스 계정 인증 (google_clients가 1회 인증·만료 시에만 갱신)
 # ═══════════════════════════════════════════════════════════
-@st.cache_resource
 def get_drive_service():
-    info  = json.loads(st.secrets["GOOGLE_AUTH_JSON"])
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=[
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/spreadsheets.readonly'
-        ]
-    )
-    return build('drive', 'v3', credentials=creds), creds
+    return google_clients.drive_service(st.secrets["GOOGLE_AUTH_JSON"])
+
+
+def get_drive_session():
+    return google_clients.authorized_session(st.secrets["GOOGLE_AUTH_JSON"])
 
 
 # ═══════════════════════════════════════════════════════════
@@ -102,32 +98,31 @@ def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
 # 공유 캐시: 전체 원본 데이터 (모든 유저 공유, 복사 없음)
 # ═══════════════════════════════════════════════════════════
 @st.cache_resource(ttl=3600)
-def fetch_data_shared(file_id, is_sheet=True):
-    svc, creds = get_drive_service()
-    creds.refresh(google.auth.transport.requests.Request())
-    hdrs = {'Authorization': f'Bearer {creds.token}'}
-
-    if is_sheet:
-        url     = f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=csv"
-        content = requests.get(url, headers=hdrs).content
-        df = pd.read_csv(io.BytesIO(content), low_memory=True, dtype_backend='numpy_nullable')
-        return optimize_dtypes(df)
-
-    results = svc.files().list(
-        q=f"'{file_id}' in parents and trashed=false"
-    ).execute()
-    dfs = []
-    for f in results.get('files', []):
-        content = requests.get(
-            f"https://www.googleapis.com/drive/v3/files/{f['id']}?alt=media",
-            headers=hdrs
-        ).content
-        dfs.append(optimize_dtypes(pd.read_csv(io.BytesIO(content), low_memory=True)))
-    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
-
-
-# ── 나라장터_공고 연도별 CSV ────────────────────────────────
-NOTICE_FOLDER_ID  = "1AsvVmayEmTtY92d1SfXxNi6bL0Zjw5mg"
+def fetch_data_shared(file_id):
+    svc     = get_drive_service()
+    session = get_drive_session()
+
+    # 수집기가 커밋한 로컬 Parquet 미러가 시트와 같은 버전이면 내보내기 없이 읽는다
+    if sheet_mirror.find_entry(file_id):
+        meta = svc.files().get(fileId=file_id, fields='modifiedTime').execute()
+        mirrored = sheet_mirror.read_frame(file_id, meta.get('modifiedTime'))
+        if mirrored is not None:
+            return optimize_dtypes(mirrored)
+    url     = f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=csv"
+    content = session.get(url, timeout=120).content
+    df = pd.read_csv(io.BytesIO(content), low_memory=True, dtype_backend='numpy_nullable')
+    return optimize_dtypes(df)
+
+
+@st.cache_resource(ttl=3600)
+def fetch_shopping_range(s_s, e_s):
+    # 종합쇼핑몰 폴더에는 연도 파일·일별 파트·manifest·CSV 내보내기가 함께 있어서 폴더를 통째로 읽으면 안 된다.
+    # 계약납품요구일자가 기간 안인 행만 읽는다 (drive_archive.py)
+    df = drive_archive.read_range(drive_archive.SHOPPING, s_s, e_s, auth_json=st.secrets["GOOGLE_AUTH_JSON"])
+    return optimize_dtypes(df)
+
+
+# ── 나라장터_공고 연도별 아카이브 (drive_archive.notice_archive) ──
 NOTICE_CATS       = ['공사', '물품', '용역']
 NOTICE_COL_RENAME = {
     "dminsttNm":     "수요기관명",
@@ -138,42 +133,20 @@ NOTICE_COL_RENAME = {
 }
 
 @st.cache_resource(ttl=3600)
-def fetch_notice_csv_by_year(cat_name, year):
-    svc, creds = get_drive_service()
-    creds.refresh(google.auth.transport.requests.Request())
-    hdrs      = {'Authorization': f'Bearer {creds.token}'}
-    file_name = f"나라장터_공고_{cat_name}_{year}년.csv"
-    files = svc.files().list(
-        q=f"name='{file_name}' and '{NOTICE_FOLDER_ID}' in parents and trashed=false",
-        fields='files(id)'
-    ).execute().get('files', [])
-    if not files:
-        return pd.DataFrame()
-    resp = requests.get(
-        f"https://www.googleapis.com/drive/v3/files/{files[0]['id']}?alt=media",
-        headers=hdrs
-    )
-    try:
-        df = pd.read_csv(io.BytesIO(resp.content), encoding='utf-8-sig', low_memory=True)
-    except Exception:
-        df = pd.read_csv(io.BytesIO(resp.content), encoding='cp949', low_memory=True)
+def fetch_notice_range(cat_name, s_s, e_s):
+    # 공고일시가 기간 안인 행만 읽는다: 기간 밖의 연도·일별 파트·row group은 받지 않는다 (drive_archive.py)
+    df = drive_archive.read_notice(cat_name, s_s, e_s, auth_json=st.secrets["GOOGLE_AUTH_JSON"])
     return optimize_dtypes(df)
 
 
 def load_notice_data(cat_name, s_s, e_s):
-    dfs = []
-    for year in range(int(s_s[:4]), int(e_s[:4]) + 1):
-        df_y = fetch_notice_csv_by_year(cat_name, year)
-        if not df_y.empty:
-            dfs.append(df_y)
-    if not dfs:
+    df = fetch_notice_range(cat_name, s_s, e_s)
+    if df.empty:
         return pd.DataFrame()
-    df = pd.concat(dfs, ignore_index=True)
-    df['tmp_dt'] = (
+    return df.assign(tmp_dt=(
         df['bidNtceDt'].astype(str).str.replace(r'[^0-9]', '', regex=True).str[:8]
         if 'bidNtceDt' in df.columns else "0"
-    )
-    return df[(df['tmp_dt'] >= s_s) & (df['tmp_dt'] <= e_s)]
+    ))
 
 
 # ═══════════════════════════════════════════════════════════
@@ -287,7 +260,7 @@ SHEET_FILE_IDS = {
     '군수품_공고':   '1opuA_UzNm27U9QkbMay5UsyQqcwfxiEmIHNRdc4MyHM',
     '군수품_계약':   '1KPMUz0IKM6AQvqwfAkvW96WNvzbycN56vNlFnDmfRTw',
     '군수품_수의':   '1aYA18kPrSkpbayzbn16EdKUScVRwr2Nutyid5No5qjk',
-    '종합쇼핑몰':   '1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr'
+    '종합쇼핑몰':   drive_archive.SHOPPING_FOLDER_ID
 }
 
 DISPLAY_INDEX_MAP = {
@@ -523,7 +496,7 @@ for i, tab in enumerate(tabs):
                                 def fmt_price(v):
                                     try: return f"{int(float(str(v).replace(',', ''))):,}"
                                     except: return v
-                                df_f['추정가격'] = df_f['추정가격'].apply(fmt_price)
+                                df_f['추정가격'] = map_unique(df_f['추정가격'], fmt_price)
                             if k1_val and k1_val.strip():
                                 m1 = apply_keyword(df_f, k1_val.strip(), f_val)
                                 if l_val == "AND" and k2_val and k2_val.strip():
@@ -537,10 +510,10 @@ for i, tab in enumerate(tabs):
                             st.session_state[f"df_{cat}"] = pd.DataFrame()
                     else:
                         # 공유 캐시에서 원본 참조 (복사 없음)
-                        df_raw = fetch_data_shared(
-                            SHEET_FILE_IDS[cat],
-                            is_sheet=(cat != '종합쇼핑몰')
-                        )
+                        if cat == '종합쇼핑몰':
+                            df_raw = fetch_shopping_range(s_s, e_s)
+                        else:
+                            df_raw = fetch_data_shared(SHEET_FILE_IDS[cat])
                         df_f = filter_data(df_raw, cat, s_s, e_s, k1_val, k2_val, f_val, l_val) \
                                if not df_raw.empty else pd.DataFrame()
                         st.session_state[f"df_{cat}"] = df_f
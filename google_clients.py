@@ -0,0 +1,116 @@
+"""Google 서비스 계정 인증과 API 클라이언트를 프로세스 안에서 한 번만 만들어 함께 쓴다.
+
+예전에는 수집기·대시보드의 함수마다 GOOGLE_AUTH_JSON을 다시 파싱하고 인증해
+호출할 때마다 토큰 발급 요청이 나갔다. 여기서는 인증 JSON별로 자격 증명 하나를 두고
+만료됐을 때만 갱신하며, 그 위에 다음을 캐시한다.
+
+- authorized_session(): 연결 풀을 가진 AuthorizedSession (Drive 파일 내려받기 등)
+- gspread_client(): gspread Client (requests 기반이라 스레드 간 공유)
+- drive_service() / sheets_service(): googleapiclient 리소스. httplib2가 스레드 안전하지
+  않으므로 스레드마다 하나씩 만들어 재사용한다.
+
+auth_json을 넘기지 않으면 GOOGLE_AUTH_JSON 환경변수를 쓴다 (Streamlit은 st.secrets 값을 넘긴다).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    import gspread
+
+SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+DRIVE_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{}?alt=media"
+POOL_SIZE = max(1, int(os.environ.get("GOOGLE_HTTP_POOL_SIZE", "10")))
+
+_lock = threading.RLock()
+_credentials: dict[str, service_account.Credentials] = {}
+_sessions: dict[str, AuthorizedSession] = {}
+_gspread_clients: dict[str, gspread.Client] = {}
+_local = threading.local()
+
+
+def _auth_json(auth_json: str | None) -> str:
+    value = auth_json if auth_json is not None else os.environ.get("GOOGLE_AUTH_JSON")
+    if not value:
+        raise RuntimeError("GOOGLE_AUTH_JSON 환경변수가 없습니다.")
+    return value
+
+
+def credentials(auth_json: str | None = None) -> service_account.Credentials:
+    """공유 자격 증명. 토큰이 없거나 만료됐을 때만 갱신한다."""
+    key = _auth_json(auth_json)
+    with _lock:
+        creds = _credentials.get(key)
+        if creds is None:
+            creds = service_account.Credentials.from_service_account_info(json.loads(key), scopes=SCOPES)
+            _credentials[key] = creds
+        if not creds.valid:
+            creds.refresh(Request())
+        return creds
+
+
+def bearer_headers(auth_json: str | None = None) -> dict[str, str]:
+    return {"Authorization": f"Bearer {credentials(auth_json).token}"}
+
+
+def authorized_session(auth_json: str | None = None) -> AuthorizedSession:
+    """토큰을 알아서 갱신하는 공유 HTTP 세션 (연결 풀 POOL_SIZE)."""
+    key = _auth_json(auth_json)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = AuthorizedSession(credentials(auth_json))
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+            _sessions[key] = session
+        return session
+
+
+def drive_media(file_id: str, auth_json: str | None = None, timeout: float = 60):
+    """Drive 파일 내용을 내려받은 requests.Response."""
+    return authorized_session(auth_json).get(DRIVE_MEDIA_URL.format(file_id), timeout=timeout)
+
+
+def gspread_client(auth_json: str | None = None) -> gspread.Client:
+    import gspread  # Drive만 쓰는 워크플로는 gspread를 설치하지 않는다
+
+    key = _auth_json(auth_json)
+    with _lock:
+        client = _gspread_clients.get(key)
+        if client is None:
+            client = gspread.authorize(credentials(auth_json))
+            _gspread_clients[key] = client
+        return client
+
+
+def _service(name: str, version: str, auth_json: str | None):
+    from googleapiclient.discovery import build  # 시트만 쓰는 수집기는 google-api-python-client를 설치하지 않는다
+
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = {}
+    key = (name, version, _auth_json(auth_json))
+    service = services.get(key)
+    if service is None:
+        service = build(name, version, credentials=credentials(auth_json), cache_discovery=False)
+        services[key] = service
+    return service
+
+
+def drive_service(auth_json: str | None = None):
+    """현재 스레드용 Drive v3 리소스."""
+    return _service("drive", "v3", auth_json)
+
+
+def sheets_service(auth_json: str | None = None):
+    """현재 스레드용 Sheets v4 리소스."""
+    return _service("sheets", "v4", auth_json)
@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import datetime
 import time
 import gc
@@ -11,8 +10,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import requests
 import gspread
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+
+import google_clients
+import rate_limiter
 
 
 def log(message: str) -> None:
@@ -116,18 +116,8 @@ TITLE_COLUMNS = [
 
 
 def get_google_clients():
-    if not AUTH_JSON_STR:
-        raise RuntimeError("GOOGLE_AUTH_JSON 환경변수가 없습니다.")
-
-    info = json.loads(AUTH_JSON_STR)
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = service_account.Credentials.from_service_account_info(info, scopes=scopes)
-    gspread_client = gspread.authorize(creds)
-    drive_service = build("drive", "v3", credentials=creds, cache_discovery=False)
-    return gspread_client, drive_service
+    """공유 인증으로 만든 (gspread 클라이언트, 현재 스레드용 Drive 서비스)."""
+    return google_clients.gspread_client(), google_clients.drive_service()
 
 
 def open_target_spreadsheet(gspread_client, category: str):
@@ -166,7 +156,7 @@ def fetch_data_chunk(category: str, url: str, start_date: str, end_date: str) ->
 
             log(f"   - [{category}] {start_date} ~ {end_date} | 키워드 '{KEYWORD}' | {page_no}p 요청")
             try:
-                response = session.get(url, params=params, timeout=60)
+                response = rate_limiter.get(url, params, timeout=60, session=session)
                 response.raise_for_status()
                 payload = response.json()
 
@@ -193,9 +183,8 @@ def fetch_data_chunk(category: str, url: str, start_date: str, end_date: str) ->
                     break
 
                 page_no += 1
-                time.sleep(0.25)
 
-            except requests.RequestException as exc:
+            except (requests.RequestException, rate_limiter.QuotaExceeded) as exc:
                 log(f"⚠️ [{category}] HTTP 요청 실패: {exc}")
                 break
             except (ValueError, TypeError, KeyError) as exc:
@@ -375,9 +364,6 @@ def process_category(category: str, url: str, date_chunks) -> None:
     except gspread.WorksheetNotFound:
         pass
 
-    offset = {"공사": 0, "물품": 2, "용역": 4}[category]
-    time.sleep(offset)
-
     collected_frames = []
 
     for start_date, end_date in date_chunks:
@@ -401,7 +387,6 @@ def process_category(category: str, url: str, date_chunks) -> None:
 
         del full_df, keyword_df
         gc.collect()
-        time.sleep(0.5)
 
     # 장기간 수집 시 매 구간마다 시트 전체를 다시 쓰지 않고 카테고리별 1회만 저장합니다.
     if collected_frames:
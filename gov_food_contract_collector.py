@@ -20,7 +20,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import math
 import os
 import time
@@ -31,9 +30,10 @@ from zoneinfo import ZoneInfo
 import gspread
 import pandas as pd
 import requests
-from google.oauth2.service_account import Credentials
 from gspread.exceptions import SpreadsheetNotFound, WorksheetNotFound
 
+import google_clients
+
 KST = ZoneInfo("Asia/Seoul")
 BASE_URL = "https://apis.data.go.kr/1230000/ao/CntrctInfoService"
 
@@ -320,13 +320,7 @@ def deduplicate(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def get_gspread_client() -> gspread.Client:
-    info = json.loads(AUTH_JSON)
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    credentials = Credentials.from_service_account_info(info, scopes=scopes)
-    return gspread.authorize(credentials)
+    return google_clients.gspread_client(AUTH_JSON)
 
 
 def open_target_worksheet(client: gspread.Client) -> gspread.Worksheet:
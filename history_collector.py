@@ -1,16 +1,11 @@
 import os
-import io
-import json
-import time
 import datetime
-import requests
-import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from googleapiclient.http import MediaIoBaseUpload
+
+import drive_archive
+import google_clients
+import shopping_mall
 
 
 # =================================================================================
@@ -19,9 +14,6 @@ from googleapiclient.http import MediaIoBaseUpload
 MY_DIRECT_KEY = os.environ.get('DATA_GO_KR_API_KEY')
 AUTH_JSON_STR = os.environ.get('GOOGLE_AUTH_JSON')
 
-# main.py의 SHOPPING_FOLDER_ID와 반드시 동일해야 같은 폴더/같은 {year}.csv에 쌓입니다.
-SHOPPING_FOLDER_ID = "1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr"
-
 # 국문 헤더 (총 39개 필드) - main.py의 HEADER_KOR와 동일
 HEADER_KOR = [
     '조달구분명', '계약구분명', '계약납품구분명', '계약납품요구일자', '계약납품요구번호', '변경차수', '최종변경차수여부',
@@ -54,25 +46,13 @@ keywords = sorted(list(set([
     "폐쇄형배전반",    "포장공사",    "폴리에틸렌전선관",    "풀박스",    "플러그용잭",    "피뢰탄기반",    "하드디스크드라이브",    "호온스피커"  
 ])))
 
-DEDUP_SUBSET = ["계약납품요구일자", "수요기관명", "품명", "금액"]
-
 
 # =================================================================================
 # 2. 유틸리티 함수
 # =================================================================================
-def get_drive_service_for_script():
-    """main.py와 동일한 Drive API 인증 방식 (gspread 아님)"""
-    info = json.loads(AUTH_JSON_STR)
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/drive"],
-    )
-    return build("drive", "v3", credentials=creds), creds
-
-
 def get_year_ranges(start_date_str, end_date_str):
     """YYYYMMDD ~ YYYYMMDD 구간을 연도 경계로 쪼갠 (year, s_date, e_date) 리스트 생성.
-    2026.csv 처럼 파일이 연도 단위이므로, 연도가 바뀌는 지점에서만 나눈다."""
+    파트는 연도 파일(2026.csv 등)로 압축되므로, 연도가 바뀌는 지점에서만 나눈다."""
     start = datetime.datetime.strptime(start_date_str, "%Y%m%d").date()
     end = datetime.datetime.strptime(end_date_str, "%Y%m%d").date()
     if start > end:
@@ -88,103 +68,13 @@ def get_year_ranges(start_date_str, end_date_str):
     return ranges
 
 
-def fetch_all_pages_data(keyword, start_date, end_date, retries=3):
-    """키워드별 전체 페이지 데이터 수집 (파라미터명 'type'으로 수정, 타임아웃 재시도 추가)"""
-    all_data = []
-    current_page = 1
-    while True:
-        url = "https://apis.data.go.kr/1230000/at/ShoppingMallPrdctInfoService/getSpcifyPrdlstPrcureInfoList"
-        params = {
-            'numOfRows': '999',
-            'pageNo': str(current_page),
-            'ServiceKey': MY_DIRECT_KEY,
-            'type': 'xml',  # main.py와 통일 (기존 'Type_A'는 오타로 추정)
-            'inqryDiv': '1',
-            'inqryPrdctDiv': '2',
-            'inqryBgnDate': start_date,
-            'inqryEndDate': end_date,
-            'dtilPrdctClsfcNoNm': keyword,
-        }
-
-        page_ok = False
-        for attempt in range(retries):
-            try:
-                res = requests.get(url, params=params, timeout=30)
-                if res.status_code == 200 and "<item>" in res.text:
-                    root = ET.fromstring(res.content)
-                    items = root.findall('.//item')
-                    for item in items:
-                        all_data.append([elem.text if elem.text else '' for elem in item])
-
-                    total_count_elem = root.find('.//totalCount')
-                    page_ok = True
-                    if total_count_elem is None or not items:
-                        return all_data
-                    total_count = int(total_count_elem.text)
-                    if len(all_data) >= total_count:
-                        return all_data
-                    break  # 다음 페이지로 진행
-                else:
-                    # 정상 응답이지만 item 없음 = 해당 페이지엔 데이터 없음 (정상 종료)
-                    page_ok = True
-                    return all_data
-            except requests.exceptions.Timeout:
-                wait = (attempt + 1) * 5
-                print(f"      ⏳ [{keyword}] p{current_page} 타임아웃 ({attempt + 1}/{retries}), {wait}초 후 재시도...")
-                time.sleep(wait)
-            except Exception as e:
-                print(f"      ❌ [{keyword}] p{current_page} 에러: {e}")
-                break
-
-        if not page_ok:
-            print(f"      ⚠️ [{keyword}] p{current_page} 최종 실패, 해당 키워드 이후 페이지 스킵 (데이터 유실 가능)")
-            break
-
-        current_page += 1
-        time.sleep(0.3)
-
-    return all_data
-
-
-def save_shopping_by_year(drive_service, creds, year, new_df):
-    """main.py PART 1과 동일한 방식: SHOPPING_FOLDER_ID 안의 {year}.csv 하나에 병합 저장"""
-    file_name = f"{year}.csv"
-    query = f"name='{file_name}' and '{SHOPPING_FOLDER_ID}' in parents and trashed=false"
-    res = drive_service.files().list(q=query, fields="files(id)").execute()
-    items = res.get("files", [])
-    file_id = items[0]["id"] if items else None
-
-    if file_id:
-        resp = requests.get(
-            f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media",
-            headers={"Authorization": f"Bearer {creds.token}"},
-        )
-        try:
-            old_df = pd.read_csv(io.BytesIO(resp.content), encoding="utf-8-sig", low_memory=False)
-            merged_df = pd.concat([old_df, new_df], ignore_index=True)
-        except Exception as e:
-            print(f"   ⚠️ 기존 {file_name} 읽기 오류, 신규 데이터만 사용: {e}")
-            merged_df = new_df
-    else:
-        merged_df = new_df
-
-    before = len(merged_df)
-    merged_df = merged_df.drop_duplicates(subset=DEDUP_SUBSET, keep="last")
-    removed = before - len(merged_df)
-
-    csv_bytes = merged_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-    media = MediaIoBaseUpload(io.BytesIO(csv_bytes), mimetype="text/csv")
-
-    if file_id:
-        drive_service.files().update(fileId=file_id, media_body=media).execute()
-    else:
-        drive_service.files().create(
-            body={"name": file_name, "parents": [SHOPPING_FOLDER_ID]},
-            media_body=media,
-        ).execute()
-        print(f"   🆕 {file_name} 신규 생성")
-
-    print(f"✅ [{year}] {file_name} 저장 완료 (신규수집 {len(new_df):,}건, 중복제거 {removed:,}건, 최종 {len(merged_df):,}건)")
+def save_shopping_range(s_date, e_date, new_df, failed=()):
+    """main.py PART 1과 같은 아카이브(drive_archive.SHOPPING)에 구간 파트 하나로 저장.
+    {year}.csv 전체를 다시 올리지 않으며, 파트는 연도 파일로 주기적으로 압축된다."""
+    label = f"{s_date}-{e_date}"
+    before = len(new_df)
+    rows = drive_archive.append(drive_archive.SHOPPING, label, new_df, incomplete=failed)
+    print(f"✅ [{label}] {drive_archive.SHOPPING.part_file(label)} 저장 완료 (신규수집 {before:,}건, 중복제거 {before - rows:,}건, 저장 {rows:,}건)")
 
 
 # =================================================================================
@@ -195,7 +85,7 @@ def main():
         print("❌ DATA_GO_KR_API_KEY 또는 GOOGLE_AUTH_JSON이 설정되지 않았습니다.")
         return
 
-    drive_service, drive_creds = get_drive_service_for_script()
+    google_clients.credentials()  # 인증 정보 확인 및 토큰 발급을 수집 전에 한 번
 
     start_date_env = os.environ.get('START_DATE')
     end_date_env = os.environ.get('END_DATE')
@@ -214,28 +104,22 @@ def main():
     for year, s_date, e_date in year_ranges:
         print(f"📅 [{year}년 / {s_date}~{e_date}] 수집 시작...")
 
+        # 키워드×페이지 단위로 한 풀에서 동시에 받는다 (shopping_mall.py)
+        shopping_rows, failed = shopping_mall.collect(MY_DIRECT_KEY, keywords, s_date, e_date)
         final_data = []
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {
-                executor.submit(fetch_all_pages_data, kw, s_date, e_date): kw
-                for kw in keywords
-            }
-            for future in as_completed(futures):
-                kw = futures[future]
-                try:
-                    data = future.result()
-                    if data:
-                        final_data.extend(data)
-                        print(f"   ✅ {kw}: {len(data)}건 수집")
-                except Exception as e:
-                    print(f"   ❌ {kw}: 수집 실패 - {e}")
+        for kw, data in shopping_rows.items():
+            if data:
+                final_data.extend(data)
+                print(f"   ✅ {kw}: {len(data)}건 수집")
+        for kw in sorted(failed):
+            print(f"   ❌ {kw}: 일부 또는 전체 수집 실패")
 
         if not final_data:
             print(f"   ⚠️ [{year}] 수집된 데이터 없음, 저장 스킵")
             continue
 
         new_df = pd.DataFrame(final_data, columns=HEADER_KOR)
-        save_shopping_by_year(drive_service, drive_creds, year, new_df)
+        save_shopping_range(s_date, e_date, new_df, failed)
 
 
 if __name__ == "__main__":
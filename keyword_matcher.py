@@ -0,0 +1,182 @@
+"""여러 키워드를 한 번에 찾는 Aho–Corasick 매처.
+
+키워드 목록(또는 {카테고리: 키워드 목록})으로 오토마톤을 한 번 만들어 두고,
+문자열을 한 번 훑어 카테고리·일치 키워드·위치를 함께 구한다. 키워드 수와 무관하게
+텍스트 길이에 비례하므로 "|".join 정규식이나 카테고리×키워드 반복보다 빠르고,
+키워드를 정규식이 아닌 글자 그대로 비교한다.
+
+classify()는 예전 classify_text와 같이 카테고리 정의 순서상 처음으로 일치한 카테고리를 돌려준다.
+Series API(contains/classify_series/scan_series)는 중복 값을 한 번씩만 계산한다.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Iterator, Mapping, NamedTuple
+
+import pandas as pd
+
+from unique_map import map_unique
+
+try:
+    import ahocorasick  # pyahocorasick: 같은 오토마톤의 C 구현
+except ImportError:  # 없으면 아래 순수 파이썬 DFA로 동작한다
+    ahocorasick = None
+
+
+class KeywordHits(NamedTuple):
+    category: str
+    keywords: list[str]
+    positions: list[tuple[int, str]]  # (시작 위치, 키워드), 텍스트 순서
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Mapping[str, Iterable[str]] | Iterable[str], ignore_case: bool = False, default: str = "기타"):
+        groups = keywords if isinstance(keywords, Mapping) else {default: keywords}
+        self.ignore_case = ignore_case
+        self.default = default
+        self.categories = list(groups)
+        self.keywords: list[str] = []
+
+        index_of: dict[str, int] = {}
+        self._keyword_masks: list[int] = []
+        for cat_index, words in enumerate(groups.values()):
+            for word in words:
+                key = self._fold(str(word))
+                if not key:
+                    continue
+                if key not in index_of:
+                    index_of[key] = len(self.keywords)
+                    self.keywords.append(str(word))
+                    self._keyword_masks.append(0)
+                self._keyword_masks[index_of[key]] |= 1 << cat_index
+        self._lengths = [len(key) for key in index_of]
+
+        # pyahocorasick이 있으면 순수 파이썬 DFA는 만들지 않는다
+        self._native = None
+        if ahocorasick is not None and self.keywords:
+            self._native = ahocorasick.Automaton()
+            for key, kw_index in index_of.items():
+                self._native.add_word(key, kw_index)
+            self._native.make_automaton()
+        else:
+            self._build_dfa(index_of)
+
+    def _build_dfa(self, index_of: dict[str, int]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        terminal: list[list[int]] = [[]]
+        masks = [0]
+        for key, kw_index in index_of.items():
+            node = 0
+            for ch in key:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = goto[node][ch] = len(goto)
+                    goto.append({})
+                    terminal.append([])
+                    masks.append(0)
+                node = nxt
+            terminal[node].append(kw_index)
+            masks[node] |= self._keyword_masks[kw_index]
+
+        # 실패 링크를 BFS로 만들고, 출력(키워드·카테고리 마스크)을 실패 링크 방향으로 합친다.
+        # 전이는 실패 링크를 미리 따라가 펼쳐 둔다(DFA): 글자 하나당 dict 조회 한 번이면 되고,
+        # 키워드에 없는 글자는 항상 루트로 간다.
+        fail = [0] * len(goto)
+        outputs: list[tuple[int, ...]] = [()] * len(goto)
+        delta: list[dict[str, int]] = [{}] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque()
+        for nxt in goto[0].values():
+            queue.append(nxt)
+            outputs[nxt] = tuple(terminal[nxt])
+        while queue:
+            node = queue.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            for ch, nxt in goto[node].items():
+                fail[nxt] = delta[fail[node]].get(ch, 0)
+                masks[nxt] |= masks[fail[nxt]]
+                outputs[nxt] = tuple(terminal[nxt]) + outputs[fail[nxt]]
+                queue.append(nxt)
+        self._delta = delta
+        self._masks = masks
+        self._outputs = outputs
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _iter_hits(self, text: str) -> Iterator[tuple[int, int]]:
+        if self._native is not None:
+            for end, kw_index in self._native.iter(self._fold(text)):
+                yield end - self._lengths[kw_index] + 1, kw_index
+            return
+        node = 0
+        delta, outputs = self._delta, self._outputs
+        for i, ch in enumerate(self._fold(text)):
+            node = delta[node].get(ch, 0)
+            for kw_index in outputs[node]:
+                yield i - self._lengths[kw_index] + 1, kw_index
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, str]]:
+        """(시작 위치, 키워드)를 끝 위치 순서대로 모두 생성한다. 겹치는 일치도 포함한다."""
+        for start, kw_index in self._iter_hits(text):
+            yield start, self.keywords[kw_index]
+
+    def category_mask(self, text: str) -> int:
+        """일치한 카테고리의 비트 마스크 (카테고리 정의 순서가 비트 순서)."""
+        if self._native is not None:
+            mask = 0
+            for _, kw_index in self._native.iter(self._fold(text)):
+                mask |= self._keyword_masks[kw_index]
+                if mask & 1:
+                    break
+            return mask
+        node = mask = 0
+        delta, masks = self._delta, self._masks
+        for ch in self._fold(text):
+            node = delta[node].get(ch, 0)
+            mask |= masks[node]
+            if mask & 1:  # 첫 카테고리가 나오면 더 볼 필요가 없다
+                break
+        return mask
+
+    def matches(self, text: str) -> bool:
+        if self._native is not None:
+            return next(self._native.iter(self._fold(text)), None) is not None
+        node = 0
+        delta, outputs = self._delta, self._outputs
+        for ch in self._fold(text):
+            node = delta[node].get(ch, 0)
+            if outputs[node]:
+                return True
+        return False
+
+    def _category(self, mask: int) -> str:
+        return self.categories[(mask & -mask).bit_length() - 1] if mask else self.default
+
+    def classify(self, text: str) -> str:
+        return self._category(self.category_mask(text))
+
+    def scan(self, text: str) -> KeywordHits:
+        """한 번 훑어 (카테고리, 일치 키워드 목록, 위치 목록)을 반환한다."""
+        hits = sorted(self._iter_hits(text))
+        mask = 0
+        for _, kw_index in hits:
+            mask |= self._keyword_masks[kw_index]
+        positions = [(start, self.keywords[kw_index]) for start, kw_index in hits]
+        keywords = list(dict.fromkeys(word for _, word in positions))
+        return KeywordHits(self._category(mask), keywords, positions)
+
+    # ── Series API ────────────────────────────────────────────────────────
+    def _map_unique(self, series: pd.Series, fn, missing) -> pd.Series:
+        out = map_unique(series, lambda value: fn(value) if isinstance(value, str) else missing)
+        return out.astype(bool) if isinstance(missing, bool) else out.astype(object)
+
+    def contains(self, series: pd.Series) -> pd.Series:
+        """str.contains("|".join(keywords), na=False)의 대체 (글자 그대로 비교)."""
+        return self._map_unique(series, self.matches, False)
+
+    def classify_series(self, series: pd.Series) -> pd.Series:
+        return self._map_unique(series, self.classify, self.default)
+
+    def scan_series(self, series: pd.Series) -> pd.Series:
+        return self._map_unique(series, self.scan, KeywordHits(self.default, [], []))
@@ -1,17 +1,15 @@
 import os
-import io
-import json
-import time
 import datetime
-import requests
 import threading
-import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
  
 import pandas as pd
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from googleapiclient.http import MediaIoBaseUpload
+ 
+import contract_query
+import drive_archive
+import google_clients
+from keyword_matcher import KeywordMatcher
+import shopping_mall
+from response_cache import cached_get
  
  
 # =================================================================================
@@ -20,9 +18,6 @@ from googleapiclient.http import MediaIoBaseUpload
 MY_DIRECT_KEY = os.environ.get("DATA_GO_KR_API_KEY")
 AUTH_JSON_STR = os.environ.get("GOOGLE_AUTH_JSON")
  
-NOTICE_FOLDER_ID = "1AsvVmayEmTtY92d1SfXxNi6bL0Zjw5mg"
-SHOPPING_FOLDER_ID = "1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr"
- 
 HEADER_KOR = [
     "조달구분명", "계약구분명", "계약납품구분명", "계약납품요구일자", "계약납품요구번호",
     "변경차수", "최종변경차수여부", "수요기관명", "수요기관구분명", "수요기관지역명",
@@ -42,6 +37,9 @@ CAT_KEYWORDS = {
     "드론":["드론", "무인기", "UAV", "UAS", "무인항공", "드론관제", "드론감시", "드론탐지"],
 }
  
+# 카테고리 분류용 오토마톤 (정의 순서가 우선순위, 대소문자 구분)
+CATEGORY_MATCHER = KeywordMatcher(CAT_KEYWORDS)
+ 
 CAT_META = {
     "영상감시장치": {
         "icon": "&#128247;", "accent": "#2d7dd2", "bg": "#eff6ff",
@@ -100,15 +98,6 @@ NOTICE_API_MAP = {
 # =================================================================================
 # 2. 유틸리티 함수
 # =================================================================================
-def get_drive_service_for_script():
-    info = json.loads(AUTH_JSON_STR)
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/drive"],
-    )
-    return build("drive", "v3", credentials=creds), creds
- 
- 
 def get_target_dates():
     """
     한국시간 기준 오늘 요일에 따라 수집 대상 날짜(들)를 반환.
@@ -131,10 +120,7 @@ def should_send_mail():
  
  
 def classify_text(text):
-    for cat, kws in CAT_KEYWORDS.items():
-        if any(kw in str(text) for kw in kws):
-            return cat
-    return "기타"
+    return CATEGORY_MATCHER.classify(str(text))
  
  
 def get_target_companies():
@@ -204,37 +190,6 @@ def format_html_table(data_list, title):
     return html
  
  
-def fetch_api_data_from_g2b(kw, d_str, retries=3):
-    url = "https://apis.data.go.kr/1230000/at/ShoppingMallPrdctInfoService/getSpcifyPrdlstPrcureInfoList"
-    params = {
-        "numOfRows": "999",
-        "pageNo": "1",
-        "ServiceKey": MY_DIRECT_KEY,
-        "type": "xml",
-        "inqryDiv": "1",
-        "inqryPrdctDiv": "2",
-        "inqryBgnDate": d_str,
-        "inqryEndDate": d_str,
-        "dtilPrdctClsfcNoNm": kw,
-    }
-    for attempt in range(retries):
-        try:
-            res = requests.get(url, params=params, timeout=60)
-            if res.status_code == 200 and "<item>" in res.text:
-                root = ET.fromstring(res.content)
-                return [[elem.text if elem.text else "" for elem in item] for item in root.findall(".//item")]
-            return []
-        except requests.exceptions.Timeout:
-            wait = (attempt + 1) * 5
-            print(f"[{kw}] 타임아웃 ({attempt + 1}/{retries}), {wait}초 후 재시도...")
-            time.sleep(wait)
-        except Exception as e:
-            print(f"[{kw}] 오류: {e}")
-            return []
-    print(f"[{kw}] 최종 실패")
-    return []
- 
- 
 def fetch_notice_data(category, url, d_str):
     params = {
         "serviceKey": MY_DIRECT_KEY,
@@ -246,7 +201,7 @@ def fetch_notice_data(category, url, d_str):
         "inqryEndDt": d_str + "2359",
     }
     try:
-        res = requests.get(url, params=params, timeout=15)
+        res = cached_get(url, params=params, timeout=15)
         if res.status_code == 200:
             return pd.DataFrame(res.json().get("response", {}).get("body", {}).get("items", []))
     except Exception:
@@ -254,73 +209,11 @@ def fetch_notice_data(category, url, d_str):
     return pd.DataFrame()
  
  
-def fetch_single_contract(kw_s, d_str):
-    api_url_servc = "https://apis.data.go.kr/1230000/ao/CntrctInfoService/getCntrctInfoListServcPPSSrch"
-    results = []
-    p = {
-        "serviceKey": MY_DIRECT_KEY,
-        "inqryDiv": "1",
-        "type": "xml",
-        "inqryBgnDate": d_str,
-        "inqryEndDate": d_str,
-        "cntrctNm": kw_s,
-    }
-    try:
-        r = requests.get(api_url_servc, params=p, timeout=20)
-        if r.status_code == 200:
-            root = ET.fromstring(r.content)
-            for item in root.findall(".//item"):
-                detail_url = item.findtext("cntrctDtlInfoUrl") or "https://www.g2b.go.kr"
-                raw_demand = item.findtext("dminsttList", "-")
-                clean_demand = raw_demand.replace("[", "").replace("]", "").split("^")[2] if "^" in raw_demand else raw_demand
-                raw_corp = item.findtext("corpList", "-")
-                clean_corp = raw_corp.replace("[", "").replace("]", "").split("^")[3] if "^" in raw_corp else raw_corp
-                results.append({
-                    "org": clean_demand,
-                    "nm": item.findtext("cntrctNm", "-"),
-                    "corp": clean_corp,
-                    "amt": item.findtext("totCntrctAmt", "0"),
-                    "url": detail_url,
-                })
-    except Exception as e:
-        print(f"계약 데이터 수집 오류 ({kw_s}): {e}")
-    return results
- 
- 
-def save_notice_by_year(drive_service, creds, cat_name, new_df, year):
-    file_name = f"나라장터_공고_{cat_name}_{year}년.csv"
-    res = drive_service.files().list(
-        q=f"name='{file_name}' and '{NOTICE_FOLDER_ID}' in parents and trashed=false",
-        fields="files(id)",
-    ).execute()
-    items = res.get("files", [])
-    file_id = items[0]["id"] if items else None
- 
-    if file_id:
-        resp = requests.get(
-            f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media",
-            headers={"Authorization": f"Bearer {creds.token}"},
-        )
-        try:
-            old_df = pd.read_csv(io.BytesIO(resp.content), encoding="utf-8-sig", low_memory=False)
-            new_df = pd.concat([old_df, new_df], ignore_index=True)
-        except Exception as e:
-            print(f"기존 파일 읽기 오류 ({file_name}): {e}")
- 
-    if "bidNtceNo" in new_df.columns:
-        new_df.drop_duplicates(subset=["bidNtceNo"], keep="last", inplace=True)
- 
-    csv_bytes = new_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-    media = MediaIoBaseUpload(io.BytesIO(csv_bytes), mimetype="text/csv")
- 
-    if file_id:
-        drive_service.files().update(fileId=file_id, media_body=media).execute()
-    else:
-        drive_service.files().create(
-            body={"name": file_name, "parents": [NOTICE_FOLDER_ID]},
-            media_body=media,
-        ).execute()
-    print(f"✅ [{cat_name}] {file_name} 저장 완료 ({len(new_df):,}건)")
+def save_notice_part(cat_name, new_df, d_str):
+    # 연도 파일 전체를 다시 올리지 않고 그날 치 파트만 추가한다 (drive_archive.py)
+    archive = drive_archive.notice_archive(cat_name)
+    rows = drive_archive.append(archive, d_str, new_df)
+    print(f"✅ [{cat_name}] {archive.part_file(d_str)} 저장 완료 ({rows:,}건)")
  
  
 def _bar_row(rank, label, pct, amount_str, bar_color, bar_bg, label_color="#374151", label_bold=False):
@@ -763,8 +656,9 @@ def main():
         display_date = f"{first_d} ~ {last_d}"
         weekday_str = "금~일, 주말 포함 통합"
  
-    drive_service, drive_creds = get_drive_service_for_script()
+    google_clients.credentials()  # 인증 정보 확인 및 토큰 발급을 수집 전에 한 번
     keywords_notice_all = [kw for sublist in CAT_KEYWORDS.values() for kw in sublist]
+    notice_matcher = KeywordMatcher(keywords_notice_all, ignore_case=True)
  
     target_companies = get_target_companies()
     normalized_target_companies = {normalize_company_name(name) for name in target_companies}
@@ -786,48 +680,18 @@ def main():
         # -------------------------------------------------------------------
         # PART 1: 종합쇼핑몰 3자단가 수집
         # -------------------------------------------------------------------
-        final_data = []
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {executor.submit(fetch_api_data_from_g2b, kw, d_str): kw for kw in keywords}
-            for future in as_completed(futures):
-                data = future.result()
-                if data:
-                    final_data.extend(data)
+        shopping_rows, failed = shopping_mall.collect(MY_DIRECT_KEY, keywords, d_str, d_str)
+        final_data = [row for rows in shopping_rows.values() for row in rows]
+        if failed:
+            # 실패한 키워드는 manifest의 파트에 표시되고, 같은 날짜로 다시 실행하면 파트를 덮어쓴다
+            print(f"⚠️ 종합쇼핑몰 {d_str}: 키워드 {len(failed)}개 일부 또는 전체 수집 실패 "
+                  f"({', '.join(sorted(failed))}) — 같은 날짜로 다시 실행해야 합니다")
  
         if final_data:
             new_df = pd.DataFrame(final_data, columns=HEADER_KOR)
-            d_year = d_str[:4]
- 
-            query = f"name='{d_year}.csv' and '{SHOPPING_FOLDER_ID}' in parents and trashed=false"
-            res = drive_service.files().list(q=query, fields="files(id)").execute()
-            items = res.get("files", [])
-            f_id = items[0]["id"] if items else None
- 
-            if f_id:
-                resp = requests.get(
-                    f"https://www.googleapis.com/drive/v3/files/{f_id}?alt=media",
-                    headers={"Authorization": f"Bearer {drive_creds.token}"},
-                )
-                old_df = pd.read_csv(io.BytesIO(resp.content), encoding="utf-8-sig", low_memory=False)
-                df_to_upload = pd.concat([old_df, new_df], ignore_index=True).drop_duplicates(
-                    subset=["계약납품요구일자", "수요기관명", "품명", "금액"],
-                    keep="last",
-                )
-                media = MediaIoBaseUpload(
-                    io.BytesIO(df_to_upload.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")),
-                    mimetype="text/csv",
-                )
-                drive_service.files().update(fileId=f_id, media_body=media).execute()
-            else:
-                media = MediaIoBaseUpload(
-                    io.BytesIO(new_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")),
-                    mimetype="text/csv",
-                )
-                drive_service.files().create(
-                    body={"name": f"{d_year}.csv", "parents": [SHOPPING_FOLDER_ID]},
-                    media_body=media,
-                ).execute()
-                print(f"✅ 종합쇼핑몰 {d_year}.csv 신규 생성 완료")
+            rows = drive_archive.append(drive_archive.SHOPPING, d_str, new_df, incomplete=failed)
+            status = " (일부 키워드 누락)" if failed else ""
+            print(f"✅ 종합쇼핑몰 {drive_archive.SHOPPING.part_file(d_str)} 저장 완료 ({rows:,}건){status}")
  
             for row in final_data:
                 org = str(row[7])
@@ -870,17 +734,15 @@ def main():
         # -------------------------------------------------------------------
         # PART 2: 나라장터 입찰 공고 수집
         # -------------------------------------------------------------------
-        d_year_int = int(d_str[:4])
         for cat_api, api_url in NOTICE_API_MAP.items():
             n_df = fetch_notice_data(cat_api, api_url, d_str)
             if not n_df.empty:
                 all_notice_count += len(n_df)
-                save_notice_by_year(drive_service, drive_creds, cat_api, n_df, d_year_int)
+                save_notice_part(cat_api, n_df, d_str)
  
-                pattern = "|".join(keywords_notice_all)
-                filtered = n_df[n_df["bidNtceNm"].str.contains(pattern, na=False, case=False)]
-                for _, row in filtered.iterrows():
-                    cat_found = classify_text(row["bidNtceNm"])
+                filtered = n_df[notice_matcher.contains(n_df["bidNtceNm"])]
+                categories = CATEGORY_MATCHER.classify_series(filtered["bidNtceNm"])
+                for (_, row), cat_found in zip(filtered.iterrows(), categories):
                     if cat_found in notice_mail_buckets:
                         notice_mail_buckets[cat_found].append({
                             "org": row.get("dminsttNm", "-"),
@@ -893,16 +755,8 @@ def main():
         # -------------------------------------------------------------------
         # PART 3: 나라장터 용역 계약 내역 수집
         # -------------------------------------------------------------------
-        collected_servc = []
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            futures = {
-                executor.submit(fetch_single_contract, kw_s, d_str): kw_s
-                for kw_s in keywords_notice_all
-            }
-            for future in as_completed(futures):
-                collected_servc.extend(future.result())
- 
-        unique_servc_list = list({f"{d['org']}_{d['nm']}": d for d in collected_servc}.values())
+        # 하루치 계약을 한 번에 받아 키워드로 거른다 (contract_query.py)
+        unique_servc_list = contract_query.fetch_day_contracts(MY_DIRECT_KEY, d_str, notice_matcher)
         for s in unique_servc_list:
             cat_found = classify_text(s["nm"])
             if cat_found in contract_mail_buckets:
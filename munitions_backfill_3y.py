@@ -3,13 +3,14 @@ import json
 import time
 import calendar
 from datetime import datetime
-import xml.etree.ElementTree as ET
 
 import requests
 import pandas as pd
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
+from xml_stream import iter_response_items, total_count
+
 # ========================================================
 # 환경 변수
 # ========================================================
@@ -112,14 +113,16 @@ def fetch_range_data(service, begin, end, max_retries=3):
             'pageNo': str(page_no),
         }
 
-        root = None
+        items = None
+        meta = {}
         for attempt in range(max_retries):
             try:
-                response = requests.get(service['url'], params=params, timeout=90)
-                if response.status_code != 200:
-                    print(f"    [오류] HTTP {response.status_code}")
-                    return all_items
-                root = ET.fromstring(response.content)
+                with requests.get(service['url'], params=params, timeout=90, stream=True) as response:
+                    if response.status_code != 200:
+                        print(f"    [오류] HTTP {response.status_code}")
+                        return all_items
+                    # 트리를 만들지 않고 item 단위로 스트리밍 파싱
+                    items = list(iter_response_items(response, meta, check_result=False))
                 break
             except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
                 wait = (attempt + 1) * 10
@@ -129,21 +132,17 @@ def fetch_range_data(service, begin, end, max_retries=3):
                 print(f"    [예외] {begin}~{end} 수집 중 오류: {e}")
                 return all_items
 
-        if root is None:
+        if items is None:
             print(f"    [실패] {begin}~{end} 최종 타임아웃, 이번 월은 건너뜁니다.")
             return all_items
 
-        items = root.findall('.//item')
         if not items:
             break
 
-        for item in items:
-            all_items.append({child.tag: child.text for child in item})
+        all_items.extend(items)
 
-        total_element = root.find('.//totalCount')
-        if total_element is not None:
-            total_count = int(total_element.text)
-            if len(all_items) >= total_count:
+        if meta.get('totalCount'):
+            if len(all_items) >= total_count(meta):
                 break
             page_no += 1
             time.sleep(0.5)
@@ -0,0 +1,38 @@
+"""군수품 수집기(발주계획·계약정보·입찰공고)의 논리 필드 ↔ 응답/시트 열 대응표.
+
+각 필드의 후보 열은 우선순위 순서이며, 실제 방위사업청 응답 필드와
+기존 한글 변환 필드를 함께 지원한다. 수집기는 이 표만 보고 키와 날짜를 만든다.
+"""
+from __future__ import annotations
+
+from procurement_common import FieldSchema
+
+PLAN_FIELDS = FieldSchema(
+    id=["dcsNo", "판단번호", "prcurePlanNo", "발주계획번호", "id"],
+    date=["orderPrearngeMt", "발주예정월", "demandYear", "요구년도"],
+    title=["reprsntPrdlstNm", "대표품목명", "사업명", "품명"],
+    agency=["ornt", "발주기관", "orntCode", "발주기관코드"],
+    amount=["budgetAmount", "예산금액", "예정가격"],
+)
+
+CONTRACT_FIELDS = FieldSchema(
+    id=["cntrctNo", "contractNo", "계약번호", "cntrctInfoId", "id", "dcsNo", "판단번호"],
+    date=["cntrctDate", "계약일자", "계약일", "contractDate"],
+    title=["cntrctNm", "계약명", "prdlstNm", "품명", "사업명"],
+    agency=["ornt", "발주기관", "dminsttNm", "수요기관"],
+    amount=["cntrctAmount", "계약금액", "totCntrctAmt", "총계약금액"],
+)
+
+# 국내 경쟁입찰공고
+NOTICE_FIELDS = FieldSchema(
+    g2b_id=["g2bPblancNo", "G2B공고번호"],
+    notice_id=["pblancNo", "공고번호", "bidPblancNo", "bidNtceNo", "입찰공고번호"],
+    decision_id=["dcsNo", "판단번호"],
+    order=["pblancOdr", "공고차수", "g2bPblancOdr", "G2B공고차수"],
+    agency_code=["orntCode", "발주기관코드"],
+    year=["demandYear", "요구년도"],
+    date=["pblancDate", "공고일자", "anmtDate", "bidNtceDate", "공고일"],
+    title=["bidNm", "입찰명", "bidPblancNm", "bidNtceNm", "공고명", "입찰공고명", "사업명"],
+    agency=["orntCode", "발주기관코드", "ornt", "발주기관", "dminsttNm", "수요기관"],
+    amount=["bsisPrdprc", "기초예가", "asignBdgtAmt", "배정예산", "presmptPrce", "추정가격", "기초예비가격"],
+)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import calendar
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import sheet_mirror
+from munitions_fields import PLAN_FIELDS
 from procurement_common import (
-    digits, fetch_paged, first_value, google_client, merge_rows,
-    read_existing, rewrite_single_sheet, stable_fallback_key,
+    CollectJournal, RowBatch, digits, fetch_paged, google_client, merge_rows,
+    read_snapshot, snapshot_rows, stable_fallback_key, write_sheet_delta,
 )
 
 API_URL = "https://apis.data.go.kr/1690000/PrcurePlanInfoService/getDmstcPrcurePlanList"
@@ -14,29 +17,34 @@ SPREADSHEET_NAME = "군수품조달_국내_발주계획"
 RETENTION_DAYS = int(os.environ.get("PROCUREMENT_RETENTION_DAYS", "365"))
 FULL_REFRESH = os.environ.get("PROCUREMENT_FULL_REFRESH", "false").lower() == "true"
 SEOUL = ZoneInfo("Asia/Seoul")
+FIELDS = PLAN_FIELDS
 
-ID_COLUMNS = ["dcsNo", "판단번호", "prcurePlanNo", "발주계획번호", "id"]
-DATE_COLUMNS = ["orderPrearngeMt", "발주예정월", "demandYear", "요구년도"]
-TITLE_COLUMNS = ["reprsntPrdlstNm", "대표품목명", "사업명", "품명"]
-AGENCY_COLUMNS = ["ornt", "발주기관", "orntCode", "발주기관코드"]
-AMOUNT_COLUMNS = ["budgetAmount", "예산금액", "예정가격"]
 
-
-def row_month(row: dict) -> str:
-    value = digits(first_value(row, DATE_COLUMNS))
+def month_of(value: str) -> str:
     if len(value) >= 6:
         return value[:6]
     return value[:4] + "01" if len(value) >= 4 else ""
 
 
-def row_key(row: dict) -> str:
-    identifier = first_value(row, ID_COLUMNS)
-    if identifier:
-        return f"id:{identifier}"
-    return stable_fallback_key([
-        first_value(row, TITLE_COLUMNS), first_value(row, AGENCY_COLUMNS),
-        row_month(row), digits(first_value(row, AMOUNT_COLUMNS)),
-    ])
+def row_month(row: dict) -> str:
+    return month_of(digits(FIELDS.get(row, "date")))
+
+
+def row_months(batch: RowBatch) -> list[str]:
+    return [month_of(value) for value in batch.field_digits("date")]
+
+
+def row_keys(batch: RowBatch) -> list[str]:
+    ids = batch.field("id")
+    if all(ids):
+        return [f"id:{identifier}" for identifier in ids]
+    titles, agencies = batch.field("title"), batch.field("agency")
+    months, amounts = row_months(batch), batch.field_digits("amount")
+    return [
+        f"id:{identifier}" if identifier
+        else stable_fallback_key([titles[i], agencies[i], months[i], amounts[i]])
+        for i, identifier in enumerate(ids)
+    ]
 
 
 def month_shift(year: int, month: int, delta: int) -> str:
@@ -49,6 +57,13 @@ def target_months(now, full: bool) -> list[str]:
     return [month_shift(now.year, now.month, -offset) for offset in range(count - 1, -1, -1)]
 
 
+def month_window(month: str) -> tuple[str, str]:
+    """YYYYMM을 저널 구간(다른 수집기와 같은 YYYY-MM-DD 시작·종료일)으로."""
+    year, mon = int(month[:4]), int(month[4:6])
+    first = date(year, mon, 1)
+    return first.isoformat(), first.replace(day=calendar.monthrange(year, mon)[1]).isoformat()
+
+
 def fetch_month(month: str) -> list[dict]:
     return fetch_paged(API_URL, {"orderPrearngeMtBegin": month, "orderPrearngeMtEnd": month})
 
@@ -56,25 +71,36 @@ def fetch_month(month: str) -> list[dict]:
 def main() -> None:
     today = datetime.now(SEOUL).date()
     client = google_client()
-    sheet = client.open(SPREADSHEET_NAME).get_worksheet(0)
-    existing = read_existing(sheet)
+    spreadsheet = client.open(SPREADSHEET_NAME)
+    sheet = spreadsheet.get_worksheet(0)
+    snapshot = read_snapshot(sheet, spreadsheet)
+    existing = snapshot_rows(snapshot)
     full = FULL_REFRESH or not existing
 
-    fresh = []
     print(f"모드: {'최근 1년 전체 재수집' if full else '현재월·직전월 증분 갱신'}")
-    for month in target_months(today, full):
+    journal = CollectJournal(SPREADSHEET_NAME)
+    months = target_months(today, full)
+    for month in months:
+        window = month_window(month)
+        if journal.is_done(*window):
+            print(f"=== 발주계획 {month}: 체크포인트 재사용 ===")
+            continue
         batch = fetch_month(month)
-        fresh.extend(batch)
+        journal.record(*window, batch)
         print(f"=== 발주계획 {month}: {len(batch):,}건 ===")
+    fresh = journal.rows(month_window(months[0])[0], month_window(months[-1])[1])
 
     cutoff = (today - timedelta(days=RETENTION_DAYS)).strftime("%Y%m")
     final_rows = merge_rows(
         [] if full else existing,
         fresh,
-        row_key,
-        lambda row: not row_month(row) or row_month(row) >= cutoff,
+        row_keys,
+        lambda batch: [not month or month >= cutoff for month in row_months(batch)],
+        FIELDS,
     )
-    rewrite_single_sheet(sheet, final_rows, row_month)
+    matrix = write_sheet_delta(sheet, snapshot, final_rows, row_keys, row_month, FIELDS)
+    sheet_mirror.save(spreadsheet, sheet, matrix)
+    journal.clear()
     print(f"완료: API {len(fresh):,}건 / 중복 제거 후 {len(final_rows):,}건")
 
 
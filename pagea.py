@@ -1,21 +1,13 @@
 import streamlit as st
-import json
-import requests
-from google.oauth2 import service_account
-import google.auth.transport.requests
-from googleapiclient.discovery import build
 import pandas as pd
 import io
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 
-st.title("📢 나라장터 공고")
+import drive_archive
+from unique_map import map_unique
 
-NOTICE_FOLDER_ID = "1AsvVmayEmTtY92d1SfXxNi6bL0Zjw5mg"
-SCOPES = [
-    'https://www.googleapis.com/auth/drive.readonly',
-    'https://www.googleapis.com/auth/spreadsheets.readonly'
-]
+st.title("📢 나라장터 공고")
 
 # 영어 컬럼 → 한글 매핑
 COL_RENAME = {
@@ -27,52 +19,21 @@ COL_RENAME = {
 }
 DISPLAY_COLS = list(COL_RENAME.values()) + ["공고유형"]
 
-@st.cache_resource
-def get_notice_drive_service():
-    info  = json.loads(st.secrets["GOOGLE_AUTH_JSON"])
-    creds = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
-    return build('drive', 'v3', credentials=creds), creds
-
 @st.cache_data(ttl=3600)
-def fetch_notice_csv_by_year(cat_name, year):
-    svc, creds = get_notice_drive_service()
-    creds.refresh(google.auth.transport.requests.Request())
-    hdrs = {'Authorization': f'Bearer {creds.token}'}
-
-    file_name = f"나라장터_공고_{cat_name}_{year}년.csv"
-    files = svc.files().list(
-        q=f"name='{file_name}' and '{NOTICE_FOLDER_ID}' in parents and trashed=false",
-        fields='files(id, name)'
-    ).execute().get('files', [])
-
-    if not files:
-        return pd.DataFrame()
-
-    resp = requests.get(
-        f"https://www.googleapis.com/drive/v3/files/{files[0]['id']}?alt=media",
-        headers=hdrs
-    )
-    try:
-        return pd.read_csv(io.BytesIO(resp.content), encoding='utf-8-sig', low_memory=False)
-    except Exception:
-        return pd.read_csv(io.BytesIO(resp.content), encoding='cp949', low_memory=False)
+def fetch_notice_range(cat_name, s_s, e_s):
+    # 공고일시가 기간 안인 행만 읽는다: 기간 밖의 연도·일별 파트·row group은 받지 않는다 (drive_archive.py)
+    return drive_archive.read_notice(cat_name, s_s, e_s, auth_json=st.secrets["GOOGLE_AUTH_JSON"])
 
 def load_notice_data(cat_name, s_s, e_s):
-    start_year = int(s_s[:4])
-    end_year   = int(e_s[:4])
-    dfs = []
-    for year in range(start_year, end_year + 1):
-        df_y = fetch_notice_csv_by_year(cat_name, year)
-        if not df_y.empty:
-            dfs.append(df_y)
-    if not dfs:
+    df = fetch_notice_range(cat_name, s_s, e_s)
+    if df.empty:
         return pd.DataFrame()
-    df = pd.concat(dfs, ignore_index=True)
+    df = df.copy()
     if 'bidNtceDt' in df.columns:
         df['tmp_dt'] = df['bidNtceDt'].astype(str).str.replace(r'[^0-9]', '', regex=True).str[:8]
     else:
         df['tmp_dt'] = "0"
-    return df[(df['tmp_dt'] >= s_s) & (df['tmp_dt'] <= e_s)].copy()
+    return df
 
 NOTICE_CATS = ['공사', '물품', '용역']
 
@@ -151,7 +112,7 @@ if search_exe:
                             return f"{int(float(str(v).replace(',', ''))):,}"
                         except:
                             return v
-                    df_f['추정가격'] = df_f['추정가격'].apply(fmt_price)
+                    df_f['추정가격'] = map_unique(df_f['추정가격'], fmt_price)
 
                 # ── 키워드 검색 ──
                 if k1_val and k1_val.strip():
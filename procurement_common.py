@@ -1,44 +1,57 @@
 """공공데이터 API/Google Sheets 수집기 공통 유틸리티."""
 from __future__ import annotations
 
+import functools
 import hashlib
-import json
 import os
 import random
 import time
-import xml.etree.ElementTree as ET
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Sequence
 
 import gspread
 import requests
-from oauth2client.service_account import ServiceAccountCredentials
+from requests.adapters import HTTPAdapter
+
+import google_clients
+import sheet_mirror
+from collect_journal import CollectJournal
+from rate_limiter import MAX_CONCURRENCY, QuotaExceeded
+from response_cache import cached_get
+from xml_stream import iter_response_items, total_count
 
 SERVICE_KEY = os.environ["DATA_GO_KR_API_KEY"]
-GOOGLE_AUTH_JSON = os.environ["GOOGLE_AUTH_JSON"]
 PAGE_SIZE = int(os.environ.get("PROCUREMENT_PAGE_SIZE", "500"))
 REQUEST_TIMEOUT = int(os.environ.get("PROCUREMENT_REQUEST_TIMEOUT", "90"))
+# 날짜 구간 워커 수. 구간마다 fetch_paged가 페이지용 스레드를 MAX_CONCURRENCY개까지 더 띄우므로
+# (최대 MAX_WORKERS × MAX_CONCURRENCY 스레드) 예전 기본값 3, 상한 4를 유지한다.
+# 실제 동시 요청 수와 속도는 rate_limiter가 엔드포인트별로 제한한다.
 MAX_WORKERS = max(1, min(4, int(os.environ.get("PROCUREMENT_MAX_WORKERS", "3"))))
+# 적응형 날짜 구간 하나가 넘지 않도록 하는 페이지 수 (PAGE_SIZE 단위)
+WINDOW_PAGES = max(1, int(os.environ.get("PROCUREMENT_WINDOW_PAGES", "4")))
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENCY))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENCY))
 
 
 def google_client():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(json.loads(GOOGLE_AUTH_JSON), scope)
-    return gspread.authorize(creds)
+    return google_clients.gspread_client()
 
 
-def request_xml(url: str, params: dict, max_retries: int = 5) -> ET.Element:
+def request_xml(url: str, params: dict, max_retries: int = 5) -> tuple[list[dict[str, str]], int]:
+    """한 페이지를 스트리밍으로 읽어 (item 목록, totalCount)를 반환한다."""
     last_error: Exception | None = None
     for attempt in range(1, max_retries + 1):
         try:
-            response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-            code = root.findtext(".//resultCode")
-            if code and code not in {"00", "0"}:
-                raise RuntimeError(f"API {code}: {root.findtext('.//resultMsg') or '오류'}")
-            return root
+            with cached_get(url, params, REQUEST_TIMEOUT, session=_session, stream=True) as response:
+                response.raise_for_status()
+                meta: dict = {}
+                items = list(iter_response_items(response, meta))
+            return items, total_count(meta, len(items))
+        except QuotaExceeded:
+            raise
         except Exception as exc:  # 네트워크/XML/API 오류를 동일한 백오프로 처리
             last_error = exc
             if attempt == max_retries:
@@ -50,23 +63,31 @@ def request_xml(url: str, params: dict, max_retries: int = 5) -> ET.Element:
 
 
 def fetch_paged(url: str, base_params: dict) -> list[dict[str, str]]:
-    items: list[dict[str, str]] = []
-    page = 1
-    while True:
-        params = {**base_params, "serviceKey": SERVICE_KEY, "numOfRows": str(PAGE_SIZE), "pageNo": str(page)}
-        root = request_xml(url, params)
-        page_items = root.findall(".//item")
-        if not page_items:
-            break
-        items.extend({child.tag: child.text or "" for child in item} for item in page_items)
-        total = int(root.findtext(".//totalCount") or len(items))
-        if len(items) >= total:
-            break
-        page += 1
-        time.sleep(0.25)
+    """1페이지에서 totalCount를 읽고 나머지 페이지는 공용 세션으로 동시에 받는다."""
+    def page_params(page: int) -> dict:
+        return {**base_params, "serviceKey": SERVICE_KEY, "numOfRows": str(PAGE_SIZE), "pageNo": str(page)}
+
+    items, total = request_xml(url, page_params(1))
+    if not items:
+        return items
+    # 서버가 numOfRows를 더 작게 잘라 주는 경우에도 페이지 수를 맞춘다.
+    per_page = min(PAGE_SIZE, len(items)) if len(items) < total else PAGE_SIZE
+    last_page = -(-total // per_page)
+    if last_page <= 1:
+        return items
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, last_page - 1)) as executor:
+        pages = executor.map(lambda page: request_xml(url, page_params(page))[0], range(2, last_page + 1))
+        for page_items in pages:  # map은 페이지 순서를 유지한다
+            items.extend(page_items)
     return items
 
 
+def count_rows(url: str, base_params: dict) -> int:
+    """numOfRows=1로 호출해 조건에 해당하는 전체 건수만 확인한다."""
+    _, total = request_xml(url, {**base_params, "serviceKey": SERVICE_KEY, "numOfRows": "1", "pageNo": "1"})
+    return total
+
+
 def first_value(row: dict, candidates: Iterable[str]) -> str:
     for key in candidates:
         value = row.get(key)
@@ -84,22 +105,139 @@ def stable_fallback_key(parts: Iterable[str]) -> str:
     return "fallback:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
 
 
-def read_existing(sheet) -> list[dict[str, str]]:
-    values = sheet.get_all_values()
+def read_snapshot(sheet, spreadsheet=None) -> list[list[str]]:
+    """시트 값을 헤더 포함, 시트 행 순서 그대로 읽는다.
+
+    spreadsheet를 넘기면 시트와 버전이 같은 로컬 미러(sheet_mirror)를 먼저 쓴다.
+    """
+    if spreadsheet is not None:
+        mirrored = sheet_mirror.load(spreadsheet, sheet)
+        if mirrored is not None:
+            return mirrored
+    return sheet.get_all_values()
+
+
+def snapshot_rows(values: list[list[str]]) -> list[dict[str, str]]:
     if len(values) < 2:
         return []
     headers = values[0]
     return [dict(zip(headers, row)) for row in values[1:] if any(row)]
 
 
-def merge_rows(existing: list[dict], fresh: list[dict], key_fn: Callable[[dict], str], keep_fn: Callable[[dict], bool]) -> list[dict]:
+def read_existing(sheet) -> list[dict[str, str]]:
+    return snapshot_rows(read_snapshot(sheet))
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_accessor(headers: tuple[str, ...], candidates: tuple[str, ...], positional: bool = False) -> Callable:
+    """헤더 구성 하나에 대해 후보 열 목록을 미리 해석한 접근기를 만든다.
+
+    접근기는 first_value(row, candidates)와 같은 값을 돌려준다. positional이면
+    행을 headers 순서의 값 목록으로, 아니면 dict로 받는다.
+    """
+    present = [name for name in candidates if name in headers]
+    slots = [headers.index(name) for name in present] if positional else present
+    if not slots:
+        return lambda row: ""
+    if len(slots) == 1:
+        slot = slots[0]
+
+        def get_one(row) -> str:
+            value = row[slot]
+            return str(value).strip() if value not in (None, "") else ""
+        return get_one
+
+    def get_first(row) -> str:
+        for slot in slots:
+            value = row[slot]
+            if value not in (None, ""):
+                return str(value).strip()
+        return ""
+    return get_first
+
+
+class FieldSchema:
+    """논리 필드(id·date·title·agency·amount 등)와 후보 열 목록의 대응표."""
+
+    def __init__(self, **fields: Iterable[str]):
+        self.fields = {name: tuple(columns) for name, columns in fields.items()}
+
+    def __getitem__(self, name: str) -> tuple[str, ...]:
+        return self.fields[name]
+
+    def compile(self, headers: Sequence[str], positional: bool = True) -> dict[str, Callable]:
+        """헤더 구성에 맞춘 필드별 접근기. 같은 헤더는 캐시된 접근기를 재사용한다."""
+        headers = tuple(headers)
+        return {name: compile_accessor(headers, columns, positional) for name, columns in self.fields.items()}
+
+    def get(self, row: dict, name: str) -> str:
+        return first_value(row, self.fields[name])
+
+
+class RowBatch:
+    """행 묶음을 열 단위로 읽는 접근기.
+
+    dict 행은 같은 헤더 구성끼리 묶고, headers를 넘기면 모든 행을 그 순서의 값 목록으로 본다.
+    후보 열은 헤더 구성마다 compile_accessor로 한 번만 해석하고 계산한 열은 캐시한다.
+    column(candidates)[i]는 first_value(rows[i], candidates)와 같다.
+    """
+
+    def __init__(self, rows: list, schema: FieldSchema | None = None, headers: Sequence[str] | None = None):
+        self.rows = rows
+        self.schema = schema
+        self.positional = headers is not None
+        if self.positional:
+            self.groups: dict[tuple, list[int]] = {tuple(headers): list(range(len(rows)))}
+        else:
+            self.groups = {}
+            for index, row in enumerate(rows):
+                self.groups.setdefault(tuple(row), []).append(index)
+        self._columns: dict[tuple, list[str]] = {}
+        self._digits: dict[tuple, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, candidates: Iterable[str]) -> list[str]:
+        key = tuple(candidates)
+        if key in self._columns:
+            return self._columns[key]
+        rows = self.rows
+        out = [""] * len(rows)
+        for headers, indexes in self.groups.items():
+            get = compile_accessor(headers, key, self.positional)
+            for index in indexes:
+                out[index] = get(rows[index])
+        self._columns[key] = out
+        return out
+
+    def digits(self, candidates: Iterable[str]) -> list[str]:
+        """column()에 digits()를 적용한 열. 반복되는 값(날짜 등)은 한 번만 계산한다."""
+        key = tuple(candidates)
+        if key not in self._digits:
+            memo: dict[str, str] = {}
+            self._digits[key] = [
+                memo[value] if value in memo else memo.setdefault(value, digits(value)) for value in self.column(key)
+            ]
+        return self._digits[key]
+
+    def field(self, name: str) -> list[str]:
+        return self.column(self.schema[name])
+
+    def field_digits(self, name: str) -> list[str]:
+        return self.digits(self.schema[name])
+
+
+def merge_rows(
+    existing: list[dict], fresh: list[dict],
+    keys_fn: Callable[[RowBatch], list[str]], keep_fn: Callable[[RowBatch], list[bool]],
+    schema: FieldSchema | None = None,
+) -> list[dict]:
+    """키/보존 여부를 열 단위로 한 번에 계산한 뒤 키 기준 해시 조인으로 upsert한다."""
     merged: dict[str, dict] = {}
-    for row in existing:
-        if keep_fn(row):
-            merged[key_fn(row)] = row
-    for row in fresh:  # 최신 API 값이 기존 시트 값을 덮어씀
-        if keep_fn(row):
-            merged[key_fn(row)] = row
+    for rows in (existing, fresh):  # 최신 API 값이 기존 시트 값을 덮어씀
+        batch = RowBatch(rows, schema)
+        merged.update((key, row) for key, row, keep in zip(keys_fn(batch), rows, keep_fn(batch)) if keep)
     return list(merged.values())
 
 
@@ -114,12 +252,13 @@ def ordered_headers(rows: list[dict]) -> list[str]:
     return headers
 
 
-def rewrite_single_sheet(sheet, rows: list[dict], sort_key: Callable[[dict], str]) -> None:
+def rewrite_single_sheet(sheet, rows: list[dict], sort_key: Callable[[dict], str]) -> list[list[str]]:
     headers = ordered_headers(rows)
     sheet.clear()
     if not headers:
-        sheet.update(range_name="A1", values=[["_조회결과"], ["0건"]], value_input_option="RAW")
-        return
+        empty = [["_조회결과"], ["0건"]]
+        sheet.update(range_name="A1", values=empty, value_input_option="RAW")
+        return empty
     rows.sort(key=sort_key, reverse=True)
     matrix = [headers] + [[row.get(header, "") for header in headers] for row in rows]
     if sheet.row_count < len(matrix) or sheet.col_count < len(headers):
@@ -129,6 +268,66 @@ def rewrite_single_sheet(sheet, rows: list[dict], sort_key: Callable[[dict], str
     for start in range(5000, len(matrix), 5000):
         end = min(start + 5000, len(matrix))
         sheet.update(range_name=f"A{start + 1}", values=matrix[start:end], value_input_option="RAW")
+    return matrix
+
+
+def write_sheet_delta(
+    sheet, snapshot: list[list[str]], rows: list[dict],
+    keys_fn: Callable[[RowBatch], list[str]], sort_key: Callable[[dict], str], schema: FieldSchema | None = None,
+) -> list[list[str]]:
+    """rewrite_single_sheet와 같은 최신순 행렬을 만들고, 시트 스냅샷과 행 단위로 비교해
+    바뀐 행만 values.batchUpdate로 반영한다.
+
+    같은 row_key(keys_fn)의 행은 마지막 것만 남기고 sort_key 역순(최신순)으로 정렬한다.
+    행 위치가 같고 값도 같으면 건너뛰고, 연속으로 바뀐 행은 한 범위로 묶어 쓴 뒤 줄어든 꼬리 행을 지운다.
+    시트가 비어 있거나 헤더 구성이 달라졌으면 rewrite_single_sheet로 전체를 다시 쓴다.
+    반환값은 반영 후 시트와 같은 [헤더] + 행 행렬이다.
+    """
+    headers = ordered_headers(rows)
+    if not headers or not snapshot or snapshot[0][:len(headers)] != headers or any(snapshot[0][len(headers):]):
+        return rewrite_single_sheet(sheet, rows, sort_key)
+
+    width = len(headers)
+    old = [row[:width] + [""] * (width - len(row)) for row in snapshot[1:]]
+    unique = dict(zip(keys_fn(RowBatch(rows, schema)), rows))
+    ordered = sorted(unique.values(), key=sort_key, reverse=True)
+    target = [[row.get(header, "") for header in headers] for row in ordered]
+    changed = [
+        (index, values) for index, values in enumerate(target)
+        if index >= len(old) or values != old[index]
+    ]
+    matrix = [headers] + target
+
+    if sheet.row_count < len(target) + 1:
+        sheet.resize(rows=len(target) + 1)
+    # 연속된 행은 하나의 범위로 묶고, 요청 하나가 5천 행을 넘지 않게 나눈다.
+    data: list[dict] = []
+    batch_rows = 0
+    for index, values in changed:
+        row_no = index + 2
+        if data and data[-1]["end"] == row_no - 1 and len(data[-1]["values"]) < 5000:
+            data[-1]["values"].append(values)
+            data[-1]["end"] = row_no
+        else:
+            data.append({"start": row_no, "end": row_no, "values": [values]})
+    ranges: list[dict] = []
+    for block in data:
+        ranges.append({
+            "range": f"A{block['start']}:{gspread.utils.rowcol_to_a1(block['end'], width)}",
+            "values": block["values"],
+        })
+        batch_rows += len(block["values"])
+        if batch_rows >= 5000:
+            sheet.batch_update(ranges, value_input_option="RAW")
+            ranges, batch_rows = [], 0
+    if ranges:
+        sheet.batch_update(ranges, value_input_option="RAW")
+    removed = len(old) - len(target)
+    if removed > 0:
+        last_col = gspread.utils.rowcol_to_a1(1, max(width, len(snapshot[0]))).rstrip("0123456789")
+        sheet.batch_clear([f"A{len(target) + 2}:{last_col}{len(old) + 1}"])
+    print(f"시트 반영: 변경·추가 {len(changed):,}행 / 삭제 {max(0, removed):,}행 (전체 {len(target):,}행)")
+    return matrix
 
 
 def date_chunks(start: date, end: date, days: int) -> list[tuple[date, date]]:
@@ -141,13 +340,67 @@ def date_chunks(start: date, end: date, days: int) -> list[tuple[date, date]]:
     return chunks
 
 
-def parallel_collect(chunks, fetch_fn: Callable, label: str) -> list[dict]:
+def adaptive_chunks(
+    start: date, end: date, count_fn: Callable[[date, date], int], seed_days: int = 30, budget: int | None = None,
+) -> list[tuple[date, date]]:
+    """건수(totalCount)를 기준으로 날짜 구간을 나누고 합쳐 작업량이 고른 구간 목록을 만든다.
+
+    budget(기본 PAGE_SIZE * WINDOW_PAGES)을 넘는 구간은 반으로 나누고,
+    작은 구간은 이웃과 합친다. 큰 구간부터 처리되도록 건수 내림차순으로 반환한다.
+    """
+    budget = budget or PAGE_SIZE * WINDOW_PAGES
+    seeds = date_chunks(start, end, seed_days)
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(seeds) or 1)) as executor:
+        counts = list(executor.map(lambda chunk: count_fn(*chunk), seeds))
+        pending = [(s, e, n) for (s, e), n in zip(seeds, counts)]
+        done: list[tuple[date, date, int]] = []
+        while pending:
+            # 한 단계씩 나눌 구간의 왼쪽 절반만 동시에 조회하고, 오른쪽은 차감으로 구한다.
+            oversized = [(s, e, n) for s, e, n in pending if n > budget and s < e]
+            done.extend((s, e, n) for s, e, n in pending if not (n > budget and s < e))
+            halves = [(s, s + (e - s) // 2, e, n) for s, e, n in oversized]
+            lefts = list(executor.map(lambda half: count_fn(half[0], half[1]), halves))
+            pending = []
+            for (s, mid, e, n), left in zip(halves, lefts):
+                pending.append((s, mid, left))
+                pending.append((mid + timedelta(days=1), e, max(0, n - left)))
+    done.sort()
+    merged: list[tuple[date, date, int]] = []
+    for s, e, n in done:
+        if merged and merged[-1][2] + n <= budget:
+            prev_s, _, prev_n = merged[-1]
+            merged[-1] = (prev_s, e, prev_n + n)
+        else:
+            merged.append((s, e, n))
+    merged.sort(key=lambda chunk: chunk[2], reverse=True)
+    total = sum(n for _, _, n in merged)
+    print(f"구간 계획: {len(merged)}개 구간 / 예상 {total:,}건 (구간당 최대 {budget:,}건 목표)")
+    return [(s, e) for s, e, _ in merged]
+
+
+def parallel_collect(chunks, fetch_fn: Callable, label: str, journal: CollectJournal | None = None) -> list[dict]:
+    """구간별로 동시에 수집한다. journal을 넘기면 끝난 구간마다 행을 체크포인트로 기록한다."""
     results: list[dict] = []
     with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks) or 1)) as executor:
         futures = {executor.submit(fetch_fn, start, end): (start, end) for start, end in chunks}
         for future in as_completed(futures):
             start, end = futures[future]
             batch = future.result()
+            if journal is not None:
+                journal.record(start.isoformat(), end.isoformat(), batch)
             print(f"=== {label} {start:%Y%m%d}~{end:%Y%m%d}: {len(batch):,}건 ===")
             results.extend(batch)
     return results
+
+
+def collect_resumable(
+    journal: CollectJournal, start: date, end: date,
+    count_fn: Callable[[date, date], int], fetch_fn: Callable, label: str, seed_days: int = 30,
+) -> list[dict]:
+    """저널에 없는 날짜 구간만 적응형으로 나눠 수집하고 [start, end]의 저널 행 전체를 반환한다."""
+    missing = journal.missing_ranges(start, end)
+    if missing != [(start, end)]:
+        print(f"체크포인트: 이전 실행에서 끝난 구간은 건너뛰고 남은 {len(missing)}개 구간만 수집")
+    chunks = [chunk for s, e in missing for chunk in adaptive_chunks(s, e, count_fn, seed_days)]
+    parallel_collect(chunks, fetch_fn, label, journal)
+    return journal.rows(start.isoformat(), end.isoformat())
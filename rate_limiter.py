@@ -0,0 +1,290 @@
+"""data.go.kr 호출이 모두 공유하는 프로세스 단위 속도 제한기와 일일 호출량 집계.
+
+(인증키, 엔드포인트)마다 토큰 버킷과 동시 요청 상한을 두고, 모든 실제 네트워크 호출은
+get()을 거친다(response_cache.cached_get도 캐시 미스일 때만 여기로 온다).
+429/5xx, 타임아웃 또는 resultCode 처리 지연 코드를 받으면 속도와 동시 요청 수를 절반으로
+줄이고, 성공할 때마다 조금씩 되돌린다(AIMD). 코드 22(요청 한도 초과, 게이트웨이 오류는
+returnReasonCode로 온다)를 받거나 API_DAILY_QUOTA에 도달하면 그날 그 엔드포인트 호출을
+QuotaExceeded로 바로 막는다.
+
+일일 사용량은 한국시간 날짜별로 .cache/api_quota.sqlite3에 누적해
+워크플로 실행 간에도 남은 한도를 보고한다. 인증키는 해시 앞 8자리만 저장한다.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import requests
+
+QUOTA_PATH = os.environ.get("API_QUOTA_PATH", os.path.join(".cache", "api_quota.sqlite3"))
+# 엔드포인트별 초당 요청 수 상한과 동시 요청 상한. 실제 속도는 응답에 따라 이 아래에서 조정된다.
+MAX_RATE = max(0.1, float(os.environ.get("API_RATE_PER_SEC", os.environ.get("PROCUREMENT_RATE_PER_SEC", "10"))))
+MIN_RATE = min(MAX_RATE, max(0.05, float(os.environ.get("API_MIN_RATE_PER_SEC", "0.5"))))
+MAX_CONCURRENCY = max(1, int(os.environ.get("API_CONCURRENCY", os.environ.get("PROCUREMENT_HOST_CONCURRENCY", "6"))))
+# 엔드포인트별 일일 호출 한도. 0이면 한도를 걸지 않고 사용량만 집계한다.
+DAILY_QUOTA = max(0, int(os.environ.get("API_DAILY_QUOTA", "0")))
+
+THROTTLE_CODES = {"04", "05"}  # HTTP_ERROR, SERVICE_TIMEOUT_ERROR
+QUOTA_CODES = {"22"}  # LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR
+# 게이트웨이 오류(OpenAPI_ServiceResponse)는 resultCode 대신 cmmMsgHeader/returnReasonCode로 온다
+_RESULT_CODE = re.compile(rb"(?:resultCode|returnReasonCode)[\"'>:\s]*\"?(\w+)")
+STREAM_PEEK_BYTES = 64 * 1024
+_KEY_PARAMS = {"servicekey"}
+KST = timezone(timedelta(hours=9))
+
+
+class QuotaExceeded(RuntimeError):
+    """일일 호출 한도를 다 써서 더 호출해도 소용없는 경우."""
+
+
+def result_code(content: bytes | None) -> str | None:
+    """XML/JSON 응답 앞부분에서 resultCode(게이트웨이 오류는 returnReasonCode)를 찾는다."""
+    if not content:
+        return None
+    match = _RESULT_CODE.search(content[:4096])
+    return match.group(1).decode("ascii", errors="replace") if match else None
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+def _key_id(params: dict | None) -> str:
+    for name, value in (params or {}).items():
+        if str(name).lower() in _KEY_PARAMS and value:
+            return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:8]
+    return "-"
+
+
+def _endpoint(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.netloc + parts.path.rstrip("/")
+
+
+class EndpointLimiter:
+    """엔드포인트 하나의 토큰 버킷 + 동시 요청 상한 + 일일 사용량."""
+
+    def __init__(self, key_id: str, endpoint: str, used: int = 0, exhausted: bool = False):
+        self.key_id = key_id
+        self.endpoint = endpoint
+        self.rate = MAX_RATE
+        self.limit = MAX_CONCURRENCY
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.used = used
+        self.flushed = used
+        self.exhausted = exhausted
+        self.throttled = 0
+        self.cond = threading.Condition()
+
+    @property
+    def remaining(self) -> int | None:
+        if self.exhausted:
+            return 0
+        return max(0, DAILY_QUOTA - self.used) if DAILY_QUOTA else None
+
+    def acquire(self) -> None:
+        with self.cond:
+            while True:
+                if self.exhausted or (DAILY_QUOTA and self.used >= DAILY_QUOTA):
+                    self.exhausted = True
+                    raise QuotaExceeded(f"일일 호출 한도 소진: {self.endpoint}")
+                now = time.monotonic()
+                self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.cooldown_until:
+                    wait = self.cooldown_until - now
+                elif self.in_flight >= self.limit:
+                    wait = None  # release()가 깨운다
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    self.used += 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+                self.cond.wait(wait)
+
+    def release(self) -> None:
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def succeeded(self) -> None:
+        with self.cond:
+            self.rate = min(MAX_RATE, self.rate + MAX_RATE / 20)
+            if self.limit < MAX_CONCURRENCY and self.rate >= MAX_RATE:
+                self.limit += 1
+
+    def backoff(self, retry_after: float | None = None) -> None:
+        with self.cond:
+            self.throttled += 1
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.limit = max(1, self.limit // 2)
+            self.tokens = min(self.tokens, 0.0)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + min(60.0, pause))
+            self.cond.notify_all()
+
+    def exhaust(self) -> None:
+        with self.cond:
+            self.exhausted = True
+            self.cond.notify_all()
+
+    def observe(self, status_code: int, content: bytes | None = None, retry_after: str | None = None) -> None:
+        """응답 상태와 resultCode로 속도를 조정한다."""
+        code = result_code(content)
+        if code in QUOTA_CODES:
+            print(f"  ⚠️ 일일 호출 한도 초과(resultCode {code}): {self.endpoint}")
+            self.exhaust()
+        elif status_code == 429 or status_code >= 500 or code in THROTTLE_CODES:
+            seconds = float(retry_after) if retry_after and retry_after.isdigit() else None
+            self.backoff(seconds)
+        else:
+            self.succeeded()
+
+
+class RateLimiter:
+    def __init__(self, path: str = QUOTA_PATH):
+        self.path = path
+        self.day = _today()
+        self.buckets: dict[tuple[str, str], EndpointLimiter] = {}
+        self.lock = threading.Lock()
+        self.conn: sqlite3.Connection | None = None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " day TEXT, key_id TEXT, endpoint TEXT, used INTEGER, exhausted INTEGER,"
+                " PRIMARY KEY (day, key_id, endpoint))"
+            )
+        except sqlite3.Error as exc:  # 집계 파일이 없어도 속도 제한은 동작한다
+            print(f"  ⚠️ 호출량 집계 파일을 열 수 없습니다: {exc}")
+            self.conn = None
+
+    def bucket(self, url: str, params: dict | None) -> EndpointLimiter:
+        key = (_key_id(params), _endpoint(url))
+        with self.lock:
+            if self.day != _today():  # 자정(한국시간)이 지나면 사용량을 새로 센다
+                self._flush_locked()
+                self.day = _today()
+                self.buckets.clear()
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                used, exhausted = self._load_locked(*key)
+                bucket = self.buckets[key] = EndpointLimiter(*key, used=used, exhausted=exhausted)
+            return bucket
+
+    def _load_locked(self, key_id: str, endpoint: str) -> tuple[int, bool]:
+        if self.conn is None:
+            return 0, False
+        row = self.conn.execute(
+            "SELECT used, exhausted FROM usage WHERE day=? AND key_id=? AND endpoint=?", (self.day, key_id, endpoint)
+        ).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+
+    def _flush_locked(self) -> None:
+        if self.conn is None:
+            return
+        for bucket in self.buckets.values():
+            delta, bucket.flushed = bucket.used - bucket.flushed, bucket.used
+            self.conn.execute(
+                "INSERT INTO usage VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(day, key_id, endpoint) DO UPDATE SET"
+                " used = used + excluded.used, exhausted = MAX(exhausted, excluded.exhausted)",
+                (self.day, bucket.key_id, bucket.endpoint, delta, int(bucket.exhausted)),
+            )
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush_locked()
+
+    def remaining(self, url: str, params: dict | None = None) -> int | None:
+        """남은 일일 호출 수. 한도를 설정하지 않았으면 None."""
+        return self.bucket(url, params).remaining
+
+    def report(self) -> None:
+        """이번 실행에서 호출한 엔드포인트별 사용량과 남은 한도를 출력한다."""
+        with self.lock:
+            self._flush_locked()
+            buckets = sorted(self.buckets.values(), key=lambda b: b.endpoint)
+        if not buckets:
+            return
+        print(f"📈 API 호출량 ({self.day}, 한국시간 기준)")
+        for bucket in buckets:
+            remaining = bucket.remaining
+            left = "한도 미설정" if remaining is None else f"남은 {remaining:,}회"
+            extra = f", 감속 {bucket.throttled}회" if bucket.throttled else ""
+            print(
+                f"  {bucket.endpoint.rsplit('/', 1)[-1]} [{bucket.key_id}]: 오늘 {bucket.used:,}회, {left}"
+                f" (현재 {bucket.rate:.1f}/초 · 동시 {bucket.limit}{extra})"
+            )
+
+    @contextmanager
+    def slot(self, url: str, params: dict | None = None):
+        """요청 하나 동안 토큰과 동시 요청 자리를 잡는다. 네트워크 오류는 감속 신호로 본다."""
+        bucket = self.bucket(url, params)
+        bucket.acquire()
+        try:
+            yield bucket
+        except (requests.Timeout, requests.ConnectionError):
+            bucket.backoff()
+            raise
+        finally:
+            bucket.release()
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+            atexit.register(_limiter.report)
+        return _limiter
+
+
+def get(url: str, params: dict | None = None, timeout: float = 60, session=None, stream: bool = False, headers: dict | None = None):
+    """requests.get 대체. 속도 제한 아래에서 호출하고 응답으로 속도를 조정한다.
+
+    stream=True이면 첫 청크만 미리 읽어 resultCode를 보고, 그 청크는 iter_content()가 다시 내보낸다.
+    호출 한도 초과 응답(코드 22)은 돌려주지 않고 바로 QuotaExceeded를 낸다.
+    """
+    session = session or requests
+    with get_limiter().slot(url, params) as bucket:
+        response = session.get(url, params=params, timeout=timeout, stream=stream, headers=headers)
+        head = _peek(response) if stream else response.content
+        bucket.observe(response.status_code, head, response.headers.get("Retry-After"))
+    if result_code(head) in QUOTA_CODES:  # 한도 초과 본문은 빈 페이지로 처리되지 않게 막는다
+        response.close()
+        raise QuotaExceeded(f"일일 호출 한도 소진: {bucket.endpoint}")
+    return response
+
+
+def _peek(response) -> bytes:
+    """스트리밍 응답의 첫 청크를 읽고, iter_content()가 그 청크부터 다시 내보내도록 바꾼다."""
+    chunks = response.iter_content(chunk_size=STREAM_PEEK_BYTES)
+    head = next(chunks, b"")
+
+    def iter_content(chunk_size: int = 1, decode_unicode: bool = False):
+        if head:
+            yield head
+        yield from chunks
+
+    response.iter_content = iter_content
+    return head
@@ -0,0 +1,231 @@
+"""공공데이터 API 응답을 디스크(SQLite)에 보관하는 읽기 캐시.
+
+같은 (엔드포인트, 파라미터) 요청은 TTL 동안 다시 호출하지 않는다.
+TTL이 지난 항목은 ETag/Last-Modified가 있으면 조건부 요청으로 재검증하고,
+전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 지운다.
+환경 변수 API_CACHE=off 로 끌 수 있다.
+실제 네트워크 호출은 rate_limiter를 거치므로 캐시 적중은 호출 한도를 쓰지 않는다.
+HTTP 200으로 오는 게이트웨이 오류(returnReasonCode)나 item이 없는 본문은 저장하지 않는다.
+item이 0건인 본문은 totalCount가 0일 때(정말 결과가 없을 때)만 저장한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import requests
+
+import rate_limiter
+
+CACHE_PATH = os.environ.get("API_CACHE_PATH", os.path.join(".cache", "api_responses.sqlite3"))
+CACHE_MAX_BYTES = int(os.environ.get("API_CACHE_MAX_MB", "512")) * 1024 * 1024
+CACHE_DISABLED = os.environ.get("API_CACHE", "").lower() in {"0", "off", "false", "no"}
+DEFAULT_TTL = int(os.environ.get("API_CACHE_TTL", str(6 * 3600)))
+
+# 엔드포인트(URL 마지막 경로)별 TTL(초). 당일 갱신이 잦은 공고는 짧게 둔다.
+ENDPOINT_TTLS = {
+    "getDmstcPrcurePlanList": 12 * 3600,
+    "getDmstcCntrctInfoList": 12 * 3600,
+    "getDmstcCmpetBidPblancList": 3 * 3600,
+    "getCntrctInfoListServcPPSSrch": 12 * 3600,
+    "getSpcifyPrdlstPrcureInfoList": 12 * 3600,
+    "getBidPblancListInfoCnstwkPPSSrch": 3 * 3600,
+    "getBidPblancListInfoThngPPSSrch": 3 * 3600,
+    "getBidPblancListInfoServcPPSSrch": 3 * 3600,
+}
+
+# 인증키는 캐시 키와 저장 URL에서 제외한다.
+_SECRET_PARAMS = {"servicekey"}
+_OK_CODES = {"00", "0"}
+_GATEWAY_ERROR = re.compile(rb"returnReasonCode|returnAuthMsg|OpenAPI_ServiceResponse|cmmMsgHeader")
+_ITEMS = re.compile(rb"<items?[\s>/]|\"items?\"\s*:")
+_ITEM = re.compile(rb"<item[\s>]|\"item\"\s*:\s*(?:\{|\[\s*\{)|\"items\"\s*:\s*\[\s*\{")
+_TOTAL_COUNT = re.compile(rb"<totalCount>\s*(\d+)|\"totalCount\"\s*:\s*\"?(\d+)")
+
+
+class CachedResponse:
+    """캐시에서 꺼낸 응답. 수집기가 쓰는 requests.Response 인터페이스만 흉내 낸다.
+
+    저장된 압축 본문(blob)으로 만들면 iter_content()가 조금씩 풀면서 내보내므로
+    스트리밍 디코더(xml_stream)는 풀린 본문 전체를 메모리에 올리지 않는다.
+    캐시 미스는 저장하려고 본문을 한 번에 받으므로 content로 만든다.
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes | None = None, blob: bytes | None = None):
+        self.url = url
+        self.status_code = status_code
+        self._content = content
+        self._blob = blob
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = zlib.decompress(self._blob) if self._blob is not None else b""
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+    def iter_content(self, chunk_size: int = 1):
+        if self._content is None and self._blob is not None:
+            decompressor = zlib.decompressobj()
+            for start in range(0, len(self._blob), chunk_size):
+                data = decompressor.decompress(self._blob[start:start + chunk_size])
+                if data:
+                    yield data
+            data = decompressor.flush()
+            if data:
+                yield data
+            return
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def cache_key(url: str, params: dict | None) -> str:
+    parts = urlsplit(url)  # http/https 구분 없이 같은 엔드포인트로 본다
+    public = sorted((str(k), str(v)) for k, v in (params or {}).items() if str(k).lower() not in _SECRET_PARAMS)
+    return hashlib.sha256(json.dumps([parts.netloc + parts.path, public], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def endpoint_ttl(url: str) -> int:
+    endpoint = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def is_cacheable(content: bytes) -> bool:
+    """정상 응답만 저장한다.
+
+    API 오류 코드(호출 한도 초과 등)가 담긴 본문, HTTP 200으로 오는 게이트웨이 오류
+    (OpenAPI_ServiceResponse/cmmMsgHeader의 returnReasonCode·returnAuthMsg),
+    resultCode 헤더도 item도 없는 본문(HTML 오류 페이지 등)은 저장하지 않는다.
+    <items/>처럼 item이 0건이면 totalCount가 0인 경우만 저장한다. 일시적으로 빈 페이지가
+    오면 다음 호출에서 다시 받아야 한다.
+    """
+    if _GATEWAY_ERROR.search(content[:4096]):
+        return False
+    code = rate_limiter.result_code(content)
+    if code is None and _ITEMS.search(content) is None:
+        return False
+    if code is not None and code not in _OK_CODES:
+        return False
+    if _ITEM.search(content) is None:
+        total = _TOTAL_COUNT.search(content)
+        return total is not None and int(total.group(1) or total.group(2)) == 0
+    return True
+
+
+class ResponseCache:
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT, body BLOB, size INTEGER,"
+            " etag TEXT, last_modified TEXT, stored_at REAL, accessed_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+
+    def lookup(self, key: str):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key=?", (key,)
+            ).fetchone()
+
+    def touch(self, key: str, refreshed: bool = False) -> None:
+        now = time.time()
+        with self.lock:
+            if refreshed:
+                self.conn.execute("UPDATE responses SET stored_at=?, accessed_at=? WHERE key=?", (now, now, key))
+            else:
+                self.conn.execute("UPDATE responses SET accessed_at=? WHERE key=?", (now, key))
+
+    def store(self, key: str, url: str, content: bytes, headers) -> None:
+        body = zlib.compress(content, 6)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, len(body), headers.get("ETag"), headers.get("Last-Modified"), now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key=?", (key,))
+            total -= size
+
+    def get(self, session, url: str, params: dict | None, timeout: float, ttl: int | None = None) -> CachedResponse:
+        key = cache_key(url, params)
+        ttl = endpoint_ttl(url) if ttl is None else ttl
+        row = self.lookup(key)
+        headers = {}
+        if row is not None:
+            body, etag, last_modified, stored_at = row
+            if time.time() - stored_at < ttl:
+                self.touch(key)
+                return CachedResponse(url, 200, blob=body)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = rate_limiter.get(url, params, timeout, session=session, headers=headers or None)
+        if response.status_code == 304 and row is not None:
+            self.touch(key, refreshed=True)
+            return CachedResponse(url, 200, blob=row[0])
+        if response.status_code == 200 and is_cacheable(response.content):
+            self.store(key, urlsplit(url)._replace(query="").geturl(), response.content, response.headers)
+        return CachedResponse(url, response.status_code, response.content)
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def cached_get(url: str, params: dict | None = None, timeout: float = 60, session=None, stream: bool = False, ttl: int | None = None):
+    """requests.get 대체. 캐시가 꺼져 있으면 실제 응답 객체를 그대로 돌려준다."""
+    session = session or requests
+    if CACHE_DISABLED:
+        return rate_limiter.get(url, params, timeout, session=session, stream=stream)
+    return get_cache().get(session, url, params, timeout, ttl)
@@ -0,0 +1,156 @@
+"""수집기 시트(첫 번째 워크시트)의 로컬 Parquet 미러와 manifest.
+
+수집기는 시트를 쓴 직후 같은 내용을 data/mirror/<시트명>.parquet에 저장하고,
+다음 실행에서는 스프레드시트의 수정 시각(modifiedTime)이 manifest와 같을 때만
+get_all_values() 대신 미러를 병합 기준으로 쓴다. 시트가 사람 손이나 다른 작업으로
+바뀌었으면 수정 시각이 달라지므로 자동으로 시트를 다시 읽는다.
+
+열은 값 전체가 정수/실수 문자열이면 숫자형으로 저장하고, 다시 읽을 때 원래 문자열과
+같아지는 경우에만 숫자형을 쓴다(무손실). pyarrow가 없으면 미러 없이 동작한다.
+
+미러는 저장소에 커밋하지 않는다(.gitignore). CI에서는 actions/cache로 실행 사이에 보관하고,
+캐시가 없거나 오래됐으면 수정 시각이 맞지 않아 시트를 읽으므로 결과는 같다.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 미러는 선택 기능이다
+    pa = pq = None
+
+MIRROR_DIR = os.environ.get(
+    "PROCUREMENT_MIRROR_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "mirror")
+)
+MANIFEST_NAME = "manifest.json"
+_INT = re.compile(r"0|-?[1-9][0-9]{0,17}")  # "-0"은 0으로 읽혀 되돌릴 수 없으므로 제외
+
+
+def _manifest_path() -> str:
+    return os.path.join(MIRROR_DIR, MANIFEST_NAME)
+
+
+def read_manifest() -> dict:
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 1, "sheets": {}}
+
+
+def _write_manifest(manifest: dict) -> None:
+    tmp = _manifest_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, _manifest_path())
+
+
+def is_int_text(value: str) -> bool:
+    """int64로 저장했다가 같은 문자열로 되돌릴 수 있는 정수 문자열인지."""
+    return _INT.fullmatch(value) is not None
+
+
+def is_float_text(value: str) -> bool:
+    """float64로 저장했다가 repr()로 같은 문자열이 되는 실수 문자열인지."""
+    try:
+        number = float(value)
+        return math.isfinite(number) and repr(number) == value
+    except ValueError:
+        return False
+
+
+def to_frame(table):
+    """Arrow 테이블을 DataFrame으로. 정수 열은 빈 값이 있어도 float64가 아닌 Int64로 읽는다."""
+    import pandas as pd  # 수집기 중에는 pandas를 쓰지 않는 것도 있다
+
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def _column_array(values: list[str]):
+    present = [v for v in values if v != ""]
+    if present and all(is_int_text(v) for v in present):
+        return pa.array([int(v) if v != "" else None for v in values], type=pa.int64())
+    if present and all(is_float_text(v) for v in present):
+        return pa.array([float(v) if v != "" else None for v in values], type=pa.float64())
+    return pa.array(values, type=pa.string())
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def sheet_modified_time(spreadsheet) -> str | None:
+    try:
+        return spreadsheet.get_lastUpdateTime()
+    except Exception as exc:  # 수정 시각을 모르면 미러를 신뢰하지 않는다
+        print(f"  ⚠️ 시트 수정 시각 확인 실패: {exc}")
+        return None
+
+
+def load(spreadsheet, sheet) -> list[list[str]] | None:
+    """미러가 시트와 같은 버전이면 [헤더] + 행 목록(문자열)을 반환한다."""
+    if pq is None:
+        return None
+    entry = read_manifest()["sheets"].get(spreadsheet.title)
+    if not entry or entry.get("spreadsheet_id") != spreadsheet.id or entry.get("worksheet_id") != sheet.id:
+        return None
+    path = os.path.join(MIRROR_DIR, entry["file"])
+    if not os.path.exists(path) or sheet_modified_time(spreadsheet) != entry.get("sheet_modified"):
+        return None
+    table = pq.read_table(path)
+    columns = [[_text(v) for v in column.to_pylist()] for column in table.columns]
+    print(f"  미러 사용: {entry['file']} ({table.num_rows:,}행)")
+    return [list(table.column_names)] + [list(row) for row in zip(*columns)]
+
+
+def save(spreadsheet, sheet, matrix: list[list[str]]) -> None:
+    """시트에 쓴 것과 같은 행렬을 Parquet으로 저장하고 manifest를 갱신한다."""
+    if pq is None or not matrix:
+        return
+    headers, rows = matrix[0], matrix[1:]
+    os.makedirs(MIRROR_DIR, exist_ok=True)
+    columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in headers]
+    table = pa.Table.from_arrays([_column_array(values) for values in columns], names=headers)
+    file_name = f"{spreadsheet.title}.parquet"
+    pq.write_table(table, os.path.join(MIRROR_DIR, file_name), compression="zstd")
+
+    manifest = read_manifest()
+    manifest["sheets"][spreadsheet.title] = {
+        "file": file_name,
+        "spreadsheet_id": spreadsheet.id,
+        "worksheet_id": sheet.id,
+        "rows": len(rows),
+        "columns": {name: str(table.schema.field(name).type) for name in headers},
+        "sheet_modified": sheet_modified_time(spreadsheet),
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _write_manifest(manifest)
+
+
+def find_entry(spreadsheet_id: str) -> dict | None:
+    """스프레드시트 ID로 manifest 항목을 찾는다 (대시보드 등 하위 소비자용)."""
+    for entry in read_manifest()["sheets"].values():
+        if entry.get("spreadsheet_id") == spreadsheet_id:
+            return entry
+    return None
+
+
+def read_frame(spreadsheet_id: str, modified_time: str | None):
+    """modifiedTime이 manifest와 같을 때 미러를 DataFrame으로 읽는다. 아니면 None."""
+    entry = find_entry(spreadsheet_id)
+    if pq is None or entry is None or not modified_time or entry.get("sheet_modified") != modified_time:
+        return None
+    path = os.path.join(MIRROR_DIR, entry["file"])
+    if not os.path.exists(path):
+        return None
+    return to_frame(pq.read_table(path))
@@ -0,0 +1,88 @@
+"""종합쇼핑몰 3자단가(특정품목 조달내역) 수집기. main.py와 history_collector가 함께 쓴다.
+
+키워드마다 1페이지로 totalCount를 확인한 뒤, 남은 페이지를 키워드×페이지 작업으로
+같은 스레드 풀에 올려 동시에 받는다. 속도·동시 요청·일일 한도는 rate_limiter가
+한곳에서 관리하므로 여기서는 대기 시간을 두지 않는다.
+행은 응답 필드 순서 그대로의 값 목록이며 HEADER_KOR(39개 필드)와 순서가 같다.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable
+
+import requests
+
+from rate_limiter import MAX_CONCURRENCY, QuotaExceeded
+from response_cache import cached_get
+from xml_stream import iter_items, total_count
+
+SHOPPING_URL = "https://apis.data.go.kr/1230000/at/ShoppingMallPrdctInfoService/getSpcifyPrdlstPrcureInfoList"
+PAGE_SIZE = 999
+
+
+def fetch_page(service_key: str, keyword: str, start: str, end: str, page: int, retries: int = 3) -> tuple[list[list[str]], int]:
+    """한 키워드의 한 페이지를 받아 (행 목록, totalCount)를 반환한다. 타임아웃만 재시도한다."""
+    params = {
+        "numOfRows": str(PAGE_SIZE),
+        "pageNo": str(page),
+        "ServiceKey": service_key,
+        "type": "xml",
+        "inqryDiv": "1",
+        "inqryPrdctDiv": "2",
+        "inqryBgnDate": start,
+        "inqryEndDate": end,
+        "dtilPrdctClsfcNoNm": keyword,
+    }
+    for attempt in range(retries):
+        try:
+            res = cached_get(SHOPPING_URL, params=params, timeout=60)
+            res.raise_for_status()
+            meta: dict = {}
+            rows = [list(item.values()) for item in iter_items(res.content, meta, check_result=False)]
+            return rows, total_count(meta, len(rows))
+        except requests.exceptions.Timeout:
+            if attempt == retries - 1:
+                raise
+            wait_seconds = (attempt + 1) * 5
+            print(f"      ⏳ [{keyword}] p{page} 타임아웃 ({attempt + 1}/{retries}), {wait_seconds}초 후 재시도...")
+            time.sleep(wait_seconds)
+    return [], 0
+
+
+def collect(service_key: str, keywords: Iterable[str], start: str, end: str) -> tuple[dict[str, list[list[str]]], set[str]]:
+    """키워드 전체를 [start, end] 기간으로 수집해 ({키워드: 행 목록}, 실패 키워드)를 반환한다.
+
+    한 페이지라도 실패한 키워드는 받은 페이지만 결과에 담고 실패 목록에도 넣는다.
+    """
+    pages: dict[str, dict[int, list[list[str]]]] = {}
+    failed: set[str] = set()
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        pending = {executor.submit(fetch_page, service_key, kw, start, end, 1): (kw, 1) for kw in keywords}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kw, page = pending.pop(future)
+                try:
+                    rows, total = future.result()
+                except QuotaExceeded as exc:
+                    failed.add(kw)
+                    if not exhausted:
+                        print(f"      ❌ {exc} — 남은 요청은 건너뜁니다")
+                    exhausted = True
+                    continue
+                except Exception as exc:
+                    failed.add(kw)
+                    print(f"      ❌ [{kw}] p{page} 최종 실패 (데이터 유실 가능): {exc}")
+                    continue
+                pages.setdefault(kw, {})[page] = rows
+                if page == 1 and rows and total > len(rows):
+                    # 서버가 numOfRows를 더 작게 잘라 주는 경우에도 페이지 수를 맞춘다.
+                    last_page = -(-total // len(rows))
+                    for next_page in range(2, last_page + 1):
+                        future = executor.submit(fetch_page, service_key, kw, start, end, next_page)
+                        pending[future] = (kw, next_page)
+
+    results = {kw: [row for page in sorted(by_page) for row in by_page[page]] for kw, by_page in pages.items()}
+    return results, failed
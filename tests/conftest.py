@@ -0,0 +1,115 @@
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _Response:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeDrive:
+    """drive_archive/drive_cache가 쓰는 Drive v3 호출만 메모리에서 흉내 낸다."""
+
+    def __init__(self):
+        self.files_by_id = {}  # id -> {"name", "parents", "data", "version"}
+        self.calls = []
+        self._next = 0
+
+    # ── googleapiclient 리소스 ──
+    def files(self):
+        return self
+
+    def list(self, q, fields=None, pageSize=None, pageToken=None):
+        self.calls.append("list")
+        folder = re.search(r"'([^']+)' in parents", q).group(1)
+        items = [
+            {"id": file_id, "name": f["name"], "modifiedTime": str(f["version"])}
+            for file_id, f in self.files_by_id.items() if folder in f["parents"]
+        ]
+        return _Request(lambda: {"files": items})
+
+    def create(self, body, media_body, fields=None):
+        def run():
+            self._next += 1
+            file_id = f"f{self._next}"
+            self.files_by_id[file_id] = {
+                "name": body["name"], "parents": body["parents"], "data": self._bytes(media_body), "version": 1,
+            }
+            return {"id": file_id, "modifiedTime": "1"}
+        return _Request(run)
+
+    def update(self, fileId, media_body, fields=None):
+        def run():
+            f = self.files_by_id[fileId]
+            f["data"], f["version"] = self._bytes(media_body), f["version"] + 1
+            return {"id": fileId, "modifiedTime": str(f["version"])}
+        return _Request(run)
+
+    def delete(self, fileId):
+        return _Request(lambda: self.files_by_id.pop(fileId))
+
+    def get(self, fileId, fields=None):
+        self.calls.append("get")
+        f = self.files_by_id[fileId]
+        return _Request(lambda: {
+            "md5Checksum": hashlib.md5(f["data"]).hexdigest(), "size": str(len(f["data"])),
+            "modifiedTime": str(f["version"]),
+        })
+
+    @staticmethod
+    def _bytes(media_body):
+        return media_body.getbytes(0, media_body.size())
+
+    # ── google_clients 대체 ──
+    def media(self, file_id, auth_json=None, timeout=None):
+        self.calls.append("media")
+        return _Response(self.files_by_id[file_id]["data"])
+
+    def session(self, auth_json=None):
+        drive = self
+
+        class Session:
+            def get(self, url, headers=None, timeout=None):
+                file_id = url.split("/files/")[1].split("?")[0]
+                start, end = map(int, headers["Range"][len("bytes="):].split("-"))
+                drive.calls.append("range")
+                return _Response(drive.files_by_id[file_id]["data"][start:end + 1], 206)
+
+        return Session()
+
+    def named(self, name):
+        return [f for f in self.files_by_id.values() if f["name"] == name]
+
+
+@pytest.fixture
+def drive(monkeypatch, tmp_path):
+    import drive_archive
+    import drive_cache
+    import google_clients
+
+    fake = FakeDrive()
+    monkeypatch.setattr(google_clients, "drive_service", lambda auth_json=None: fake)
+    monkeypatch.setattr(google_clients, "drive_media", fake.media)
+    monkeypatch.setattr(google_clients, "authorized_session", fake.session)
+    monkeypatch.setattr(drive_cache, "CACHE_DIR", str(tmp_path / "drive_cache"))
+    monkeypatch.setattr(drive_archive, "_folder_indexes", {})
+    return fake
@@ -0,0 +1,43 @@
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from collect_journal import CollectJournal
+
+
+def test_window_overlapping_start_is_fetched_again(tmp_path):
+    journal = CollectJournal("test", path=str(tmp_path / "journal.sqlite3"))
+    journal.record("2025-01-01", "2025-01-20", [{"id": 1}])
+
+    missing = journal.missing_ranges(date(2025, 1, 2), date(2025, 2, 1))
+
+    # 시작일에 걸친 구간은 rows()에 나오지 않으므로 다시 받아야 한다
+    assert missing == [(date(2025, 1, 2), date(2025, 2, 1))]
+    assert journal.rows("2025-01-02", "2025-02-01") == []
+
+
+def test_contained_windows_are_skipped_and_returned(tmp_path):
+    journal = CollectJournal("test", path=str(tmp_path / "journal.sqlite3"))
+    journal.record("2025-01-05", "2025-01-10", [{"id": 1}])
+    journal.record("2025-01-25", "2025-02-05", [{"id": 2}])
+
+    missing = journal.missing_ranges(date(2025, 1, 1), date(2025, 2, 1))
+
+    assert missing == [(date(2025, 1, 1), date(2025, 1, 4)), (date(2025, 1, 11), date(2025, 2, 1))]
+    assert journal.rows("2025-01-01", "2025-02-01") == [{"id": 1}]
+
+
+def test_plan_months_are_recorded_as_date_windows(tmp_path):
+    os.environ.setdefault("DATA_GO_KR_API_KEY", "test")
+    from munitions_plan import month_window
+
+    journal = CollectJournal("plan", path=str(tmp_path / "journal.sqlite3"))
+    for month in ("202609", "202610"):
+        journal.record(*month_window(month), [{"month": month}])
+
+    assert month_window("202602") == ("2026-02-01", "2026-02-28")
+    assert journal.missing_ranges(date(2026, 9, 1), date(2026, 10, 31)) == []
+    assert journal.rows(month_window("202609")[0], month_window("202610")[1]) == [{"month": "202609"}, {"month": "202610"}]
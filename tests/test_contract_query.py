@@ -0,0 +1,35 @@
+import contract_query
+from keyword_matcher import KeywordMatcher
+
+
+def contract(name, org="기관"):
+    return {"cntrctNm": name, "dminsttList": org, "corpList": "-"}
+
+
+def test_day_contracts_use_the_notice_matcher(monkeypatch):
+    day = [contract("CCTV 유지보수"), contract("cctv 통합관제 용역"), contract("청소 용역"), contract("CCTV 유지보수")]
+    monkeypatch.setattr(contract_query, "_fetch_page", lambda key, d_str, page, keyword=None: (day, len(day)))
+    matcher = KeywordMatcher(["CCTV", "통합관제"], ignore_case=True)
+
+    names = [c["nm"] for c in contract_query.fetch_day_contracts("key", "20261016", matcher)]
+
+    assert names == ["CCTV 유지보수", "cctv 통합관제 용역"]
+    assert [matcher.matches(name) for name in names] == [True, True]
+
+
+def test_keyword_fallback_queries_each_keyword_once(monkeypatch):
+    queried = []
+
+    def fetch_page(key, d_str, page, keyword=None):
+        if keyword is None:
+            return [], contract_query.FULL_DAY_LIMIT + 1
+        queried.append(keyword)
+        return [contract(f"{keyword} 용역")], 1
+
+    monkeypatch.setattr(contract_query, "_fetch_page", fetch_page)
+    matcher = KeywordMatcher(["CCTV", "ITS", "CCTV"], ignore_case=True)
+
+    result = contract_query.fetch_day_contracts("key", "20261016", matcher)
+
+    assert sorted(queried) == ["CCTV", "ITS"]
+    assert len(result) == 2
@@ -0,0 +1,78 @@
+import json
+
+import pandas as pd
+
+import drive_archive as da
+
+
+def notice(*rows):
+    return pd.DataFrame([{"bidNtceNo": no, "bidNtceDt": day, "bidNtceNm": name} for no, day, name in rows])
+
+
+def manifest(drive, archive):
+    (f,) = drive.named(archive.manifest_file)
+    return json.loads(f["data"])
+
+
+def test_concurrent_append_keeps_both_parts(drive, monkeypatch):
+    archive = da.notice_archive("용역")
+    da.append(archive, "20261015", notice(("A", "2026-10-15 09:00:00", "a")))
+
+    # 다른 작업이 manifest를 읽은 직후 이 작업이 먼저 파트를 저장한 상황
+    load = da.load_manifest
+    raced = []
+
+    def load_then_race(service, arch, auth_json=None):
+        result = load(service, arch, auth_json)
+        if not raced:
+            raced.append(True)
+            da.append(archive, "20261017", notice(("C", "2026-10-17 09:00:00", "c")))
+        return result
+
+    monkeypatch.setattr(da, "load_manifest", load_then_race)
+    da.append(archive, "20261016", notice(("B", "2026-10-16 09:00:00", "b")))
+
+    assert sorted(manifest(drive, archive)["years"]["2026"]["parts"]) == ["20261015", "20261016", "20261017"]
+    df = da.read_year(archive, 2026)
+    assert sorted(df["bidNtceNo"]) == ["A", "B", "C"]
+
+
+def test_compaction_merges_parts_and_keeps_last_row_per_key(drive, monkeypatch):
+    monkeypatch.setattr(da, "COMPACT_PARTS", 3)
+    archive = da.notice_archive("물품")
+    da.append(archive, "20261001", notice(("A", "2026-10-01 09:00:00", "old"), ("B", "2026-10-01 10:00:00", "b")))
+    da.append(archive, "20261002", notice(("A", "2026-10-02 09:00:00", "new")))
+    da.append(archive, "20261003", notice(("C", "2026-10-03 09:00:00", "c")))
+
+    entry = manifest(drive, archive)["years"]["2026"]
+    assert entry["parts"] == {}
+    assert entry["base"]["rows"] == 3
+    assert not [f for f in drive.files_by_id.values() if ".part." in f["name"]]
+    df = da.read_year(archive, 2026).set_index("bidNtceNo")
+    assert df.loc["A", "bidNtceNm"] == "new"
+
+    day = da.read_notice("물품", "20261002", "20261002")
+    assert list(day["bidNtceNo"]) == ["A"]
+
+
+def test_numeric_and_text_keys_from_different_parts_dedup(drive, monkeypatch):
+    archive = da.notice_archive("공사")
+    # 한 파트는 키가 모두 숫자, 다른 파트는 문자가 섞여 있다
+    da.append(archive, "20261001", notice(("123", "2026-10-01 09:00:00", "old"), ("124", "2026-10-01 10:00:00", "x")))
+    da.append(archive, "20261002", notice(("123", "2026-10-02 09:00:00", "new"), ("R25", "2026-10-02 10:00:00", "y")))
+
+    df = da.read_year(archive, 2026)
+    assert sorted(df["bidNtceNo"]) == ["123", "124", "R25"]
+    assert df.set_index("bidNtceNo").loc["123", "bidNtceNm"] == "new"
+
+    ranged = da.read_range(archive, "20261001", "20261002")
+    assert sorted(ranged["bidNtceNo"]) == ["123", "124", "R25"]
+
+
+def test_write_file_overwrites_by_name(drive):
+    assert da.read_file("folder", "a.json") is None
+    first = da.write_file("folder", "a.json", b"1", "application/json")
+    second = da.write_file("folder", "a.json", b"2", "application/json")
+
+    assert first == second
+    assert da.read_file("folder", "a.json") == b"2"
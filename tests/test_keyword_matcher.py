@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+
+CATEGORIES = {"영상": ["CCTV", "영상감시", "통합관제"], "교통": ["ITS", "교통", "관제"], "기타": ["유지보수"]}
+TEXTS = [
+    "CCTV 통합관제센터 유지보수", "지능형 교통체계(ITS) 구축", "cctv 영상감시장치", "청소 용역",
+    "관제관제", "", "통합관제ITS교통",
+]
+
+
+def backends(monkeypatch, **kwargs):
+    pytest.importorskip("ahocorasick")
+    native = KeywordMatcher(CATEGORIES, **kwargs)
+    monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    python = KeywordMatcher(CATEGORIES, **kwargs)
+    assert native._native is not None and python._native is None
+    return native, python
+
+
+@pytest.mark.parametrize("ignore_case", [False, True])
+def test_native_and_pure_python_backends_agree(monkeypatch, ignore_case):
+    native, python = backends(monkeypatch, ignore_case=ignore_case)
+
+    for text in TEXTS:
+        assert sorted(native.iter_matches(text)) == sorted(python.iter_matches(text))
+        assert native.scan(text) == python.scan(text)
+        assert native.classify(text) == python.classify(text)
+        assert native.matches(text) == python.matches(text)
+    series = pd.Series(TEXTS + [None])
+    assert native.contains(series).tolist() == python.contains(series).tolist()
+    assert native.classify_series(series).tolist() == python.classify_series(series).tolist()
+
+
+def test_pure_python_dfa_is_only_built_without_native(monkeypatch):
+    native, python = backends(monkeypatch)
+    assert not hasattr(native, "_delta")
+    assert python.classify("CCTV 통합관제") == "영상"
@@ -0,0 +1,102 @@
+import pytest
+
+import rate_limiter
+from rate_limiter import EndpointLimiter, QuotaExceeded, RateLimiter
+
+URL = "https://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoServcPPSSrch"
+QUOTA_BODY = (
+    b"<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+    b"<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+
+
+class Response:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class Session:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, params=None, timeout=None, stream=False, headers=None):
+        return self.response
+
+
+@pytest.fixture
+def limiter(monkeypatch, tmp_path):
+    fresh = RateLimiter(str(tmp_path / "quota.sqlite3"))
+    monkeypatch.setattr(rate_limiter, "_limiter", fresh)
+    return fresh
+
+
+def test_backoff_halves_and_success_recovers_additively():
+    bucket = EndpointLimiter("-", "host/api")
+    bucket.backoff(retry_after=0)
+    assert bucket.rate == max(rate_limiter.MIN_RATE, rate_limiter.MAX_RATE / 2)
+    assert bucket.limit == max(1, rate_limiter.MAX_CONCURRENCY // 2)
+
+    bucket.succeeded()
+    assert bucket.rate == pytest.approx(rate_limiter.MAX_RATE / 2 + rate_limiter.MAX_RATE / 20)
+    assert bucket.limit == max(1, rate_limiter.MAX_CONCURRENCY // 2)  # 속도가 다 돌아온 뒤에야 늘린다
+    for _ in range(20):
+        bucket.succeeded()
+    assert bucket.rate == rate_limiter.MAX_RATE
+    assert bucket.limit > max(1, rate_limiter.MAX_CONCURRENCY // 2)
+
+
+@pytest.mark.parametrize("status, body", [(429, b""), (503, b""), (200, b"<resultCode>05</resultCode>")])
+def test_throttle_signals_back_off(status, body):
+    bucket = EndpointLimiter("-", "host/api")
+    bucket.observe(status, body, retry_after="0")
+    assert bucket.throttled == 1 and bucket.rate < rate_limiter.MAX_RATE
+
+
+def test_daily_quota_blocks_further_calls(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "DAILY_QUOTA", 2)
+    bucket = EndpointLimiter("-", "host/api", used=1)
+    bucket.acquire()
+    bucket.release()
+    assert bucket.remaining == 0
+    with pytest.raises(QuotaExceeded):
+        bucket.acquire()
+
+
+def test_quota_code_in_gateway_error_raises_and_sticks(limiter):
+    response = Response(QUOTA_BODY)
+    with pytest.raises(QuotaExceeded):
+        rate_limiter.get(URL, {"serviceKey": "k"}, session=Session(response), stream=True)
+    assert response.closed
+    with pytest.raises(QuotaExceeded):  # 같은 날 같은 엔드포인트는 호출하지 않고 막는다
+        limiter.bucket(URL, {"serviceKey": "k"}).acquire()
+
+
+def test_streamed_response_replays_peeked_head(limiter, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "STREAM_PEEK_BYTES", 8)
+    body = b"<response><header><resultCode>00</resultCode></header><body/></response>"
+    response = rate_limiter.get(URL, {"serviceKey": "k"}, session=Session(Response(body)), stream=True)
+    assert b"".join(response.iter_content(chunk_size=8)) == body
+
+
+def test_usage_is_persisted_per_day_and_key(tmp_path):
+    path = str(tmp_path / "quota.sqlite3")
+    first = RateLimiter(path)
+    bucket = first.bucket(URL, {"serviceKey": "k"})
+    bucket.acquire()
+    bucket.release()
+    bucket.exhaust()
+    first.flush()
+
+    again = RateLimiter(path).bucket(URL, {"serviceKey": "k"})
+    assert again.used == 1 and again.exhausted
+    assert not RateLimiter(path).bucket(URL, {"serviceKey": "other"}).exhausted
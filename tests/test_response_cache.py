@@ -0,0 +1,103 @@
+import zlib
+
+import pytest
+
+import response_cache
+
+
+def xml(items, total):
+    return (
+        "<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>"
+        f"<body>{items}<numOfRows>10</numOfRows><pageNo>1</pageNo><totalCount>{total}</totalCount></body></response>"
+    ).encode()
+
+
+@pytest.mark.parametrize("body, cacheable", [
+    (xml("<items><item><bidNtceNo>1</bidNtceNo></item></items>", 1), True),
+    (xml("<items/>", 0), True),
+    (xml("<items></items>", 0), True),
+    (xml("<items/>", 120), False),  # 일시적으로 빈 페이지
+    (xml("<items></items>", 120), False),
+    (b'{"response": {"header": {"resultCode": "00"}, "body": {"items": [], "totalCount": 5}}}', False),
+    (b'{"response": {"header": {"resultCode": "00"}, "body": {"items": [], "totalCount": 0}}}', True),
+    (b'{"response": {"header": {"resultCode": "00"}, "body": {"items": {"item": [{"a": 1}]}, "totalCount": 1}}}',
+     True),
+    (b'{"response": {"header": {"resultCode": "00"}, "body": {"items": [{"a": 1}], "totalCount": 1}}}', True),
+    (b"<OpenAPI_ServiceResponse><cmmMsgHeader><returnReasonCode>22</returnReasonCode></cmmMsgHeader>"
+     b"</OpenAPI_ServiceResponse>", False),
+    (b"<html>error</html>", False),
+])
+def test_is_cacheable(body, cacheable):
+    assert response_cache.is_cacheable(body) is cacheable
+
+
+class Network:
+    """rate_limiter.get 대신 응답을 차례로 돌려주고 요청 헤더를 기록한다."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def __call__(self, url, params=None, timeout=None, session=None, stream=False, headers=None):
+        self.headers.append(headers)
+        status, content, response_headers = self.responses.pop(0)
+
+        class Response:
+            pass
+
+        response = Response()
+        response.status_code, response.content, response.headers = status, content, response_headers
+        return response
+
+
+URL = "https://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoServcPPSSrch"
+PAGE = xml("<items><item><bidNtceNo>1</bidNtceNo></item></items>", 1)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return response_cache.ResponseCache(str(tmp_path / "api.sqlite3"))
+
+
+def test_hits_within_ttl_skip_the_network_and_ignore_the_key(cache, monkeypatch):
+    network = Network((200, PAGE, {}))
+    monkeypatch.setattr(response_cache.rate_limiter, "get", network)
+
+    first = cache.get(None, URL, {"serviceKey": "a", "pageNo": "1"}, 10)
+    second = cache.get(None, URL, {"serviceKey": "b", "pageNo": "1"}, 10)
+
+    assert first.content == second.content == PAGE
+    assert len(network.headers) == 1
+    assert b"".join(second.iter_content(chunk_size=7)) == PAGE  # 압축 본문을 풀면서 내보낸다
+
+
+def test_expired_entry_is_revalidated_with_etag(cache, monkeypatch):
+    network = Network((200, PAGE, {"ETag": '"v1"'}), (304, b"", {}), (200, PAGE + b" ", {"ETag": '"v2"'}))
+    monkeypatch.setattr(response_cache.rate_limiter, "get", network)
+
+    cache.get(None, URL, {"pageNo": "1"}, 10, ttl=0)
+    assert cache.get(None, URL, {"pageNo": "1"}, 10, ttl=0).content == PAGE
+    assert cache.get(None, URL, {"pageNo": "1"}, 10, ttl=0).content == PAGE + b" "
+    assert network.headers == [None, {"If-None-Match": '"v1"'}, {"If-None-Match": '"v1"'}]
+    assert cache.lookup(response_cache.cache_key(URL, {"pageNo": "1"}))[1] == '"v2"'
+
+
+def test_transient_empty_page_is_fetched_again(cache, monkeypatch):
+    network = Network((200, xml("<items/>", 120), {}), (200, PAGE, {}))
+    monkeypatch.setattr(response_cache.rate_limiter, "get", network)
+
+    cache.get(None, URL, {"pageNo": "3"}, 10)
+    assert cache.get(None, URL, {"pageNo": "3"}, 10).content == PAGE
+    assert len(network.headers) == 2
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path, monkeypatch):
+    size = len(zlib.compress(PAGE, 6))
+    cache = response_cache.ResponseCache(str(tmp_path / "api.sqlite3"), max_bytes=size * 3 // 2)
+    monkeypatch.setattr(response_cache.rate_limiter, "get", Network((200, PAGE, {}), (200, PAGE, {})))
+
+    cache.get(None, URL, {"pageNo": "1"}, 10)
+    cache.get(None, URL, {"pageNo": "2"}, 10)
+
+    assert cache.lookup(response_cache.cache_key(URL, {"pageNo": "1"})) is None
+    assert cache.lookup(response_cache.cache_key(URL, {"pageNo": "2"})) is not None
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+import sheet_mirror
+
+pytest.importorskip("pyarrow")
+
+
+class Spreadsheet:
+    title = "군수품조달_국내_계약정보"
+    id = "sheet-1"
+
+    def __init__(self, modified="2026-10-16T21:00:00Z"):
+        self.modified = modified
+
+    def get_lastUpdateTime(self):
+        return self.modified
+
+
+class Worksheet:
+    id = 0
+
+
+MATRIX = [
+    ["id", "amount", "rate", "code", "note"],
+    ["1", "1000", "0.5", "007", "-0"],
+    ["2", "", "1.25", "010", ""],
+    ["9007199254740993", "-3", "", "A1", "비고"],
+]
+
+
+@pytest.fixture(autouse=True)
+def mirror_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(sheet_mirror, "MIRROR_DIR", str(tmp_path))
+
+
+def test_round_trip_returns_the_same_text():
+    spreadsheet = Spreadsheet()
+    sheet_mirror.save(spreadsheet, Worksheet(), MATRIX)
+
+    assert sheet_mirror.load(spreadsheet, Worksheet()) == MATRIX
+    columns = sheet_mirror.read_manifest()["sheets"][spreadsheet.title]["columns"]
+    assert columns == {"id": "int64", "amount": "int64", "rate": "double", "code": "string", "note": "string"}
+
+
+def test_changed_sheet_is_not_served_from_the_mirror():
+    sheet_mirror.save(Spreadsheet(), Worksheet(), MATRIX)
+
+    assert sheet_mirror.load(Spreadsheet(modified="2026-10-17T01:00:00Z"), Worksheet()) is None
+    assert sheet_mirror.read_frame("sheet-1", "2026-10-17T01:00:00Z") is None
+
+
+def test_read_frame_keeps_integers_with_blanks_as_int64():
+    sheet_mirror.save(Spreadsheet(), Worksheet(), MATRIX)
+
+    df = sheet_mirror.read_frame("sheet-1", "2026-10-16T21:00:00Z")
+    assert str(df["amount"].dtype) == "Int64"
+    assert df["amount"].tolist() == [1000, pd.NA, -3]
+    assert df["id"].tolist() == [1, 2, 9007199254740993]
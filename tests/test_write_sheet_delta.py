@@ -0,0 +1,80 @@
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATA_GO_KR_API_KEY", "test")
+
+from procurement_common import write_sheet_delta
+
+
+class FakeSheet:
+    """batch_update/batch_clear를 메모리 행렬에 반영하는 워크시트."""
+
+    def __init__(self, matrix):
+        self.grid = [list(row) for row in matrix]
+        self.row_count = max(len(matrix), 1000)
+        self.written_rows = 0
+
+    def resize(self, rows):
+        self.row_count = rows
+
+    def batch_update(self, ranges, value_input_option=None):
+        for block in ranges:
+            start = int(re.match(r"A(\d+):", block["range"]).group(1))
+            for offset, values in enumerate(block["values"]):
+                row_no = start + offset
+                while len(self.grid) < row_no:
+                    self.grid.append([])
+                self.grid[row_no - 1] = list(values)
+                self.written_rows += 1
+
+    def batch_clear(self, ranges):
+        for cells in ranges:
+            first, last = map(int, re.match(r"A(\d+):[A-Z]+(\d+)", cells).groups())
+            for row_no in range(first, min(last, len(self.grid)) + 1):
+                self.grid[row_no - 1] = []
+
+    def rows(self):
+        return [row for row in self.grid if row]
+
+
+def keys(batch):
+    return [row["id"] for row in batch.rows]
+
+
+def by_date(row):
+    return row["date"]
+
+
+def row(identifier, day, value="v"):
+    return {"id": identifier, "date": day, "value": value}
+
+
+def sheet_matrix(rows):
+    return [["id", "date", "value"]] + [[r["id"], r["date"], r["value"]] for r in rows]
+
+
+def test_insert_delete_and_reorder_keep_newest_first():
+    existing = [row("c", "2025-01-03"), row("b", "2025-01-02"), row("a", "2025-01-01")]
+    sheet = FakeSheet(sheet_matrix(existing))
+
+    # b 삭제, d(가장 최신)와 e(중간) 추가, a의 날짜가 바뀌어 맨 위로 이동
+    rows = [row("a", "2025-01-09"), row("c", "2025-01-03"), row("d", "2025-01-05"), row("e", "2025-01-02")]
+    matrix = write_sheet_delta(sheet, sheet_matrix(existing), rows, keys, by_date)
+
+    expected = sheet_matrix(sorted(rows, key=by_date, reverse=True))
+    assert matrix == expected
+    assert sheet.rows() == expected
+
+
+def test_unchanged_rows_are_not_rewritten_and_tail_is_cleared():
+    existing = [row("c", "2025-01-03"), row("b", "2025-01-02"), row("a", "2025-01-01")]
+    sheet = FakeSheet(sheet_matrix(existing))
+
+    rows = [row("c", "2025-01-03"), row("b", "2025-01-02")]
+    write_sheet_delta(sheet, sheet_matrix(existing), rows, keys, by_date)
+
+    assert sheet.written_rows == 0
+    assert sheet.rows() == sheet_matrix(rows)
@@ -0,0 +1,52 @@
+"""반복이 많은 열에 파이썬 함수를 고유값마다 한 번만 적용하는 도우미.
+
+시트에서 읽은 기관명·계약명·금액·연월 같은 열은 같은 값이 여러 행에 되풀이된다.
+Series.apply 대신 pd.factorize(범주형이면 범주 코드를 그대로 쓴다)로 고유값을 뽑아
+함수를 고유값 수만큼만 호출하고, 결과를 코드로 전체 행에 펼친다.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _broadcast(results: list, codes: np.ndarray, index: pd.Index) -> pd.Series:
+    values = np.empty(len(results), dtype=object)
+    for i, result in enumerate(results):  # 튜플 결과를 numpy가 펼치지 않도록 한 칸씩 넣는다
+        values[i] = result
+    return pd.Series(values[codes], index=index, dtype=object).infer_objects()
+
+
+def map_unique(series: pd.Series, fn: Callable[[Any], Any], na_action: str | None = None) -> pd.Series:
+    """series.map(fn, na_action=...)과 같은 결과를 고유값마다 한 번씩만 계산해 반환한다.
+
+    na_action="ignore"이면 결측값은 fn에 넘기지 않고 그대로 NaN으로 둔다.
+    """
+    if na_action == "ignore":
+        codes, uniques = pd.factorize(series)
+        results = [fn(value) for value in uniques] + [np.nan]  # 코드 -1 → 마지막 칸
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        results = [fn(value) for value in uniques]
+    return _broadcast(results, codes, series.index)
+
+
+def map_unique_rows(df: pd.DataFrame, columns: Sequence[str], fn: Callable[..., Any], default: Any = "") -> pd.Series:
+    """df.apply(lambda r: fn(r.get(c1, default), r.get(c2, default), ...), axis=1)을
+    열 값 조합의 고유값마다 한 번씩만 계산한다. 없는 열은 default로 채운다.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    column_codes, column_uniques = [], []
+    for col in columns:
+        codes, uniques = pd.factorize(df[col] if col in df.columns else pd.Series(default, index=df.index), use_na_sentinel=False)
+        column_codes.append(codes)
+        column_uniques.append(uniques)
+    combined = np.zeros(len(df), dtype=np.int64)
+    for codes, uniques in zip(column_codes, column_uniques):
+        combined = combined * len(uniques) + codes
+    _, first_rows, row_codes = np.unique(combined, return_index=True, return_inverse=True)
+    results = [fn(*(uniques[codes[i]] for codes, uniques in zip(column_codes, column_uniques))) for i in first_rows]
+    return _broadcast(results, row_codes.ravel(), df.index)
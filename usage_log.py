@@ -0,0 +1,173 @@
+"""대시보드 사용 로그를 모아서 한 번에 구글 시트에 쓰는 백그라운드 기록기.
+
+예전에는 이벤트마다 스레드를 띄워 스프레드시트를 열고 append_row를 호출해
+클릭 한 번에 HTTP 왕복이 여러 번 생기고 동시 사용자가 많으면 Sheets 쓰기 할당량에 걸렸다.
+여기서는 프로세스 안의 큐에 행을 넣기만 하고, 기록 스레드 하나가
+FLUSH_SECONDS초마다 또는 BATCH_SIZE건이 모이면 append_rows로 한 번에 보낸다.
+
+- 시트 쓰기에 실패하면 행을 로컬 스풀 파일(JSON Lines)에 남기고 다음 전송 때 함께 다시 보낸다.
+- 프로세스가 끝날 때(atexit) 큐에 남은 행을 마지막으로 보낸다.
+- 큐가 MAX_PENDING건을 넘으면 화면이 기다리지 않도록 새 행은 버린다.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import google_clients
+
+FLUSH_SECONDS = float(os.environ.get("USAGE_LOG_FLUSH_SECONDS", "10"))
+BATCH_SIZE = max(1, int(os.environ.get("USAGE_LOG_BATCH_SIZE", "50")))
+MAX_PENDING = 10_000
+SPOOL_DIR = os.environ.get("USAGE_LOG_SPOOL_DIR", tempfile.gettempdir())
+
+_STOP = object()
+_writers: dict[str, "UsageLogWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+def _spool_path(spreadsheet: str) -> str:
+    digest = hashlib.md5(spreadsheet.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(SPOOL_DIR, f"usage_log_{digest}.jsonl")
+
+
+class UsageLogWriter:
+    """스프레드시트 첫 시트에 [시각, *values] 행을 묶어서 추가한다."""
+
+    def __init__(self, spreadsheet: str, auth_json: str | None = None, *,
+                 flush_seconds: float = FLUSH_SECONDS, batch_size: int = BATCH_SIZE,
+                 spool_path: str | None = None):
+        self.spreadsheet = spreadsheet
+        self.auth_json = auth_json
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.spool_path = spool_path or _spool_path(spreadsheet)
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=MAX_PENDING)
+        self._worksheet = None
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="usage-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, *values) -> None:
+        """호출한 스레드는 큐에 넣기만 하고 바로 돌아간다."""
+        if self._closed.is_set():
+            return
+        row = [datetime.now().strftime("%Y-%m-%d %H:%M:%S"), *values]
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 30) -> None:
+        """남은 행을 보내고 기록 스레드를 멈춘다. 여러 번 불러도 된다."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        try:
+            self._queue.put(_STOP, timeout=1)
+        except queue.Full:
+            pass  # 기록 스레드가 _closed를 보고 스스로 끝낸다
+        self._thread.join(timeout)
+
+    # ── 기록 스레드 ─────────────────────────────
+    def _run(self) -> None:
+        pending: list[list] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _STOP or self._closed.is_set():
+                if item is not None and item is not _STOP:
+                    pending.append(item)
+                pending.extend(self._drain())
+                self._flush(pending)
+                return
+            if item is not None:
+                pending.append(item)
+            if len(pending) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(pending)
+                pending = []
+                deadline = time.monotonic() + self.flush_seconds
+
+    def _drain(self) -> list[list]:
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if item is not _STOP:
+                rows.append(item)
+
+    def _open_worksheet(self):
+        if self._worksheet is None:
+            client = google_clients.gspread_client(self.auth_json)
+            self._worksheet = client.open(self.spreadsheet).get_worksheet(0)
+        return self._worksheet
+
+    def _flush(self, rows: list[list]) -> None:
+        spooled = self._read_spool()
+        batch = spooled + rows
+        if not batch:
+            return
+        try:
+            self._open_worksheet().append_rows(batch)
+        except Exception as e:
+            print(f"⚠️ 사용 로그 시트 기록 실패 ({len(batch)}건 보관): {e}")
+            self._worksheet = None  # 다음 전송 때 다시 연다
+            self._write_spool(rows)
+            return
+        if spooled:
+            try:
+                os.remove(self.spool_path)
+            except OSError:
+                pass
+
+    # ── 로컬 스풀 ───────────────────────────────
+    def _read_spool(self) -> list[list]:
+        if not os.path.exists(self.spool_path):
+            return []
+        rows = []
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            rows.append(json.loads(line))
+                        except ValueError:
+                            continue  # 쓰다 끊긴 줄은 건너뛴다
+        except OSError:
+            return []
+        return rows
+
+    def _write_spool(self, rows: list[list]) -> None:
+        if not rows:
+            return
+        try:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ 사용 로그 스풀 저장 실패 ({len(rows)}건 유실): {e}")
+
+
+def get_writer(spreadsheet: str, auth_json: str | None = None) -> UsageLogWriter:
+    """스프레드시트별로 프로세스에 하나뿐인 기록기."""
+    with _writers_lock:
+        writer = _writers.get(spreadsheet)
+        if writer is None or writer._closed.is_set():
+            writer = UsageLogWriter(spreadsheet, auth_json)
+            _writers[spreadsheet] = writer
+        return writer
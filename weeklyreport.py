@@ -1,11 +1,10 @@
-import os, json, datetime, io, re
+import os, datetime, re
 import pandas as pd
 import requests
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from googleapiclient.http import MediaIoBaseDownload
 from datetime import timezone, timedelta
 
+import drive_archive
+
 # [수정 필요 시점] GitHub Secrets에 저장된 환경 변수 이름이 바뀔 때만 수정하세요.
 AUTH_JSON_STR = os.environ.get('GOOGLE_AUTH_JSON')
 
@@ -34,16 +33,6 @@ def get_last_week_range():
     
     return last_monday, last_sunday
 
-def get_drive_service():
-    """
-    [설명] 구글 드라이브 API 연결을 위한 인증 서비스 세팅입니다.
-    [수정] 드라이브 접근 권한 범위(scopes)를 변경해야 할 때 수정합니다.
-    """
-    info = json.loads(AUTH_JSON_STR)
-    scopes = ['https://www.googleapis.com/auth/drive.readonly']
-    creds = service_account.Credentials.from_service_account_info(info, scopes=scopes)
-    return build('drive', 'v3', credentials=creds)
-
 def clean_company_name(name):
     """
     [설명] 업체명에서 (주), 주식회사 등을 제거하여 텍스트를 통일합니다.
@@ -59,36 +48,16 @@ def main():
         target_companies = get_target_companies()
         target_map = {clean_company_name(c): c for c in target_companies}
         
-        drive_service = get_drive_service()
         last_mon, last_sun = get_last_week_range()
         
-        # [수정 중요!] 데이터가 저장되는 구글 드라이브 폴더 ID입니다. 폴더가 바뀌면 이 ID를 교체하세요.
-        DRIVE_FOLDER_ID = '1N2GjNTpOvtn-5Vbg5zf6Y8kf4xuq0qTr'
-        
-        # [수정 중요!] 메인 스크립트(main.py)가 저장하는 파일명 규칙과 반드시 일치해야 합니다.
-        FILE_NAME_FOR_YEAR = f"{last_mon.year}.csv"
-        
-        # 구글 드라이브에서 파일을 검색하는 쿼리문입니다.
-        query = f"name='{FILE_NAME_FOR_YEAR}' and '{DRIVE_FOLDER_ID}' in parents and trashed=false"
-        results = drive_service.files().list(q=query, fields='files(id)').execute()
-        items = results.get('files', [])
-        
-        if not items:
-            print(f"⚠️ 드라이브에 {FILE_NAME_FOR_YEAR} 파일이 없습니다."); return
-            
-        file_id = items[0]['id']
-        
-        # 드라이브의 파일을 메모리로 다운로드합니다.
-        request = drive_service.files().get_media(fileId=file_id)
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
+        # [수정 중요!] 메인 스크립트(main.py)가 쌓는 종합쇼핑몰 아카이브(drive_archive.SHOPPING)에서
+        # 지난주(월~일) 행만 읽습니다. 연도 파일과 아직 압축되지 않은 일별 파트를 함께 보며,
+        # 기간 밖의 파일·row group은 내려받지 않습니다. 리포트에 쓰는 열만 읽습니다.
+        columns = ['계약납품요구일자', '업체명', '금액', '수요기관명']
+        df = drive_archive.read_range(drive_archive.SHOPPING, last_mon, last_sun, columns=columns)
         
-        fh.seek(0)
-        # CSV 파일을 읽어옵니다. 한글 깨짐 방지를 위해 utf-8-sig를 사용합니다.
-        df = pd.read_csv(fh, encoding='utf-8-sig', low_memory=False)
+        if df.empty:
+            print(f"⚠️ 드라이브에 {last_mon} ~ {last_sun} 종합쇼핑몰 데이터가 없습니다."); return
         
         # [설명] 날짜 데이터를 숫자로 변환하여 지난주 범위(월~일)만 필터링합니다.
         df['계약납품요구일자'] = pd.to_numeric(df['계약납품요구일자'], errors='coerce')
@@ -0,0 +1,73 @@
+"""공공데이터포털(data.go.kr) XML 응답을 item 단위로 읽는 스트리밍 디코더.
+
+응답 전체로 ElementTree를 만들지 않고, 바이트 청크를 받는 대로 파싱해
+<item>을 하나씩 dict로 내보낸 뒤 바로 메모리에서 지운다.
+"""
+from __future__ import annotations
+
+import sys
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+OK_CODES = {"00", "0"}
+_HEADER_TAGS = {"resultCode", "resultMsg", "totalCount", "numOfRows", "pageNo"}
+
+
+def iter_items(chunks: Iterable[bytes] | bytes, meta: dict | None = None, check_result: bool = True) -> Iterator[dict[str, str]]:
+    """XML 바이트(또는 바이트 청크 iterable)에서 item dict를 순서대로 생성한다.
+
+    meta를 넘기면 resultCode/resultMsg/totalCount 등을 읽는 즉시 채운다.
+    totalCount는 보통 item 뒤에 오므로 제너레이터를 끝까지 소비한 뒤에 확인한다.
+    check_result가 True이면 정상 코드가 아닐 때 RuntimeError를 낸다.
+    """
+    if isinstance(chunks, (bytes, bytearray)):
+        chunks = (chunks,)
+    if meta is None:
+        meta = {}
+    parser = ET.XMLPullParser(events=("start", "end"))
+    tags: dict[str, str] = {}
+    parent = None
+
+    def drain() -> Iterator[dict[str, str]]:
+        nonlocal parent
+        for event, elem in parser.read_events():
+            tag = elem.tag
+            if event == "start":
+                if tag == "items":
+                    parent = elem
+                continue
+            if tag == "item":
+                row = {}
+                for child in elem:
+                    name = tags.get(child.tag)
+                    if name is None:
+                        name = tags[child.tag] = sys.intern(child.tag)
+                    row[name] = child.text or ""
+                elem.clear()
+                if parent is not None:
+                    parent.remove(elem)
+                yield row
+            elif tag in _HEADER_TAGS:
+                meta[tag] = (elem.text or "").strip()
+            elif tag == "header" and check_result:
+                code = meta.get("resultCode")
+                if code and code not in OK_CODES:
+                    raise RuntimeError(f"API {code}: {meta.get('resultMsg') or '오류'}")
+
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def iter_response_items(response, meta: dict | None = None, check_result: bool = True) -> Iterator[dict[str, str]]:
+    """stream=True로 받은 requests 응답 본문을 그대로 파싱한다."""
+    return iter_items(response.iter_content(chunk_size=CHUNK_SIZE), meta, check_result)
+
+
+def total_count(meta: dict, default: int = 0) -> int:
+    value = meta.get("totalCount") or ""
+    return int(value) if value.isdigit() else default